@@ -1,38 +1,13 @@
 # app/auth.py
-from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.core.security import verify_password, create_access_token
-from app import models
+from app.core.security import create_access_token
+from app.utils.usuario import autenticar
 
 router = APIRouter(tags=["auth"])
 
-def _find_user(db: Session, username: Optional[str], email: Optional[str]):
-    user = None
-    if email:
-        try:
-            user = db.query(models.Usuario).filter(models.Usuario.email == email).first()  # type: ignore[attr-defined]
-        except Exception:
-            pass
-        if not user:
-            try:
-                user = db.query(models.User).filter(models.User.email == email).first()  # type: ignore[attr-defined]
-            except Exception:
-                pass
-    if not user and username:
-        try:
-            user = db.query(models.Usuario).filter(models.Usuario.username == username).first()  # type: ignore[attr-defined]
-        except Exception:
-            pass
-        if not user:
-            try:
-                user = db.query(models.User).filter(models.User.username == username).first()  # type: ignore[attr-defined]
-            except Exception:
-                pass
-    return user
-
 def _user_dict(u) -> dict:
     # normalizamos conceptos comunes
     return {
@@ -47,16 +22,18 @@ def _user_dict(u) -> dict:
 
 @router.post("/usuarios/login")
 @router.post("/auth/login")
-def login(payload: dict, db: Session = Depends(get_db)):
+async def login(payload: dict, db: Session = Depends(get_db)):
     username = payload.get("username")
     email = payload.get("email")
     password = payload.get("password")
     if not password or not (username or email):
         raise HTTPException(status_code=422, detail="Faltan credenciales")
 
-    user = _find_user(db, username, email)
-    if not user or not verify_password(password, getattr(user, "hashed_password", "")):
+    # mismo camino que /usuarios/login (app.utils.usuario)
+    fila = await autenticar(db, email, username, password)
+    if not fila:
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
+    user = fila[0]
 
     token = create_access_token({"sub": str(user.id)})
     return {"access_token": token, "token_type": "bearer", "user": _user_dict(user)}
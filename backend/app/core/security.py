@@ -2,7 +2,14 @@
 from app.security import (
     verify_password,
     get_password_hash,
+    needs_rehash,
+    verify_and_update,
+    verify_password_async,
+    verify_and_update_async,
+    get_password_hash_async,
+    dummy_verify_async,
     create_access_token,
+    create_user_token,
     decode_access_token,
     get_user_id_from_token,
 )
@@ -15,7 +22,14 @@ ALGORITHM = settings.ALGORITHM
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "needs_rehash",
+    "verify_and_update",
+    "verify_password_async",
+    "verify_and_update_async",
+    "get_password_hash_async",
+    "dummy_verify_async",
     "create_access_token",
+    "create_user_token",
     "decode_access_token",
     "get_user_id_from_token",
     "SECRET_KEY",
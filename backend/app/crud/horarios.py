@@ -1,32 +1,155 @@
 # app/crud/horarios.py
+from typing import List, Optional
+
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
+from app.database import guardar, transaccion_escritura
 from app.models import Horario
-from app.schemas import HorarioCreate
+from app.schemas import HorarioCreate, HorarioUpdate
+from app.utils import versiones
+from app.utils.disponibilidad import bloque_de_horario
+from app.utils.disponibilidad_cache import cache_disponibilidad
+
+H = Horario.__table__
+_COLUMNAS = (H.c.id, H.c.emprendedor_id, H.c.dia_semana, H.c.desde, H.c.hasta, H.c.activo)
 
 def get_horarios(db: Session, emprendedor_id: int):
     return db.query(Horario).filter(Horario.emprendedor_id == emprendedor_id).all()
 
 def create_horario(db: Session, emprendedor_id: int, horario: HorarioCreate):
-    db_horario = Horario(**horario.dict(), emprendedor_id=emprendedor_id)
-    db.add(db_horario)
-    db.commit()
-    db.refresh(db_horario)
+    db_horario = guardar(db, Horario(**horario.dict(), emprendedor_id=emprendedor_id))
+    cache_disponibilidad.invalidar_emprendedor(emprendedor_id)
     return db_horario
 
-def update_horario(db: Session, horario_id: int, horario: HorarioCreate):
-    db_horario = db.query(Horario).filter(Horario.id == horario_id).first()
-    if not db_horario:
+# update/delete: una sola sentencia acotada al dueño (WHERE id AND emprendedor_id)
+# con RETURNING; sin cargar la fila antes ni refrescarla después. Al ser Core,
+# la versión del emprendedor se toca acá mismo (no hay eventos ORM).
+# Si cambia solo uno de desde/hasta, el otro se lee de la fila para validar el bloque.
+def update_horario(db: Session, emprendedor_id: int, horario_id: int, horario: HorarioUpdate) -> Optional[dict]:
+    """None si el horario no es del emprendedor; ValueError si el bloque resultante queda vacío."""
+    cambios = {k: v for k, v in horario.model_dump(exclude_unset=True).items() if v is not None}
+    if "desde" in cambios or "hasta" in cambios:
+        desde, hasta = cambios.get("desde"), cambios.get("hasta")
+        if desde is None or hasta is None:
+            fila = db.execute(
+                select(H.c.desde, H.c.hasta)
+                .where(H.c.id == horario_id, H.c.emprendedor_id == emprendedor_id)
+            ).first()
+            if not fila:
+                db.rollback()
+                return None
+            desde = fila.desde if desde is None else desde
+            hasta = fila.hasta if hasta is None else hasta
+        if bloque_de_horario(desde, hasta) is None:
+            raise ValueError("Bloque inválido: 'hasta' debe ser posterior a 'desde'")
+    if not cambios:
+        fila = db.execute(
+            select(*_COLUMNAS).where(H.c.id == horario_id, H.c.emprendedor_id == emprendedor_id)
+        ).mappings().first()
+        return dict(fila) if fila else None
+    fila = db.execute(
+        update(H)
+        .where(H.c.id == horario_id, H.c.emprendedor_id == emprendedor_id)
+        .values(**cambios)
+        .returning(*_COLUMNAS)
+    ).mappings().first()
+    if not fila:
+        db.rollback()
         return None
-    for key, value in horario.dict().items():
-        setattr(db_horario, key, value)
+    versiones.tocar(db.connection(), emprendedor_id)
     db.commit()
-    db.refresh(db_horario)
-    return db_horario
+    cache_disponibilidad.invalidar_emprendedor(emprendedor_id)
+    return dict(fila)
 
-def delete_horario(db: Session, horario_id: int):
-    db_horario = db.query(Horario).filter(Horario.id == horario_id).first()
-    if not db_horario:
-        return None
-    db.delete(db_horario)
+def delete_horario(db: Session, emprendedor_id: int, horario_id: int) -> bool:
+    borrado = db.execute(
+        delete(H).where(H.c.id == horario_id, H.c.emprendedor_id == emprendedor_id).returning(H.c.id)
+    ).scalar()
+    if borrado is None:
+        db.rollback()
+        return False
+    versiones.tocar(db.connection(), emprendedor_id)
     db.commit()
-    return True
\ No newline at end of file
+    cache_disponibilidad.invalidar_emprendedor(emprendedor_id)
+    return True
+
+def _validar_semana(bloques: List[HorarioCreate]) -> None:
+    """
+    Bloques repetidos, vacíos o (si están activos) solapados en el mismo día -> ValueError.
+    'hasta' 00:00 es fin del día, igual que en la disponibilidad (bloque_de_horario).
+    """
+    vistos = set()
+    por_dia: dict = {}
+    for b in bloques:
+        minutos = bloque_de_horario(b.desde, b.hasta)
+        if minutos is None:
+            raise ValueError(f"Bloque inválido el día {b.dia_semana}: 'hasta' debe ser posterior a 'desde'")
+        clave = (b.dia_semana, b.desde, b.hasta)
+        if clave in vistos:
+            raise ValueError(f"Bloque repetido el día {b.dia_semana}: {b.desde:%H:%M}-{b.hasta:%H:%M}")
+        vistos.add(clave)
+        if b.activo:
+            por_dia.setdefault(b.dia_semana, []).append((minutos, b))
+    for dia, lista in por_dia.items():
+        lista.sort(key=lambda x: x[0])
+        for (m_prev, prev), (m_sig, sig) in zip(lista, lista[1:]):
+            if m_sig[0] < m_prev[1]:
+                raise ValueError(
+                    f"Bloques solapados el día {dia}: "
+                    f"{prev.desde:%H:%M}-{prev.hasta:%H:%M} y {sig.desde:%H:%M}-{sig.hasta:%H:%M}"
+                )
+
+def replace_semana(db: Session, emprendedor_id: int, bloques: List[HorarioCreate]) -> List[dict]:
+    """
+    Reemplaza la semana completa del emprendedor por 'bloques' aplicando solo
+    la diferencia con lo guardado, en una transacción:
+      - bloque igual (día, desde, hasta): se conserva; UPDATE solo si cambia 'activo';
+      - bloque que sobra y bloque nuevo (preferentemente del mismo día): se
+        reusa la fila con un UPDATE en vez de DELETE + INSERT;
+      - lo que queda: INSERT o DELETE.
+    Un solo flush, así que la versión del emprendedor sube una vez y la cache
+    de disponibilidad se invalida una vez. ValueError si la semana no es válida.
+    Devuelve la semana resultante ordenada (día, desde), lista para HorarioOut.
+    """
+    _validar_semana(bloques)
+
+    def _aplicar():
+        actuales = get_horarios(db, emprendedor_id)
+        por_clave = {(h.dia_semana, h.desde, h.hasta): h for h in actuales}
+        deseados = {(b.dia_semana, b.desde, b.hasta): b for b in bloques}
+
+        filas = []
+        nuevos = []
+        for clave, b in deseados.items():
+            h = por_clave.pop(clave, None)
+            if h is None:
+                nuevos.append(b)
+                continue
+            if h.activo != b.activo:
+                h.activo = b.activo
+            filas.append(h)
+        sobrantes = sorted(por_clave.values(), key=lambda h: (h.dia_semana, h.desde))
+
+        for b in nuevos:
+            h = next((s for s in sobrantes if s.dia_semana == b.dia_semana), None) or (sobrantes[0] if sobrantes else None)
+            if h is None:
+                h = Horario(emprendedor_id=emprendedor_id)
+                db.add(h)
+            else:
+                sobrantes.remove(h)
+            h.dia_semana, h.desde, h.hasta, h.activo = b.dia_semana, b.desde, b.hasta, b.activo
+            filas.append(h)
+        for h in sobrantes:
+            db.delete(h)
+
+        db.flush()
+        filas.sort(key=lambda h: (h.dia_semana, h.desde))
+        return [
+            {"id": h.id, "emprendedor_id": h.emprendedor_id, "dia_semana": h.dia_semana,
+             "desde": h.desde, "hasta": h.hasta, "activo": h.activo}
+            for h in filas
+        ]
+
+    semana = transaccion_escritura(db, _aplicar)
+    cache_disponibilidad.invalidar_emprendedor(emprendedor_id)
+    return semana
@@ -1,20 +1,49 @@
 # app/deps.py
-from typing import Optional
+"""
+Pipeline único de autenticación (lo usan todos los routers).
+
+1) token: Authorization Bearer (también lo declara OAuth2PasswordBearer para
+   /docs), cookie 'access_token' o header 'token';
+2) firma verificada una sola vez por request -> request.state.auth;
+3) usuario: cache en proceso (app.utils.auth_cache) o db.get.
+
+Con AUTH_STATELESS_CLAIMS=1 el login firma además 'rol' y 'emp'
+(emprendedor_id) en el token y get_emprendedor_id los usa sin ir a la BD.
+"""
+from typing import Any, Dict, NamedTuple, Optional
 from fastapi import Depends, HTTPException, status, Request
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.security import decode_access_token, get_user_id_from_token
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.security import decode_access_token
+from app.utils.auth_cache import cache_usuarios, plantilla
+from app.utils.emprendedor import emprendedor_id_de_usuario
+from app.utils.ttl_cache import FALTA
 from app import models
 
 
-def _extract_token_from_request(request: Request) -> Optional[str]:
+oauth2 = OAuth2PasswordBearer(tokenUrl="/usuarios/login", auto_error=False)
+
+
+class ContextoAuth(NamedTuple):
+    """Lo que sale de verificar el token (una vez por request, en request.state.auth)."""
+    user_id: int
+    exp: Optional[int]
+    claims: Dict[str, Any]
+
+
+def _extract_token_from_request(request: Request, bearer: Optional[str] = None) -> Optional[str]:
     """
     Extrae el token JWT desde:
       1) Authorization: Bearer <token>
       2) Cookie 'access_token'
       3) Header 'token' (fallback)
     """
+    if bearer:
+        return bearer
     auth = request.headers.get("Authorization") or request.headers.get("authorization")
     if isinstance(auth, str) and auth.lower().startswith("bearer "):
         return auth.split(" ", 1)[1].strip()
@@ -30,11 +59,11 @@ def _extract_token_from_request(request: Request) -> Optional[str]:
     return None
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)):
-    """
-    Valida el JWT y devuelve el usuario (ORM) asociado.
-    """
-    token = _extract_token_from_request(request)
+def contexto_desde_token(request: Request, token: Optional[str]) -> ContextoAuth:
+    """Verifica la firma una sola vez por request y deja el resultado en request.state."""
+    ctx = getattr(request.state, "auth", None)
+    if ctx is not None:
+        return ctx
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,8 +77,7 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
             detail="Token inválido/expirado",
         )
 
-    # Intentamos obtener el user_id
-    user_id = get_user_id_from_token(token) or payload.get("sub") or payload.get("id") or payload.get("user_id")
+    user_id = payload.get("sub") or payload.get("id") or payload.get("user_id")
     try:
         user_id = int(user_id)  # type: ignore[arg-type]
     except Exception:
@@ -58,28 +86,103 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
             detail="Token inválido (sub)",
         )
 
-    # Compatibilidad con nombre del modelo
-    UserModel = getattr(models, "Usuario", None) or getattr(models, "User", None)
-    if not UserModel:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Modelo de usuario no encontrado",
-        )
+    exp = payload.get("exp")
+    ctx = ContextoAuth(user_id=user_id, exp=int(exp) if exp is not None else None, claims=payload)
+    request.state.auth = ctx
+    return ctx
 
-    # Obtener usuario por ID (db.get si existe, si no .query)
-    user = None
-    try:
-        user = db.get(UserModel, user_id)  # SQLAlchemy 1.4+
-    except Exception:
-        user = db.query(UserModel).filter(UserModel.id == user_id).first()
 
+def contexto_auth(request: Request, bearer: Optional[str] = Depends(oauth2)) -> ContextoAuth:
+    return contexto_desde_token(request, _extract_token_from_request(request, bearer))
+
+
+def _no_encontrado():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Usuario no encontrado",
+    )
+
+
+def usuario_de_contexto(db: Session, ctx: ContextoAuth) -> models.Usuario:
+    """Usuario del token: del cache (merge sin SELECT) o de la BD."""
+    copia = cache_usuarios.obtener((ctx.user_id, ctx.exp))
+    if copia is not FALTA:
+        return db.merge(copia, load=False)
+
+    version = cache_usuarios.version(ctx.user_id)
+    user = db.get(models.Usuario, ctx.user_id)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuario no encontrado",
-        )
+        raise _no_encontrado()
+    if cache_usuarios.activo:
+        cache_usuarios.guardar((user.id, ctx.exp), plantilla(user), version)
+    return user
+
 
+async def usuario_de_contexto_async(db: AsyncSession, ctx: ContextoAuth) -> models.Usuario:
+    copia = cache_usuarios.obtener((ctx.user_id, ctx.exp))
+    if copia is not FALTA:
+        return await db.merge(copia, load=False)
+
+    version = cache_usuarios.version(ctx.user_id)
+    user = await db.get(models.Usuario, ctx.user_id)
+    if not user:
+        raise _no_encontrado()
+    if cache_usuarios.activo:
+        cache_usuarios.guardar((user.id, ctx.exp), plantilla(user), version)
     return user
 
 
-__all__ = ["get_current_user", "_extract_token_from_request"]
+def get_current_user(
+    ctx: ContextoAuth = Depends(contexto_auth),
+    db: Session = Depends(get_db),
+) -> models.Usuario:
+    """
+    Valida el JWT y devuelve el usuario (ORM) asociado.
+    """
+    return usuario_de_contexto(db, ctx)
+
+
+async def get_current_user_async(
+    ctx: ContextoAuth = Depends(contexto_auth),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.Usuario:
+    return await usuario_de_contexto_async(db, ctx)
+
+
+def get_admin_user(user: models.Usuario = Depends(get_current_user)) -> models.Usuario:
+    """Usuario autenticado con rol admin (403 si no)."""
+    if (getattr(user, "rol", None) or "") != models.RolUsuario.admin.value:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo para administradores")
+    return user
+
+
+def get_emprendedor_id(
+    ctx: ContextoAuth = Depends(contexto_auth),
+    db: Session = Depends(get_db),
+) -> int:
+    """
+    emprendedor_id del usuario autenticado (403 si no es emprendedor).
+    En modo stateless sale del claim firmado 'emp'; si no, del cache usuario -> emprendedor
+    (una consulta por id solo en el primer request o tras invalidar).
+    """
+    emp_id = ctx.claims.get("emp") if settings.AUTH_STATELESS_CLAIMS else None
+    if emp_id is None:
+        emp_id = emprendedor_id_de_usuario(db, ctx.user_id)
+    if not emp_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo para emprendedores")
+    return int(emp_id)
+
+
+__all__ = [
+    "ContextoAuth",
+    "oauth2",
+    "contexto_auth",
+    "contexto_desde_token",
+    "get_current_user",
+    "get_current_user_async",
+    "get_admin_user",
+    "get_emprendedor_id",
+    "usuario_de_contexto",
+    "usuario_de_contexto_async",
+    "_extract_token_from_request",
+]
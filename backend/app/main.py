@@ -3,14 +3,28 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import admin_lite 
-from app.database import engine
+from app.config import settings
+from app.database import engine, DB_ASYNC, pool_stats
 from app import models
+from app.utils.migrate import ensure_schema
+from app.utils.http_cache import CacheHTTPMiddleware
+from app.utils.respuestas import RespuestaJSON, agregar_compresion
+from app.utils import rollup  # registra los eventos que mantienen turnos_daily_rollup
+from app.utils import versiones  # registra los eventos de versión por emprendedor (ETag)
 from app.routers import usuarios, emprendedores, servicios, horarios, turnos
 from app.routers import public_agenda
 from app.routers import public_servicios 
+from app.routers import public_disponibilidad
+from app.routers import public_bundle
+from app.routers import turnos_async, public_async
 # ---------- App ----------
-app = FastAPI(title="Turnate API")
-app.include_router(public_agenda.router)
+app = FastAPI(title="Turnate API", default_response_class=RespuestaJSON)
+# ---------- Compresión (opt-in: HTTP_COMPRESION=gzip|br) ----------
+agregar_compresion(app)
+# ---------- Cache HTTP (ETag / 304 en /.../de/{codigo}) ----------
+# Va antes que CORS: así CORS queda por fuera y también decora los 304.
+if settings.HTTP_CACHE:
+    app.add_middleware(CacheHTTPMiddleware)
 # ---------- CORS ----------
 # Podés setear ORIGINS por env separado por comas. Ej:
 # ORIGINS=http://localhost:5173,http://127.0.0.1:5173
@@ -32,10 +46,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ---------- Modelos y tablas ----------
 models.Base.metadata.create_all(bind=engine)
+ensure_schema(engine)
+rollup.backfill_si_vacio(engine)
 
 # ---------- Routers ----------
 app.include_router(admin_lite.router)
@@ -43,10 +60,27 @@ app.include_router(usuarios.router)
 app.include_router(emprendedores.router)
 app.include_router(servicios.router)
 app.include_router(horarios.router)
-app.include_router(turnos.router)
-app.include_router(public_agenda.router)
-app.include_router(public_servicios.router)
+# DB_ASYNC=1 monta las versiones async de turnos y de los endpoints públicos
+# (mismas rutas), para comparar ambos modos con el mismo front.
+if DB_ASYNC:
+    app.include_router(turnos_async.router)
+    app.include_router(public_async.horarios_router)
+    app.include_router(public_async.servicios_router)
+    app.include_router(public_async.disponibilidad_router)
+    app.include_router(public_async.agenda_router)
+else:
+    app.include_router(turnos.router)
+    app.include_router(public_agenda.router)
+    app.include_router(public_servicios.router)
+    app.include_router(public_disponibilidad.router)
+    app.include_router(public_bundle.router)
 # ---------- Health check ----------
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/health/db")
+def health_db():
+    """Checkouts, esperas y overflow del pool: muestra si faltan conexiones bajo carga."""
+    return pool_stats()
@@ -1,6 +1,6 @@
 # app/models.py
 from sqlalchemy import (
-    Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint,
+    Column, Integer, BigInteger, String, DateTime, Date, ForeignKey, Boolean, UniqueConstraint,
     Index, Time, Enum as SAEnum
 )
 
@@ -42,6 +42,12 @@ class Usuario(Base):
     suscripcion_activa = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Login por email/usuario normalizado (LOWER(TRIM(...))) usando índice
+        Index("ix_usuario_email_norm", func.lower(func.trim(email))),
+        Index("ix_usuario_username_norm", func.lower(func.trim(username))),
+    )
+
     # Relaciones
     emprendedor = relationship(
         "Emprendedor",
@@ -73,8 +79,15 @@ class Emprendedor(Base):
     descripcion = Column(String(1000), nullable=True)
     codigo_cliente = Column(String(20), unique=True, nullable=True)  # para /reservar/:codigo
     activo = Column(Boolean, nullable=False, default=True)
+    # Turnos que pueden solaparse a la vez (ej.: 2 sillones => 2)
+    capacidad = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Búsqueda por código normalizado (UPPER(TRIM(...))) usando índice
+        Index("ix_emprendedor_codigo_norm", func.upper(func.trim(codigo_cliente))),
+    )
+
     usuario = relationship("Usuario", back_populates="emprendedor")
 
     servicios = relationship(
@@ -175,6 +188,9 @@ class Turno(Base):
 
     estado = Column(SAEnum(EstadoTurno), nullable=False, default=EstadoTurno.confirmado)
   # o pendiente/confirmado/cancelado
+    # Lugar físico (0..capacidad-1) que ocupa el turno; en Postgres la constraint
+    # de exclusión impide dos turnos solapados en el mismo carril
+    carril = Column(Integer, nullable=False, default=0, server_default="0")
     motivo_cancelacion = Column(String(500), nullable=True)
 
     # Snapshot de precio al momento de crear el turno (centavos)
@@ -194,5 +210,60 @@ class Turno(Base):
     __table_args__ = (
         # Un índice por rango de fechas del emprendedor ayuda a consultas por calendario
         Index("ix_turno_emprendedor_inicio", "emprendedor_id", "inicio"),
+        # Chequeo de solapamiento (inicio < fin AND fin > inicio) sin ir a la tabla
+        Index("ix_turno_emprendedor_inicio_fin", "emprendedor_id", "inicio", "fin"),
         Index("ix_turno_estado", "estado"),
     )
+    # updated_at (onupdate=now()) vuelve en el mismo UPDATE ... RETURNING, sin refresh
+    __mapper_args__ = {"eager_defaults": True}
+
+
+# -------------------------
+# Rollup diario de turnos (para KPIs de admin)
+# -------------------------
+class TurnoDailyRollup(Base):
+    """
+    Conteos por estado e ingresos por (día, emprendedor, servicio). Se mantiene
+    incrementalmente desde los eventos de Turno (app/utils/rollup.py).
+    servicio_id = 0 agrupa los turnos sin servicio.
+    """
+    __tablename__ = "turnos_daily_rollup"
+
+    dia = Column(Date, primary_key=True)
+    emprendedor_id = Column(Integer, primary_key=True)
+    servicio_id = Column(Integer, primary_key=True, default=0)
+
+    pendientes = Column(Integer, nullable=False, default=0)
+    confirmados = Column(Integer, nullable=False, default=0)
+    cancelados = Column(Integer, nullable=False, default=0)
+    # Suma de precio_aplicado (precio al reservar) de los confirmados (centavos)
+    ingresos = Column(Integer, nullable=False, default=0)
+
+
+# -------------------------
+# Versión de cambios por emprendedor (validadores HTTP de las rutas públicas)
+# -------------------------
+class EmprendedorVersion(Base):
+    """
+    Se incrementa con cada escritura ORM de Emprendedor/Servicio/Horario/Turno
+    del emprendedor (app/utils/versiones.py).
+    """
+    __tablename__ = "emprendedor_versiones"
+
+    emprendedor_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    actualizado_en = Column(DateTime(timezone=True), nullable=True)
+
+
+# -------------------------
+# Secuencias (contadores con nombre)
+# -------------------------
+class Secuencia(Base):
+    """
+    Contador portable (SQLite / Postgres). "codigo_publico" numera los códigos
+    públicos que emite app/utils/codigos.py.
+    """
+    __tablename__ = "secuencias"
+
+    nombre = Column(String(50), primary_key=True)
+    valor = Column(BigInteger, nullable=False, default=0)
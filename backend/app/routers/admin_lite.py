@@ -1,104 +1,149 @@
 # app/routers/admin_lite.py
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-import sqlite3
 
-from app.database import engine  # usamos el mismo archivo .db del proyecto
+from sqlalchemy import func, inspect, select
+
+from app.database import engine  # mismo engine (y pool) que el resto de la app
+from app import models
+from app.deps import get_admin_user
+from app.utils.auth_cache import cache_usuarios
+from app.utils.disponibilidad_cache import cache_disponibilidad
+from app.utils.emprendedor import emprendedor_por_usuario
+from app.utils.hash_pool import pool_hash
+from app.utils.http_cache import metricas_http_cache
 
 router = APIRouter(prefix="/admin-lite", tags=["admin-lite"])
 
-# ---------- helpers ----------
+T = models.Turno.__table__
+S = models.Servicio.__table__
+E = models.Emprendedor.__table__
+U = models.Usuario.__table__
+R = models.TurnoDailyRollup.__table__
 
-def _db_path() -> str:
-    # mismo archivo que usa SQLAlchemy
-    p = engine.url.database
-    if not p:
-        # fallback relativo
-        p = str(Path(__file__).resolve().parent / "database.db")
-    return p
+# ---------- helpers ----------
 
-def _connect():
-    conn = sqlite3.connect(_db_path(), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+def _parse_dt(v: str) -> datetime:
+    # ISO con "Z" u offset => naive UTC (misma convención con que se guardan los turnos)
+    s = v.strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    d = datetime.fromisoformat(s)
+    if d.tzinfo is not None:
+        d = d.astimezone(timezone.utc).replace(tzinfo=None)
+    return d
 
 def _parse_range(desde: str | None, hasta: str | None):
     # default: último mes (UTC)
-    now = datetime.now(timezone.utc)
     if not desde or not hasta:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         first = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         # fin de mes
         next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
         last = next_month - timedelta(microseconds=1)
-        return first.isoformat(), last.isoformat()
+        return first, last
 
-    # vienen en ISO "Z" o con offset => las usamos tal cual para sqlite
-    return desde, hasta
+    return _parse_dt(desde), _parse_dt(hasta)
 
 # ---------- endpoints ----------
 
 @router.get("/debug")
 def debug():
-    db = _db_path()
+    db = engine.url.database
     try:
-        with _connect() as cn:
-            c = cn.cursor()
-            tables = [r[0] for r in c.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-            ).fetchall()]
+        tables = sorted(inspect(engine).get_table_names())
     except Exception:
         tables = []
     return {"db_path": db, "tables": tables}
 
+@router.get("/cache-disponibilidad")
+def cache_disponibilidad_stats():
+    return cache_disponibilidad.stats()
+
+@router.post("/cache-disponibilidad", dependencies=[Depends(get_admin_user)])
+def cache_disponibilidad_config(
+    activo: bool | None = Query(None),
+    limpiar: bool = Query(False),
+):
+    # permite prender/apagar el cache en caliente para comparar latencias
+    if activo is not None:
+        cache_disponibilidad.activo = activo
+    if limpiar or activo is False:
+        cache_disponibilidad.limpiar()
+    return cache_disponibilidad.stats()
+
+@router.get("/cache-auth")
+def cache_auth_stats():
+    # hits = lecturas de Usuario que se ahorró la autenticación
+    return cache_usuarios.stats()
+
+@router.post("/cache-auth", dependencies=[Depends(get_admin_user)])
+def cache_auth_config(
+    activo: bool | None = Query(None),
+    limpiar: bool = Query(False),
+):
+    if activo is not None:
+        cache_usuarios.activo = activo
+    if limpiar or activo is False:
+        cache_usuarios.limpiar()
+    return cache_usuarios.stats()
+
+@router.get("/cache-emprendedores")
+def cache_emprendedores_stats():
+    return emprendedor_por_usuario.stats()
+
+@router.get("/cache-http")
+def cache_http_stats():
+    # ratio_304: fracción de lecturas públicas que se contestaron sin ejecutar el handler
+    return metricas_http_cache.stats()
+
+@router.post("/cache-http", dependencies=[Depends(get_admin_user)])
+def cache_http_config(limpiar: bool = Query(False)):
+    out = metricas_http_cache.stats()
+    if limpiar:
+        metricas_http_cache.limpiar()
+    return out
+
+@router.get("/hash-pool")
+def hash_pool_stats():
+    # espera_ms alta o rechazados > 0: ráfaga de logins por encima de PASSWORD_HASH_WORKERS
+    return pool_hash.stats()
+
 @router.get("/kpis")
 def kpis(
     desde: str | None = Query(None),
     hasta: str | None = Query(None),
 ):
-    d, h = _parse_range(desde, hasta)
-
-    with _connect() as cn:
-        c = cn.cursor()
-
-        # Totales (sin rango) para que nunca veas todo en 0
-        tot_usuarios = c.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
-        tot_emprs    = c.execute("SELECT COUNT(*) FROM emprendedores").fetchone()[0]
-        tot_servs    = c.execute("SELECT COUNT(*) FROM servicios").fetchone()[0]
-        tot_turnos   = c.execute("SELECT COUNT(*) FROM turnos").fetchone()[0]
-
-        # Por rango (turnos y facturación)
-        turnos_rango = c.execute(
-            "SELECT COUNT(*) FROM turnos WHERE inicio BETWEEN ? AND ?",
-            (d, h)
-        ).fetchone()[0]
-
-        cancelados = c.execute(
-            "SELECT COUNT(*) FROM turnos WHERE estado='cancelado' AND inicio BETWEEN ? AND ?",
-            (d, h)
-        ).fetchone()[0]
-
-        # ingresos = SUM(COALESCE(turnos.precio_aplicado, servicios.precio))
-        ingresos = c.execute("""
-            SELECT COALESCE(SUM(
-              COALESCE(t.precio_aplicado, s.precio)
-            ), 0)
-            FROM turnos t
-            LEFT JOIN servicios s ON s.id = t.servicio_id
-            WHERE t.estado='confirmado' AND t.inicio BETWEEN ? AND ?
-        """, (d, h)).fetchone()[0]
+    d, h = _parse_range(desde, hasta)  # el rollup es diario: se toman días completos
+
+    # Una sola consulta sobre turnos_daily_rollup: el costo depende de los días
+    # del rango (y no de la cantidad de turnos). Totales como subconsultas escalares.
+    total_turnos = R.c.pendientes + R.c.confirmados + R.c.cancelados
+    stmt = select(
+        select(func.count()).select_from(U).scalar_subquery().label("usuarios_total"),
+        select(func.count()).select_from(E).scalar_subquery().label("emprendedores_total"),
+        select(func.count()).select_from(S).scalar_subquery().label("servicios_total"),
+        select(func.coalesce(func.sum(total_turnos), 0)).scalar_subquery().label("turnos_total"),
+        func.coalesce(func.sum(total_turnos), 0).label("turnos"),
+        func.coalesce(func.sum(R.c.cancelados), 0).label("cancelados"),
+        # ingresos: suma del precio_aplicado de los confirmados, acumulada en el rollup
+        func.coalesce(func.sum(R.c.ingresos), 0).label("ingresos"),
+    ).where(R.c.dia.between(d.date(), h.date()))
+
+    with engine.connect() as cn:
+        r = cn.execute(stmt).mappings().one()
 
     return {
         # Por rango:
-        "turnos": turnos_rango,
-        "cancelados": cancelados,
-        "ingresos": ingresos,  # en centavos si tus precios lo están (coherente con tu modelo)
-        "desde": d, "hasta": h,
+        "turnos": r["turnos"],
+        "cancelados": r["cancelados"],
+        "ingresos": r["ingresos"],  # en centavos si tus precios lo están (coherente con tu modelo)
+        "desde": d.isoformat(), "hasta": h.isoformat(),
         # Totales:
-        "usuarios_total": tot_usuarios,
-        "emprendedores_total": tot_emprs,
-        "servicios_total": tot_servs,
-        "turnos_total": tot_turnos,
+        "usuarios_total": r["usuarios_total"],
+        "emprendedores_total": r["emprendedores_total"],
+        "servicios_total": r["servicios_total"],
+        "turnos_total": r["turnos_total"],
     }
 
 @router.get("/servicios-agg")
@@ -108,26 +153,22 @@ def servicios_agg(
 ):
     d, h = _parse_range(desde, hasta)
 
-    with _connect() as cn:
-        c = cn.cursor()
-        rows = c.execute("""
-            SELECT
-              s.id            AS servicio_id,
-              s.nombre        AS nombre,
-              COUNT(t.id)     AS cantidad,
-              COALESCE(SUM(
-                CASE
-                  WHEN t.estado='confirmado'
-                  THEN COALESCE(t.precio_aplicado, s.precio)
-                  ELSE 0
-                END
-              ), 0)           AS ingresos
-            FROM servicios s
-            LEFT JOIN turnos t ON t.servicio_id = s.id
-              AND t.inicio BETWEEN ? AND ?
-            GROUP BY s.id, s.nombre
-            ORDER BY cantidad DESC, ingresos DESC
-        """, (d, h)).fetchall()
+    # desde el rollup: filas por (día, servicio) en vez de un join por turno
+    cantidad = func.coalesce(
+        func.sum(R.c.pendientes + R.c.confirmados + R.c.cancelados), 0
+    ).label("cantidad")
+    ingresos = func.coalesce(func.sum(R.c.ingresos), 0).label("ingresos")
+    stmt = (
+        select(S.c.id.label("servicio_id"), S.c.nombre.label("nombre"), cantidad, ingresos)
+        .select_from(
+            S.outerjoin(R, (R.c.servicio_id == S.c.id) & R.c.dia.between(d.date(), h.date()))
+        )
+        .group_by(S.c.id, S.c.nombre)
+        .order_by(cantidad.desc(), ingresos.desc())
+    )
+
+    with engine.connect() as cn:
+        rows = cn.execute(stmt).mappings().all()
 
     return [dict(r) for r in rows]
 
@@ -139,26 +180,28 @@ def turnos_list(
 ):
     d, h = _parse_range(desde, hasta)
 
-    with _connect() as cn:
-        c = cn.cursor()
-        rows = c.execute("""
-            SELECT
-              t.id,
-              t.inicio,
-              t.fin,
-              t.estado,
-              t.cliente_nombre,
-              t.cliente_contacto,
-              COALESCE(t.precio_aplicado, s.precio) as precio,
-              s.nombre        AS servicio_nombre,
-              e.id            AS emprendedor_id,
-              e.nombre        AS emprendedor_nombre
-            FROM turnos t
-            LEFT JOIN servicios s     ON s.id = t.servicio_id
-            LEFT JOIN emprendedores e ON e.id = t.emprendedor_id
-            WHERE t.inicio BETWEEN ? AND ?
-            ORDER BY t.inicio DESC
-            LIMIT ?
-        """, (d, h, limit)).fetchall()
+    stmt = (
+        select(
+            T.c.id,
+            T.c.inicio,
+            T.c.fin,
+            T.c.estado,
+            T.c.cliente_nombre,
+            T.c.cliente_contacto,
+            func.coalesce(T.c.precio_aplicado, S.c.precio).label("precio"),
+            S.c.nombre.label("servicio_nombre"),
+            E.c.id.label("emprendedor_id"),
+            E.c.nombre.label("emprendedor_nombre"),
+        )
+        .select_from(
+            T.outerjoin(S, S.c.id == T.c.servicio_id).outerjoin(E, E.c.id == T.c.emprendedor_id)
+        )
+        .where(T.c.inicio.between(d, h))
+        .order_by(T.c.inicio.desc())
+        .limit(limit)
+    )
+
+    with engine.connect() as cn:
+        rows = cn.execute(stmt).mappings().all()
 
     return [dict(r) for r in rows]
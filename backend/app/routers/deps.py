@@ -1,23 +1,8 @@
 # app/routers/deps.py
-from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-
-from app.core.security import SECRET_KEY, ALGORITHM
-from app.database import get_db
-from app.models import Usuario
-
-oauth2 = OAuth2PasswordBearer(tokenUrl="/usuarios/login")
-
-def get_current_user(token: str = Depends(oauth2), db: Session = Depends(get_db)) -> Usuario:
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = int(payload.get("sub"))
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Token inválido/expirado")
-
-    user = db.query(Usuario).get(user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="Usuario no encontrado")
-    return user
+# Compatibilidad: el pipeline de autenticación vive en app.deps.
+from app.deps import (  # noqa: F401
+    oauth2,
+    get_current_user,
+    get_current_user_async,
+    get_emprendedor_id,
+)
@@ -1,41 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.routers.deps import get_current_user
-from app import models
+from app.deps import get_emprendedor_id
 from app.schemas import HorarioCreate, HorarioUpdate, HorarioOut
-from app.crud.horarios import get_horarios, create_horario, update_horario, delete_horario
+from app.crud.horarios import get_horarios, create_horario, update_horario, delete_horario, replace_semana
 
 router = APIRouter(prefix="/horarios", tags=["horarios"])
 
-def _require_emprendedor(db: Session, user: models.Usuario) -> models.Emprendedor:
-    emp = db.query(models.Emprendedor).filter(models.Emprendedor.usuario_id == user.id).first()
-    if not emp:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo para emprendedores")
-    return emp
-
 @router.get("/mis", response_model=list[HorarioOut])
-def listar_mis_horarios(db: Session = Depends(get_db), user: models.Usuario = Depends(get_current_user)):
-    emp = _require_emprendedor(db, user)
-    return get_horarios(db, emp.id)
+def listar_mis_horarios(db: Session = Depends(get_db), emp_id: int = Depends(get_emprendedor_id)):
+    return get_horarios(db, emp_id)
 
 @router.post("", response_model=HorarioOut, status_code=201)
-def crear_mi_horario(payload: HorarioCreate, db: Session = Depends(get_db), user: models.Usuario = Depends(get_current_user)):
-    emp = _require_emprendedor(db, user)
-    return create_horario(db, emp.id, payload)
+def crear_mi_horario(payload: HorarioCreate, db: Session = Depends(get_db), emp_id: int = Depends(get_emprendedor_id)):
+    return create_horario(db, emp_id, payload)
+
+@router.put("/mis/semana", response_model=list[HorarioOut])
+def reemplazar_mi_semana(payload: list[HorarioCreate], db: Session = Depends(get_db), emp_id: int = Depends(get_emprendedor_id)):
+    """Semana completa en un request: se aplica solo la diferencia con lo guardado."""
+    try:
+        return replace_semana(db, emp_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 @router.put("/{horario_id}", response_model=HorarioOut)
-def actualizar_mi_horario(horario_id: int, payload: HorarioUpdate, db: Session = Depends(get_db), user: models.Usuario = Depends(get_current_user)):
-    emp = _require_emprendedor(db, user)
-    updated = update_horario(db, horario_id, payload)
+def actualizar_mi_horario(horario_id: int, payload: HorarioUpdate, db: Session = Depends(get_db), emp_id: int = Depends(get_emprendedor_id)):
+    try:
+        updated = update_horario(db, emp_id, horario_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Ya existe ese bloque horario")
     if not updated:
         raise HTTPException(status_code=404, detail="Horario no encontrado")
     return updated
 
 @router.delete("/{horario_id}", status_code=204)
-def eliminar_mi_horario(horario_id: int, db: Session = Depends(get_db), user: models.Usuario = Depends(get_current_user)):
-    emp = _require_emprendedor(db, user)
-    ok = delete_horario(db, horario_id)
+def eliminar_mi_horario(horario_id: int, db: Session = Depends(get_db), emp_id: int = Depends(get_emprendedor_id)):
+    ok = delete_horario(db, emp_id, horario_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Horario no encontrado")
     return None
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app import models
+from app.utils.emprendedor import resolver_codigo
 
 # Usamos el mismo prefijo que consume el front: /horarios/de/{codigo}
 router = APIRouter(prefix="/horarios", tags=["horarios"])
@@ -60,6 +61,19 @@ def _to_hhmm(v: Any) -> str:
         return "00:00"
 
 
+def horario_publico(h: Any) -> HorarioPublicOut:
+    return HorarioPublicOut(
+        id=int(getattr(h, "id")),
+        dia_semana=int(_value_or(h, "dia_semana", "diaSemana", default=0)),
+        hora_desde=_to_hhmm(_value_or(h, "hora_desde", "desde", "horaDesde")),
+        hora_hasta=_to_hhmm(_value_or(h, "hora_hasta", "hasta", "horaHasta")),
+        intervalo_min=int(
+            _value_or(h, "intervalo_min", "intervalo", "intervaloMinutos", default=30)
+        ),
+        activo=bool(_value_or(h, "activo", default=True)),
+    )
+
+
 # ---- Endpoints públicos ------------------------------------------------------
 @router.get("/de/{codigo}", response_model=List[HorarioPublicOut])
 def get_horarios_by_codigo(codigo: str, db: Session = Depends(get_db)):
@@ -67,32 +81,14 @@ def get_horarios_by_codigo(codigo: str, db: Session = Depends(get_db)):
     Devuelve los horarios públicos del emprendedor por código de cliente.
     Formatea hora_desde/hora_hasta como 'HH:MM' para Pydantic v2.
     """
-    emp = (
-        db.query(models.Emprendedor)
-        .filter(models.Emprendedor.codigo_cliente == codigo)
-        .first()
-    )
-    if not emp:
+    emp_id = resolver_codigo(db, codigo)
+    if not emp_id:
         raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
 
     rows = (
         db.query(models.Horario)
-        .filter(models.Horario.emprendedor_id == emp.id)
+        .filter(models.Horario.emprendedor_id == emp_id)
         .all()
     )
 
-    out: List[HorarioPublicOut] = []
-    for h in rows:
-        out.append(
-            HorarioPublicOut(
-                id=int(getattr(h, "id")),
-                dia_semana=int(_value_or(h, "dia_semana", "diaSemana", default=0)),
-                hora_desde=_to_hhmm(_value_or(h, "hora_desde", "desde", "horaDesde")),
-                hora_hasta=_to_hhmm(_value_or(h, "hora_hasta", "hasta", "horaHasta")),
-                intervalo_min=int(
-                    _value_or(h, "intervalo_min", "intervalo", "intervaloMinutos", default=30)
-                ),
-                activo=bool(_value_or(h, "activo", default=True)),
-            )
-        )
-    return out
+    return [horario_publico(h) for h in rows]
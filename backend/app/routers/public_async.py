@@ -0,0 +1,61 @@
+# app/routers/public_async.py
+"""
+Versiones async de los endpoints públicos /de/{codigo} (se montan con DB_ASYNC=1).
+Misma lógica que los routers sync, ejecutada con AsyncSession.run_sync.
+"""
+from typing import List, Optional
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.routers import public_agenda, public_bundle, public_disponibilidad, public_servicios
+from app.routers.public_agenda import HorarioPublicOut
+from app.routers.public_bundle import AgendaOut
+from app.routers.public_disponibilidad import DisponibilidadOut
+from app.schemas import ServicioOut
+
+horarios_router = APIRouter(prefix="/horarios", tags=["horarios"])
+servicios_router = APIRouter(prefix="/servicios", tags=["servicios"])
+disponibilidad_router = APIRouter(prefix="/disponibilidad", tags=["disponibilidad"])
+agenda_router = APIRouter(prefix="/agenda", tags=["agenda"])
+
+
+@horarios_router.get("/de/{codigo}", response_model=List[HorarioPublicOut])
+async def get_horarios_by_codigo(codigo: str, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda s: public_agenda.get_horarios_by_codigo(codigo, s))
+
+
+@servicios_router.get("/de/{codigo}", response_model=List[ServicioOut])
+async def servicios_public_by_codigo(codigo: str, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda s: public_servicios.servicios_public_by_codigo(codigo, s))
+
+
+@disponibilidad_router.get("/de/{codigo}", response_model=DisponibilidadOut)
+async def disponibilidad_por_codigo(
+    codigo: str,
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    servicio_id: Optional[int] = Query(default=None),
+    intervalo_min: int = Query(default=30, ge=5, le=24 * 60),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(
+        lambda s: public_disponibilidad.disponibilidad_por_codigo(
+            codigo, desde, hasta, servicio_id, intervalo_min, s
+        )
+    )
+
+
+@agenda_router.get("/de/{codigo}", response_model=AgendaOut)
+async def agenda_por_codigo(
+    request: Request,
+    codigo: str,
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(
+        lambda s: public_bundle.agenda_por_codigo(request, codigo, desde, hasta, s)
+    )
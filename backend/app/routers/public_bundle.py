@@ -0,0 +1,99 @@
+# app/routers/public_bundle.py
+"""
+GET /agenda/de/{codigo}: todo lo que necesita /reservar/:codigo en una sola
+respuesta y una sola sesión (perfil, servicios activos, horarios activos y
+los intervalos ocupados de la ventana pedida).
+
+ETag fuerte y Last-Modified salen de la versión de cambios del emprendedor
+(app.utils.versiones): una visita repetida sin cambios se contesta 304 con
+una lectura por PK, sin consultar Turno.
+"""
+from datetime import datetime, time, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app import models
+from app.routers.public_agenda import HorarioPublicOut, horario_publico
+from app.routers.public_disponibilidad import MAX_DIAS, _cargar_ocupados
+from app.schemas import ServicioOut
+from app.utils.emprendedor import resolver_codigo, serializar_emprendedor
+from app.utils.http_cache import metricas_http_cache, no_modificado, politica, respuesta_304, validadores
+from app.utils.versiones import version_de
+
+router = APIRouter(prefix="/agenda", tags=["agenda"])
+
+
+class IntervaloOcupadoOut(BaseModel):
+    inicio: datetime
+    fin: datetime
+
+
+class AgendaOut(BaseModel):
+    emprendedor: dict
+    servicios: List[ServicioOut]
+    horarios: List[HorarioPublicOut]
+    desde: datetime
+    hasta: datetime
+    ocupados: List[IntervaloOcupadoOut]
+
+
+@router.get("/de/{codigo}", response_model=AgendaOut)
+def agenda_por_codigo(
+    request: Request,
+    codigo: str,
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    emp_id = resolver_codigo(db, codigo)
+    if not emp_id:
+        raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
+
+    # misma ventana y límites que /disponibilidad/de/{codigo}
+    d = (desde or datetime.combine(datetime.now().date(), time.min)).replace(tzinfo=None)
+    h = (hasta or d + timedelta(days=7)).replace(tzinfo=None)
+    if h <= d:
+        raise HTTPException(status_code=422, detail="'hasta' debe ser posterior a 'desde'")
+    if h - d > timedelta(days=MAX_DIAS):
+        raise HTTPException(status_code=422, detail=f"El rango máximo es de {MAX_DIAS} días")
+
+    # la versión se lee antes que los datos: si algo cambia en el medio, el
+    # ETag queda viejo y el próximo request vuelve a bajar (nunca al revés)
+    version, ultima_mod = version_de(db, emp_id)
+    etag = f'"agenda-{emp_id}-{version}-{d:%Y%m%d%H%M}-{h:%Y%m%d%H%M}"'
+    headers = validadores(etag, ultima_mod, politica("agenda"))
+    if no_modificado(request, etag, ultima_mod):
+        metricas_http_cache.registrar("agenda", True)
+        return respuesta_304(headers)
+    metricas_http_cache.registrar("agenda", False)
+
+    emp = db.get(models.Emprendedor, emp_id)
+    if not emp:
+        raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
+    servicios = (
+        db.query(models.Servicio)
+        .filter(models.Servicio.emprendedor_id == emp_id, models.Servicio.activo == True)  # noqa: E712
+        .order_by(models.Servicio.nombre.asc())
+        .all()
+    )
+    horarios = (
+        db.query(models.Horario)
+        .filter(models.Horario.emprendedor_id == emp_id, models.Horario.activo == True)  # noqa: E712
+        .order_by(models.Horario.dia_semana.asc(), models.Horario.desde.asc())
+        .all()
+    )
+    ocupados = _cargar_ocupados(db, emp_id, d, h)
+
+    out = AgendaOut(
+        emprendedor=serializar_emprendedor(emp),
+        servicios=[ServicioOut.model_validate(s) for s in servicios],
+        horarios=[horario_publico(x) for x in horarios],
+        desde=d,
+        hasta=h,
+        ocupados=[IntervaloOcupadoOut(inicio=o.inicio, fin=o.fin) for o in ocupados],
+    )
+    return Response(content=out.model_dump_json(), media_type="application/json", headers=headers)
@@ -0,0 +1,188 @@
+# app/routers/public_disponibilidad.py
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app import models
+from app.utils.emprendedor import resolver_codigo
+from app.utils.disponibilidad import (
+    bloque_de_horario,
+    dia_semana,
+    hhmm,
+    inicios_del_dia,
+    libres_del_dia,
+    limites_del_dia,
+    ocupados_por_dia,
+)
+from app.utils.disponibilidad_cache import a_bitmap, cache_disponibilidad, de_bitmap
+
+router = APIRouter(prefix="/disponibilidad", tags=["disponibilidad"])
+
+# Ventana máxima consultable (evita que un anónimo pida años de agenda)
+MAX_DIAS = 62
+
+
+# ---- Schemas públicos --------------------------------------------------------
+class DiaDisponibleOut(BaseModel):
+    fecha: str          # YYYY-MM-DD
+    inicios: List[str]  # ["09:00", "09:30", ...]
+
+
+class DisponibilidadOut(BaseModel):
+    emprendedor_id: int
+    servicio_id: Optional[int] = None
+    duracion_min: int
+    intervalo_min: int
+    dias: List[DiaDisponibleOut]
+
+
+# ---- Utilidades internas -----------------------------------------------------
+def _cargar_bloques(db: Session, emprendedor_id: int) -> dict[int, list[tuple[int, int]]]:
+    rows = (
+        db.query(models.Horario.dia_semana, models.Horario.desde, models.Horario.hasta)
+        .filter(
+            models.Horario.emprendedor_id == emprendedor_id,
+            models.Horario.activo == True,  # noqa: E712
+        )
+        .all()
+    )
+    bloques: dict[int, list[tuple[int, int]]] = {}
+    for dia, desde, hasta in rows:
+        b = bloque_de_horario(desde, hasta)
+        if b:
+            bloques.setdefault(int(dia), []).append(b)
+    for arr in bloques.values():
+        arr.sort()
+    return bloques
+
+
+def _cargar_ocupados(db: Session, emprendedor_id: int, desde: datetime, hasta: datetime):
+    """
+    Una sola consulta por rango sobre ix_turno_emprendedor_inicio.
+    El margen de un día hacia atrás captura turnos que empiezan antes de 'desde'
+    y todavía lo pisan (la duración máxima de un servicio es 24 h).
+    """
+    return (
+        db.query(models.Turno.inicio, models.Turno.fin)
+        .filter(
+            models.Turno.emprendedor_id == emprendedor_id,
+            models.Turno.inicio >= desde - timedelta(days=1),
+            models.Turno.inicio < hasta,
+            models.Turno.fin > desde,
+            models.Turno.estado != models.EstadoTurno.cancelado,
+        )
+        .order_by(models.Turno.inicio.asc())
+        .all()
+    )
+
+
+def _libres_por_dia(
+    db: Session,
+    emprendedor_id: int,
+    desde: datetime,
+    hasta: datetime,
+    duracion: int,
+    paso: int,
+    capacidad: int = 1,
+) -> list[tuple[date, list[int]]]:
+    """
+    Arma los inicios libres de cada día de [desde, hasta) desde el cache de bitmaps.
+    Solo consulta Turno para el tramo de días que falta en el cache.
+    """
+    cache = cache_disponibilidad
+    version = cache.version(emprendedor_id)
+
+    bloques_sem = cache.bloques(emprendedor_id)
+    if bloques_sem is None:
+        bloques_sem = _cargar_bloques(db, emprendedor_id)
+        cache.guardar_bloques(emprendedor_id, bloques_sem, version)
+
+    primer_dia = desde.date()
+    ultimo_dia = (hasta - timedelta(microseconds=1)).date()
+    dias: list[date] = []
+    d = primer_dia
+    while d <= ultimo_dia:
+        dias.append(d)
+        d += timedelta(days=1)
+
+    libres: dict[date, list[tuple[int, int]]] = {}
+    faltan: list[date] = []
+    for d in dias:
+        bits = cache.dia(emprendedor_id, d)
+        if bits is None:
+            faltan.append(d)
+        else:
+            libres[d] = de_bitmap(bits)
+
+    if faltan:
+        ini = datetime.combine(faltan[0], time.min)
+        fin = datetime.combine(faltan[-1] + timedelta(days=1), time.min)
+        ocupados = ocupados_por_dia(_cargar_ocupados(db, emprendedor_id, ini, fin), faltan[0], faltan[-1])
+        for d in faltan:
+            bits = a_bitmap(libres_del_dia(bloques_sem.get(dia_semana(d)) or [], ocupados.get(d, ()), capacidad))
+            cache.guardar_dia(emprendedor_id, d, bits, version)
+            # misma granularidad con o sin cache, así ambos modos responden igual
+            libres[d] = de_bitmap(bits)
+
+    out: list[tuple[date, list[int]]] = []
+    for d in dias:
+        minimo, maximo = limites_del_dia(d, desde, hasta)
+        bloques = bloques_sem.get(dia_semana(d)) or []
+        out.append((d, inicios_del_dia(bloques, libres[d], duracion, paso, minimo, maximo)))
+    return out
+
+
+# ---- Endpoints públicos ------------------------------------------------------
+@router.get("/de/{codigo}", response_model=DisponibilidadOut)
+def disponibilidad_por_codigo(
+    codigo: str,
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    servicio_id: Optional[int] = Query(default=None),
+    intervalo_min: int = Query(default=30, ge=5, le=24 * 60),
+    db: Session = Depends(get_db),
+):
+    """
+    Devuelve solo los inicios libres por día para el servicio pedido.
+    Resta los turnos no cancelados a los bloques de Horario en el servidor,
+    así el front no necesita descargar la lista de reservas.
+    """
+    emp_id = resolver_codigo(db, codigo)
+    emp = db.get(models.Emprendedor, emp_id) if emp_id else None
+    if not emp:
+        raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
+
+    duracion = 30
+    if servicio_id:
+        srv = (
+            db.query(models.Servicio)
+            .filter(models.Servicio.id == servicio_id, models.Servicio.emprendedor_id == emp.id)
+            .first()
+        )
+        if not srv:
+            raise HTTPException(status_code=404, detail="Servicio no encontrado")
+        duracion = int(srv.duracion_min or 30)
+
+    # naive (misma convención que turnos._parse_dt)
+    d = (desde or datetime.combine(datetime.now().date(), time.min)).replace(tzinfo=None)
+    h = (hasta or d + timedelta(days=7)).replace(tzinfo=None)
+    if h <= d:
+        raise HTTPException(status_code=422, detail="'hasta' debe ser posterior a 'desde'")
+    if h - d > timedelta(days=MAX_DIAS):
+        raise HTTPException(status_code=422, detail=f"El rango máximo es de {MAX_DIAS} días")
+
+    dias = _libres_por_dia(db, emp.id, d, h, duracion, intervalo_min, int(emp.capacidad or 1))
+    return DisponibilidadOut(
+        emprendedor_id=emp.id,
+        servicio_id=servicio_id,
+        duracion_min=duracion,
+        intervalo_min=intervalo_min,
+        dias=[
+            DiaDisponibleOut(fecha=f.isoformat(), inicios=[hhmm(m) for m in inicios])
+            for f, inicios in dias
+        ],
+    )
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app import models
+from app.utils.emprendedor import resolver_codigo
 from app.schemas import TurnoOut
 
 router = APIRouter(prefix="/turnos", tags=["turnos"])
@@ -22,15 +23,11 @@ def turnos_publicos_por_codigo(
     Filtra por 'inicio' usando 'desde' / 'hasta' si vienen.
     Excluye cancelados si existe el campo/enum 'estado'.
     """
-    emp = (
-        db.query(models.Emprendedor)
-        .filter(models.Emprendedor.codigo_cliente == codigo)
-        .first()
-    )
-    if not emp:
+    emp_id = resolver_codigo(db, codigo)
+    if not emp_id:
         raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
 
-    q = db.query(models.Turno).filter(models.Turno.emprendedor_id == emp.id)
+    q = db.query(models.Turno).filter(models.Turno.emprendedor_id == emp_id)
 
     if desde is not None:
         q = q.filter(models.Turno.inicio >= desde)
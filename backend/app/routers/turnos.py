@@ -1,16 +1,28 @@
 # app/routers/turnos.py
 from __future__ import annotations
 
+import base64
+import json
 from datetime import datetime, timedelta
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 
-from app.database import get_db
-from app.routers.deps import get_current_user
+from app.database import DB_ASYNC, AsyncSessionLocal, SessionLocal, get_db, transaccion_escritura
+from app.deps import get_current_user
 from app import models
-from app.schemas import TurnoOut
+from app.schemas import ConflictoTurnoOut, TurnoOut, TurnosLoteOut
+from app.utils import rollup, versiones
+from app.utils.disponibilidad import max_simultaneos, repartir_carriles
+from app.utils.disponibilidad_cache import cache_disponibilidad
+from app.utils.emprendedor import emprendedor_id_de_usuario, resolver_codigo
+from app.utils.recurrencia import expandir
 
 router = APIRouter(prefix="/turnos", tags=["turnos"])
 
@@ -48,14 +60,10 @@ def _resolve_emprendedor_id(
     if emprendedor_id:
         return int(emprendedor_id)
     if emprendedor_codigo:
-        emp = (
-            db.query(models.Emprendedor)
-            .filter(models.Emprendedor.codigo_cliente == str(emprendedor_codigo).upper())
-            .first()
-        )
-        if not emp:
+        emp_id = resolver_codigo(db, emprendedor_codigo)
+        if not emp_id:
             raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
-        return int(emp.id)
+        return emp_id
     raise HTTPException(status_code=422, detail="Falta emprendedor_id o emprendedor_codigo")
 
 
@@ -70,6 +78,116 @@ def _duracion_por_servicio(db: Session, servicio_id: Optional[int]) -> int:
         return 30
 
 
+def _verificar_disponible(
+    db: Session,
+    emp_id: int,
+    inicio: datetime,
+    fin: datetime,
+    cliente_id: Optional[int] = None,
+    excluir_id: Optional[int] = None,
+) -> int:
+    """
+    Una sola consulta (sobre ix_turno_emprendedor_inicio_fin): capacidad del
+    emprendedor + turnos no cancelados que se solapan con [inicio, fin).
+    Con un barrido de eventos sobre ese conjunto se verifica que en ningún
+    instante se supere la capacidad. Devuelve el carril libre para el turno
+    (ver _elegir_carril); levanta 404/409 según corresponda.
+    """
+    if fin <= inicio:
+        raise HTTPException(status_code=422, detail="'fin' debe ser posterior a 'inicio'")
+
+    T = models.Turno
+    solape = [
+        T.emprendedor_id == models.Emprendedor.id,
+        T.inicio < fin,
+        T.fin > inicio,
+        T.estado != models.EstadoTurno.cancelado,
+    ]
+    if excluir_id:
+        solape.append(T.id != excluir_id)
+    rows = (
+        db.query(models.Emprendedor.capacidad, T.inicio, T.fin, T.cliente_id, T.carril)
+        .select_from(models.Emprendedor)
+        .outerjoin(T, and_(*solape))
+        .filter(models.Emprendedor.id == emp_id)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
+
+    capacidad = max(1, int(rows[0].capacidad or 1))
+    otros = [r for r in rows if r.inicio is not None]
+    tramos = [(max(_parse_dt(r.inicio), inicio), min(_parse_dt(r.fin), fin)) for r in otros]
+    if max_simultaneos(tramos) + 1 > capacidad:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ese horario ya está reservado")
+
+    if cliente_id is not None and any(r.cliente_id == cliente_id for r in otros):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ya tenés un turno en ese horario")
+
+    return _elegir_carril(db, emp_id, capacidad, inicio, fin, otros, excluir_id)
+
+
+def _elegir_carril(db: Session, emp_id: int, capacidad: int, inicio: datetime, fin: datetime,
+                   otros: list, excluir_id: Optional[int]) -> int:
+    """
+    El turno ocupa un mismo carril todo su rango (un mismo sillón/box). 'otros'
+    son los turnos que se solapan con [inicio, fin): un carril sirve si ninguno
+    de ellos lo usa. Si la capacidad alcanza pero ningún carril queda libre
+    todo el rango (capacidad 2: A 10-11 en 0, B 11-12 en 1, nuevo 10-12), se
+    reacomodan los carriles del grupo de turnos encadenados por solapamiento.
+    """
+    usados = {int(r.carril or 0) for r in otros}
+    for carril in range(capacidad):
+        if carril not in usados:
+            return carril
+    return _reacomodar_carriles(db, emp_id, capacidad, inicio, fin, excluir_id)
+
+
+def _reacomodar_carriles(db: Session, emp_id: int, capacidad: int, inicio: datetime, fin: datetime,
+                         excluir_id: Optional[int]) -> int:
+    """
+    Reparte de nuevo los carriles de todos los turnos encadenados (por
+    solapamiento) con [inicio, fin), incluido el nuevo. Asignar por orden de
+    inicio al carril libre más bajo usa exactamente tantos carriles como el
+    pico de simultaneidad, que ya se verificó <= capacidad. Corre dentro de la
+    transacción de la reserva y devuelve el carril del turno nuevo.
+    """
+    T = models.Turno.__table__.c
+    lo, hi = inicio, fin
+    while True:
+        stmt = select(T.id, T.inicio, T.fin, T.carril).where(
+            T.emprendedor_id == emp_id,
+            T.inicio < hi,
+            T.fin > lo,
+            T.estado != models.EstadoTurno.cancelado,
+        )
+        if excluir_id:
+            stmt = stmt.where(T.id != excluir_id)
+        grupo = [(f.id, _parse_dt(f.inicio), _parse_dt(f.fin), int(f.carril or 0)) for f in db.execute(stmt)]
+        n_lo = min([lo] + [g[1] for g in grupo])
+        n_hi = max([hi] + [g[2] for g in grupo])
+        if (n_lo, n_hi) == (lo, hi):
+            break
+        lo, hi = n_lo, n_hi
+
+    nuevos = repartir_carriles([(g[0], g[1], g[2]) for g in grupo] + [(None, inicio, fin)], capacidad)
+    if nuevos is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ese horario ya está reservado")
+
+    movidos = [(tid, nuevos[tid]) for tid, _, _, actual in grupo if nuevos[tid] != actual]
+    if movidos:
+        tabla = models.Turno.__table__
+        if db.get_bind().dialect.name == "postgresql":
+            # la constraint de exclusión se chequea fila a fila: primero a carriles
+            # temporales únicos (>= capacidad) para no chocar a mitad del intercambio
+            temporales = [tid for tid, _ in movidos] + ([excluir_id] if excluir_id else [])
+            for k, tid in enumerate(temporales):
+                db.execute(update(tabla).where(tabla.c.id == tid).values(carril=capacidad + k))
+        for tid, carril in movidos:
+            db.execute(update(tabla).where(tabla.c.id == tid).values(carril=carril))
+    return nuevos[None]
+
+
 def _coalesce(*vals):
     for v in vals:
         if v is not None:
@@ -78,45 +196,152 @@ def _coalesce(*vals):
 
 
 # ----------------------------
-# Listados (privado del usuario)
+# Listados: paginación keyset (inicio, id) y modo NDJSON
 # ----------------------------
+# Sin ?limit ni ?cursor se devuelve el rango completo (lo que espera el front).
+# Con ?limit (o ?cursor; default LIMITE_DEFAULT) se pagina: lista de TurnoOut y, si
+# hay más filas, el cursor opaco de la siguiente página en el header X-Next-Cursor.
+# Con ?formato=ndjson se devuelve todo el rango en streaming (una línea JSON por
+# turno, leído en lotes con yield_per; con DB_ASYNC=1 sobre la sesión async).
+LIMITE_DEFAULT = 500
+LIMITE_MAX = 2000
+LOTE_STREAM = 500
+
+
+def _cursor_codificar(inicio: datetime, turno_id: int) -> str:
+    raw = json.dumps([inicio.isoformat(), int(turno_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _cursor_decodificar(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ini, turno_id = json.loads(raw)
+        return datetime.fromisoformat(ini), int(turno_id)
+    except Exception:
+        raise HTTPException(status_code=422, detail="cursor inválido")
+
+
+# Camino rápido: se proyectan solo las columnas de TurnoOut (tuplas, sin identity
+# map ni atributos lazy) y se serializa en bloque con TypeAdapters armados una vez.
+# La salida es la misma que validar instancias ORM contra TurnoOut.
+_CAMPOS_TURNO_OUT = tuple(TurnoOut.model_fields)
+_COLUMNAS_TURNO_OUT = tuple(models.Turno.__table__.c[c] for c in _CAMPOS_TURNO_OUT)
+_TURNO_OUT = TypeAdapter(TurnoOut)
+_LISTA_TURNO_OUT = TypeAdapter(List[TurnoOut])
+
+
+def _query_turnos(
+    *,
+    desde: Optional[datetime],
+    hasta: Optional[datetime],
+    cursor: Optional[str],
+    cliente_id: Optional[int] = None,
+    emprendedor_id: Optional[int] = None,
+):
+    T = models.Turno.__table__.c
+    stmt = select(*_COLUMNAS_TURNO_OUT)
+    if cliente_id is not None:
+        stmt = stmt.where(T.cliente_id == cliente_id)
+    if emprendedor_id is not None:
+        stmt = stmt.where(T.emprendedor_id == emprendedor_id)
+    if desde:
+        stmt = stmt.where(T.inicio >= desde)
+    if hasta:
+        stmt = stmt.where(T.inicio <= hasta)
+    if cursor:
+        c_ini, c_id = _cursor_decodificar(cursor)
+        stmt = stmt.where(or_(T.inicio > c_ini, and_(T.inicio == c_ini, T.id > c_id)))
+    return stmt.order_by(T.inicio.asc(), T.id.asc())
+
+
+def _turnos_json(db: Session, *, limit: Optional[int], **filtros) -> tuple[bytes, Optional[str]]:
+    """Página de turnos ya serializada (JSON de List[TurnoOut]) y cursor siguiente."""
+    if limit is None and filtros.get("cursor"):
+        limit = LIMITE_DEFAULT
+    stmt = _query_turnos(**filtros)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    filas = db.execute(stmt).all()
+    siguiente = None
+    if limit is not None and len(filas) > limit:
+        filas = filas[:limit]
+        ultima = filas[-1]
+        siguiente = _cursor_codificar(ultima.inicio, ultima.id)
+    datos = [dict(zip(_CAMPOS_TURNO_OUT, f)) for f in filas]
+    return _LISTA_TURNO_OUT.dump_json(_LISTA_TURNO_OUT.validate_python(datos)), siguiente
+
+
+def _lote_ndjson(lote) -> bytes:
+    datos = [dict(zip(_CAMPOS_TURNO_OUT, f)) for f in lote]
+    return b"".join(_TURNO_OUT.dump_json(t) + b"\n" for t in _LISTA_TURNO_OUT.validate_python(datos))
+
+
+# La sesión del request se cierra antes de que arranque el streaming: el
+# generador abre la suya, del mismo tipo que la del router montado.
+def _stream_ndjson(stmt):
+    s = SessionLocal()
+    try:
+        res = s.execute(stmt.execution_options(yield_per=LOTE_STREAM))
+        for lote in res.partitions():
+            yield _lote_ndjson(lote)
+    finally:
+        s.close()
+
+
+async def _stream_ndjson_async(stmt):
+    async with AsyncSessionLocal() as s:
+        res = await s.stream(stmt.execution_options(yield_per=LOTE_STREAM))
+        async for lote in res.partitions():
+            yield _lote_ndjson(lote)
+
+
+def _listar(db: Session, *, formato: Optional[str], limit: Optional[int], **filtros) -> Response:
+    if formato == "ndjson":
+        stmt = _query_turnos(**filtros)
+        filas = _stream_ndjson_async(stmt) if DB_ASYNC else _stream_ndjson(stmt)
+        return StreamingResponse(filas, media_type="application/x-ndjson")
+
+    cuerpo, siguiente = _turnos_json(db, limit=limit, **filtros)
+    resp = Response(content=cuerpo, media_type="application/json")
+    if siguiente:
+        resp.headers["X-Next-Cursor"] = siguiente
+    return resp
+
+
 @router.get("/mis", response_model=List[TurnoOut])
 def turnos_mis(
     desde: Optional[datetime] = Query(default=None),
     hasta: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=LIMITE_MAX),
+    formato: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
     db: Session = Depends(get_db),
     user: models.Usuario = Depends(get_current_user),
 ):
-    d = _parse_dt(desde)
-    h = _parse_dt(hasta)
-    q = db.query(models.Turno).filter(models.Turno.cliente_id == user.id)
-    if d:
-        q = q.filter(models.Turno.inicio >= d)
-    if h:
-        q = q.filter(models.Turno.inicio <= h)
-    q = q.order_by(models.Turno.inicio.asc())
-    return q.all()
+    return _listar(
+        db, formato=formato, limit=limit,
+        desde=_parse_dt(desde), hasta=_parse_dt(hasta), cursor=cursor, cliente_id=user.id,
+    )
 
 
 @router.get("/owner", response_model=List[TurnoOut])
 def turnos_owner(
     desde: Optional[datetime] = Query(default=None),
     hasta: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=LIMITE_MAX),
+    formato: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
     db: Session = Depends(get_db),
     user: models.Usuario = Depends(get_current_user),
 ):
-    emp = db.query(models.Emprendedor).filter(models.Emprendedor.usuario_id == user.id).first()
-    if not emp:
+    emp_id = emprendedor_id_de_usuario(db, user.id)
+    if not emp_id:
         return []
-    d = _parse_dt(desde)
-    h = _parse_dt(hasta)
-    q = db.query(models.Turno).filter(models.Turno.emprendedor_id == emp.id)
-    if d:
-        q = q.filter(models.Turno.inicio >= d)
-    if h:
-        q = q.filter(models.Turno.inicio <= h)
-    q = q.order_by(models.Turno.inicio.asc())
-    return q.all()
+    return _listar(
+        db, formato=formato, limit=limit,
+        desde=_parse_dt(desde), hasta=_parse_dt(hasta), cursor=cursor, emprendedor_id=emp_id,
+    )
 
 
 # ----------------------------
@@ -127,26 +352,19 @@ def turnos_publicos_por_codigo(
     codigo: str,
     desde: Optional[datetime] = Query(default=None),
     hasta: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=LIMITE_MAX),
+    formato: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
     db: Session = Depends(get_db),
 ):
-    emp = (
-        db.query(models.Emprendedor)
-        .filter(models.Emprendedor.codigo_cliente == str(codigo).upper())
-        .first()
-    )
-    if not emp:
+    emp_id = resolver_codigo(db, codigo)
+    if not emp_id:
         raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
 
-    d = _parse_dt(desde)
-    h = _parse_dt(hasta)
-
-    q = db.query(models.Turno).filter(models.Turno.emprendedor_id == emp.id)
-    if d:
-        q = q.filter(models.Turno.inicio >= d)
-    if h:
-        q = q.filter(models.Turno.inicio <= h)
-    q = q.order_by(models.Turno.inicio.asc())
-    return q.all()
+    return _listar(
+        db, formato=formato, limit=limit,
+        desde=_parse_dt(desde), hasta=_parse_dt(hasta), cursor=cursor, emprendedor_id=emp_id,
+    )
 
 
 # ----------------------------
@@ -191,25 +409,6 @@ def crear_turno_compat(
     if not fin:
         fin = inicio + timedelta(minutes=_duracion_por_servicio(db, sid))
 
-    # colisión simple (capacidad 1 por bloque+servicio)
-    q_slot = db.query(models.Turno).filter(
-        models.Turno.emprendedor_id == emp_id,
-        models.Turno.inicio == inicio,
-    )
-    if sid:
-        q_slot = q_slot.filter(models.Turno.servicio_id == sid)
-    if q_slot.first():
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ese horario ya está reservado")
-
-    # evitar duplicado exacto del cliente
-    ya_tiene = db.query(models.Turno).filter(
-        models.Turno.cliente_id == user.id,
-        models.Turno.emprendedor_id == emp_id,
-        models.Turno.inicio == inicio,
-    ).first()
-    if ya_tiene:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ya tenés un turno en ese horario")
-
     # estado por defecto (soporta enum si existe)
     estado_def = "confirmado"
     if hasattr(models, "EstadoTurno"):
@@ -218,17 +417,29 @@ def crear_turno_compat(
         except Exception:
             pass
 
-    turno = models.Turno(
-        emprendedor_id=emp_id,
-        servicio_id=sid,
-        cliente_id=user.id,
-        inicio=inicio,
-        fin=fin,
-        estado=estado_def,
-    )
-    db.add(turno)
-    db.commit()
-    db.refresh(turno)
+    user_id = user.id
+
+    def _reservar() -> models.Turno:
+        # solapamiento contra capacidad del emprendedor + duplicado del cliente,
+        # en la misma transacción que el INSERT
+        carril = _verificar_disponible(db, emp_id, inicio, fin, cliente_id=user_id)
+        turno = models.Turno(
+            emprendedor_id=emp_id,
+            servicio_id=sid,
+            cliente_id=user_id,
+            inicio=inicio,
+            fin=fin,
+            estado=estado_def,
+            carril=carril,
+        )
+        db.add(turno)
+        return turno
+
+    try:
+        turno = transaccion_escritura(db, _reservar)
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ese horario ya está reservado")
+    cache_disponibilidad.invalidar_turno(emp_id, inicio, fin)
     return turno
 
 
@@ -245,6 +456,291 @@ def crear_turno_estricto(
     return crear_turno_compat(data, db, user)
 
 
+# ----------------------------
+# Crear en lote (bulk / recurrentes) — agenda del emprendedor
+# ----------------------------
+# Para bloquear un mes o cargar un cliente fijo semanal en un solo request.
+# Todas las ocurrencias se validan contra los turnos existentes con UNA consulta
+# de rango y un barrido en memoria; las que entran se insertan juntas
+# (INSERT ... VALUES multi-fila por Core) en una sola transacción. Como ese
+# INSERT no pasa por el ORM, acá mismo se actualizan la versión del
+# emprendedor (ETag), el rollup diario y la cache de disponibilidad.
+MAX_LOTE = 500
+LOTE_INSERT = 100  # filas por INSERT (límite de parámetros por sentencia de SQLite)
+_CAMPOS_LOTE = ("servicio_id", "cliente_id", "cliente_nombre", "cliente_contacto", "estado")
+
+
+def _entero_opcional(v, campo: str) -> Optional[int]:
+    if v in (None, ""):
+        return None
+    try:
+        return int(v)
+    except Exception:
+        raise HTTPException(status_code=422, detail=f"{campo} inválido")
+
+
+def _estado_lote(v, campo: str) -> models.EstadoTurno:
+    if v in (None, ""):
+        return models.EstadoTurno.confirmado
+    try:
+        estado = models.EstadoTurno(str(getattr(v, "value", v)))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{campo} inválido")
+    if estado == models.EstadoTurno.cancelado:
+        raise HTTPException(status_code=422, detail="No se pueden crear turnos cancelados")
+    return estado
+
+
+def _ocurrencia(indice: int, datos: dict, campo: str) -> dict:
+    return {
+        "indice": indice,
+        "inicio": _coalesce(
+            _parse_dt(datos.get("datetime")),
+            _parse_dt(datos.get("inicio")),
+            _parse_dt(datos.get("desde")),
+        ),
+        "fin": _coalesce(_parse_dt(datos.get("fin")), _parse_dt(datos.get("hasta"))),
+        "servicio_id": _entero_opcional(datos.get("servicio_id"), f"{campo}.servicio_id"),
+        "cliente_id": _entero_opcional(datos.get("cliente_id"), f"{campo}.cliente_id"),
+        "cliente_nombre": datos.get("cliente_nombre") or None,
+        "cliente_contacto": datos.get("cliente_contacto") or None,
+        "estado": _estado_lote(datos.get("estado"), f"{campo}.estado"),
+    }
+
+
+def _conflicto(o: dict, motivo: str, detail: str) -> dict:
+    return ConflictoTurnoOut(
+        indice=o["indice"], inicio=o["inicio"], fin=o["fin"], motivo=motivo, detail=detail
+    ).model_dump(mode="json")
+
+
+def _emprendedor_del_panel(db: Session, user: models.Usuario) -> int:
+    emp_id = emprendedor_id_de_usuario(db, user.id)
+    if not emp_id:
+        raise HTTPException(status_code=403, detail="Solo para emprendedores")
+    return emp_id
+
+
+def _servicios_lote(db: Session, emp_id: int, servicio_ids: set) -> dict:
+    """id -> (duración en min, precio) de los servicios pedidos, en una consulta; deben ser del emprendedor."""
+    if not servicio_ids:
+        return {}
+    S = models.Servicio
+    filas = db.execute(
+        select(S.id, S.duracion_min, S.precio).where(S.emprendedor_id == emp_id, S.id.in_(servicio_ids))
+    ).all()
+    servicios = {f.id: (int(f.duracion_min or 30), f.precio) for f in filas}
+    faltan = sorted(servicio_ids - set(servicios))
+    if faltan:
+        raise HTTPException(status_code=422, detail=f"Servicio(s) {faltan} no pertenecen al emprendedor")
+    return servicios
+
+
+def _validar_clientes_lote(db: Session, emp_id: int, usuario_id: int, cliente_ids: set) -> None:
+    """Los cliente_id del lote deben ser el propio usuario o clientes que ya tienen turnos con el emprendedor."""
+    pedidos = cliente_ids - {usuario_id}
+    if not pedidos:
+        return
+    T = models.Turno
+    conocidos = set(db.execute(
+        select(T.cliente_id).where(T.emprendedor_id == emp_id, T.cliente_id.in_(pedidos)).distinct()
+    ).scalars())
+    faltan = sorted(pedidos - conocidos)
+    if faltan:
+        raise HTTPException(status_code=422, detail=f"Cliente(s) {faltan} no son clientes del emprendedor")
+
+
+def _planificar_lote(db: Session, emp_id: int, ocurrencias: List[dict]) -> tuple[List[dict], List[dict]]:
+    """
+    (filas a insertar, conflictos). Una sola consulta trae la capacidad y los
+    turnos no cancelados de todo el rango pedido; después un barrido por
+    inicio mantiene los intervalos activos (existentes + ya aceptados del
+    lote) y aplica a cada ocurrencia las mismas reglas que
+    _verificar_disponible: capacidad, cliente duplicado y carril libre.
+    """
+    T = models.Turno
+    E = models.Emprendedor
+    desde = min(o["inicio"] for o in ocurrencias)
+    hasta = max(o["fin"] for o in ocurrencias)
+    rows = db.execute(
+        select(E.capacidad, T.inicio, T.fin, T.cliente_id, T.carril)
+        .select_from(E)
+        .outerjoin(T, and_(
+            T.emprendedor_id == E.id,
+            T.inicio < hasta,
+            T.fin > desde,
+            T.estado != models.EstadoTurno.cancelado,
+        ))
+        .where(E.id == emp_id)
+    ).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
+
+    capacidad = max(1, int(rows[0].capacidad or 1))
+    ocupados = sorted(
+        (
+            (_parse_dt(r.inicio), _parse_dt(r.fin), r.cliente_id, int(r.carril or 0))
+            for r in rows if r.inicio is not None
+        ),
+        key=lambda x: x[0],
+    )
+
+    filas: List[dict] = []
+    conflictos: List[dict] = []
+    activos: list = []
+    j = 0
+    for o in sorted(ocurrencias, key=lambda o: (o["inicio"], o["indice"])):
+        ini, fin = o["inicio"], o["fin"]
+        while j < len(ocupados) and ocupados[j][0] < fin:
+            activos.append(ocupados[j])
+            j += 1
+        # las ocurrencias van por inicio creciente: lo que ya terminó no vuelve a solaparse
+        activos = [a for a in activos if a[1] > ini]
+        solapados = [a for a in activos if a[0] < fin]
+
+        if max_simultaneos([(max(a[0], ini), min(a[1], fin)) for a in solapados]) + 1 > capacidad:
+            conflictos.append(_conflicto(o, "ocupado", "Ese horario ya está reservado"))
+            continue
+        if o["cliente_id"] is not None and any(a[2] == o["cliente_id"] for a in solapados):
+            conflictos.append(_conflicto(o, "cliente", "El cliente ya tiene un turno en ese horario"))
+            continue
+        usados = {a[3] for a in solapados}
+        carril = next((c for c in range(capacidad) if c not in usados), None)
+        if carril is None:
+            conflictos.append(_conflicto(o, "ocupado", "Ese horario ya está reservado"))
+            continue
+
+        activos.append((ini, fin, o["cliente_id"], carril))
+        filas.append({
+            "emprendedor_id": emp_id,
+            "servicio_id": o["servicio_id"],
+            "cliente_id": o["cliente_id"],
+            "cliente_nombre": o["cliente_nombre"],
+            "cliente_contacto": o["cliente_contacto"],
+            "inicio": ini,
+            "fin": fin,
+            "estado": o["estado"],
+            "carril": carril,
+            "precio_aplicado": o["precio_aplicado"],
+        })
+    return filas, conflictos
+
+
+def _insertar_lote(db: Session, emp_id: int, filas: List[dict]) -> List[dict]:
+    tabla = models.Turno.__table__
+    creados: List[dict] = []
+    for i in range(0, len(filas), LOTE_INSERT):
+        res = db.execute(insert(tabla).values(filas[i:i + LOTE_INSERT]).returning(*_COLUMNAS_TURNO_OUT))
+        creados.extend(dict(zip(_CAMPOS_TURNO_OUT, f)) for f in res)
+    # sin eventos ORM: versión (ETag) y rollup en la misma transacción
+    conn = db.connection()
+    versiones.tocar(conn, emp_id)
+    rollup.aplicar_insertados(conn, filas)
+    return creados
+
+
+def _crear_lote(db: Session, emp_id: int, usuario_id: int, ocurrencias: List[dict], parcial: bool) -> TurnosLoteOut:
+    servicios = _servicios_lote(db, emp_id, {o["servicio_id"] for o in ocurrencias if o["servicio_id"]})
+    _validar_clientes_lote(db, emp_id, usuario_id, {o["cliente_id"] for o in ocurrencias if o["cliente_id"] is not None})
+    invalidas: List[dict] = []
+    validas: List[dict] = []
+    for o in ocurrencias:
+        duracion, o["precio_aplicado"] = servicios.get(o["servicio_id"], (30, None))
+        if o["inicio"] is None:
+            invalidas.append(_conflicto(o, "invalido", "Falta 'datetime' o 'inicio'"))
+            continue
+        if o["fin"] is None:
+            o["fin"] = o["inicio"] + timedelta(minutes=duracion)
+        if o["fin"] <= o["inicio"]:
+            invalidas.append(_conflicto(o, "invalido", "'fin' debe ser posterior a 'inicio'"))
+            continue
+        validas.append(o)
+
+    def _escribir():
+        filas, choques = _planificar_lote(db, emp_id, validas) if validas else ([], [])
+        conflictos = sorted(invalidas + choques, key=lambda c: c["indice"])
+        if not filas or (conflictos and not parcial):
+            # todo o nada (o nada que crear): no se escribe y se informa cada conflicto
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"mensaje": "Hay turnos que no se pueden crear", "conflictos": conflictos},
+            )
+        return _insertar_lote(db, emp_id, filas), conflictos
+
+    try:
+        creados, conflictos = transaccion_escritura(db, _escribir)
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ese horario ya está reservado")
+    for t in creados:
+        cache_disponibilidad.invalidar_turno(emp_id, t["inicio"], t["fin"])
+    return TurnosLoteOut(creados=creados, conflictos=conflictos)
+
+
+@router.post("/bulk", response_model=TurnosLoteOut, status_code=201)
+def crear_turnos_bulk(
+    payload: dict = Body(...),
+    db: Session = Depends(get_db),
+    user: models.Usuario = Depends(get_current_user),
+):
+    """
+    Acepta:
+      - { turnos: [ { datetime | inicio | desde, fin | hasta, servicio_id,
+                      cliente_id, cliente_nombre, cliente_contacto, estado }, ... ] }
+      - esos mismos campos en la raíz valen como default para cada turno
+      - { parcial: true } (default) crea los que entran y reporta el resto;
+        con false, si alguno choca no se crea ninguno (409 con los conflictos)
+    """
+    items = payload.get("turnos")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=422, detail="Falta 'turnos' (lista)")
+    if len(items) > MAX_LOTE:
+        raise HTTPException(status_code=422, detail=f"Máximo {MAX_LOTE} turnos por request")
+
+    emp_id = _emprendedor_del_panel(db, user)
+    base = {k: payload[k] for k in _CAMPOS_LOTE if k in payload}
+    ocurrencias = [
+        _ocurrencia(i, {**base, **(item if isinstance(item, dict) else {})}, f"turnos[{i}]")
+        for i, item in enumerate(items)
+    ]
+    return _crear_lote(db, emp_id, user.id, ocurrencias, bool(payload.get("parcial", True)))
+
+
+@router.post("/recurrentes", response_model=TurnosLoteOut, status_code=201)
+def crear_turnos_recurrentes(
+    payload: dict = Body(...),
+    db: Session = Depends(get_db),
+    user: models.Usuario = Depends(get_current_user),
+):
+    """
+    Acepta:
+      - { datetime | inicio, fin (opcional: si no, duración del servicio),
+          rrule: "FREQ=WEEKLY;BYDAY=MO,TH;COUNT=12" (ver app.utils.recurrencia),
+          servicio_id, cliente_id, cliente_nombre, cliente_contacto, estado, parcial }
+    Cada ocurrencia dura lo mismo que la primera. 'indice' de los conflictos
+    es la posición en la expansión de la regla.
+    """
+    primera = _ocurrencia(0, payload, "payload")
+    if not primera["inicio"]:
+        raise HTTPException(status_code=422, detail="Falta 'datetime' o 'inicio'")
+    regla = payload.get("rrule") or payload.get("regla")
+    if not regla:
+        raise HTTPException(status_code=422, detail="Falta 'rrule'")
+    try:
+        inicios = expandir(str(regla), primera["inicio"], MAX_LOTE)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not inicios:
+        raise HTTPException(status_code=422, detail="La regla no genera ocurrencias")
+
+    emp_id = _emprendedor_del_panel(db, user)
+    duracion = primera["fin"] - primera["inicio"] if primera["fin"] else None
+    ocurrencias = [
+        dict(primera, indice=i, inicio=d, fin=d + duracion if duracion is not None else None)
+        for i, d in enumerate(inicios)
+    ]
+    return _crear_lote(db, emp_id, user.id, ocurrencias, bool(payload.get("parcial", True)))
+
+
 # ----------------------------
 # Editar / Posponer (PATCH)
 # ----------------------------
@@ -260,10 +756,8 @@ def actualizar_turno(
         raise HTTPException(status_code=404, detail="Turno no encontrado")
 
     # permisos: dueño del emprendimiento o cliente del turno
-    emp = db.query(models.Emprendedor).filter(models.Emprendedor.id == turno.emprendedor_id).first()
-    es_duenio = bool(emp and emp.usuario_id == user.id)
-    es_cliente = bool(turno.cliente_id == user.id)
-    if not (es_duenio or es_cliente):
+    es_cliente = turno.cliente_id == user.id
+    if not es_cliente and emprendedor_id_de_usuario(db, user.id) != turno.emprendedor_id:
         raise HTTPException(status_code=403, detail="Sin permiso para editar este turno")
 
     # servicio_id robusto
@@ -295,30 +789,42 @@ def actualizar_turno(
         else:
             nuevo_fin = turno.fin
 
-    # colisión si cambió bloque/servicio
-    if (nuevo_inicio != turno.inicio) or (nuevo_servicio_id != turno.servicio_id):
-        q = db.query(models.Turno).filter(
-            models.Turno.emprendedor_id == turno.emprendedor_id,
-            models.Turno.inicio == nuevo_inicio,
-            models.Turno.id != turno.id,
-        )
-        if nuevo_servicio_id:
-            q = q.filter(models.Turno.servicio_id == nuevo_servicio_id)
-        if q.first():
-            raise HTTPException(status_code=409, detail="Ese horario ya está reservado")
-
-    # aplicar cambios válidos
-    turno.inicio = nuevo_inicio
-    turno.fin = nuevo_fin
-    turno.servicio_id = nuevo_servicio_id
-
-    if "estado" in data and data["estado"] is not None:
-        turno.estado = data["estado"]
-
-    # 'notas' puede venir del front pero el modelo no la tiene: la ignoramos.
+    # estado (se aplica abajo); reactivar un cancelado también ocupa lugar
+    nuevo_estado = turno.estado
+    if data.get("estado") is not None:
+        # como enum (igual que al leerlo de la BD): la respuesta no depende de un refresh
+        try:
+            nuevo_estado = models.EstadoTurno(str(data["estado"]))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="estado inválido")
+    cancelado = models.EstadoTurno.cancelado
+    reactiva = turno.estado == cancelado and nuevo_estado != cancelado
+    mueve = (nuevo_inicio != turno.inicio) or (nuevo_fin != turno.fin)
+    verificar = (mueve or reactiva) and nuevo_estado != cancelado
+
+    emp_id, viejo_inicio, viejo_fin = turno.emprendedor_id, turno.inicio, turno.fin
+
+    def _aplicar() -> None:
+        # colisión + cambios en la misma transacción
+        if verificar:
+            turno.carril = _verificar_disponible(
+                db, emp_id, nuevo_inicio, nuevo_fin, excluir_id=turno_id
+            )
+            # si hubo reacomodo en Postgres la fila quedó en un carril temporal:
+            # el UPDATE del flush tiene que escribir el carril aunque no "cambie"
+            flag_modified(turno, "carril")
+        turno.inicio = nuevo_inicio
+        turno.fin = nuevo_fin
+        turno.servicio_id = nuevo_servicio_id
+        turno.estado = nuevo_estado
+        # 'notas' puede venir del front pero el modelo no la tiene: la ignoramos.
 
-    db.commit()
-    db.refresh(turno)
+    try:
+        transaccion_escritura(db, _aplicar)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Ese horario ya está reservado")
+    cache_disponibilidad.invalidar_turno(emp_id, viejo_inicio, viejo_fin)
+    cache_disponibilidad.invalidar_turno(emp_id, nuevo_inicio, nuevo_fin)
     return turno
 
 
@@ -336,12 +842,12 @@ def eliminar_turno(
         # idempotente
         return
 
-    emp = db.query(models.Emprendedor).filter(models.Emprendedor.id == turno.emprendedor_id).first()
-    es_duenio = bool(emp and emp.usuario_id == user.id)
-    es_cliente = bool(turno.cliente_id == user.id)
-    if not (es_duenio or es_cliente):
+    es_cliente = turno.cliente_id == user.id
+    if not es_cliente and emprendedor_id_de_usuario(db, user.id) != turno.emprendedor_id:
         raise HTTPException(status_code=403, detail="Sin permiso para borrar este turno")
 
+    emp_id, inicio, fin = turno.emprendedor_id, turno.inicio, turno.fin
     db.delete(turno)
     db.commit()
+    cache_disponibilidad.invalidar_turno(emp_id, inicio, fin)
     return
@@ -0,0 +1,119 @@
+# app/routers/turnos_async.py
+"""
+Versión async del router de turnos (se monta con DB_ASYNC=1).
+
+Reusa la lógica de app.routers.turnos vía AsyncSession.run_sync: el código es el
+mismo, pero la E/S va por el driver async (aiosqlite/asyncpg) sobre el event
+loop, sin ocupar un worker del threadpool de Starlette por request.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, List
+
+from fastapi import APIRouter, Depends, Query, Body
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.deps import get_current_user_async
+from app.routers import turnos
+from app import models
+from app.schemas import TurnoOut, TurnosLoteOut
+
+router = APIRouter(prefix="/turnos", tags=["turnos"])
+
+
+@router.get("/mis", response_model=List[TurnoOut])
+async def turnos_mis(
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=turnos.LIMITE_MAX),
+    formato: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.turnos_mis(desde, hasta, cursor, limit, formato, s, user))
+
+
+@router.get("/owner", response_model=List[TurnoOut])
+async def turnos_owner(
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=turnos.LIMITE_MAX),
+    formato: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.turnos_owner(desde, hasta, cursor, limit, formato, s, user))
+
+
+@router.get("/de/{codigo}", response_model=List[TurnoOut])
+async def turnos_publicos_por_codigo(
+    codigo: str,
+    desde: Optional[datetime] = Query(default=None),
+    hasta: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=turnos.LIMITE_MAX),
+    formato: Optional[str] = Query(default=None, pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(lambda s: turnos.turnos_publicos_por_codigo(
+        codigo, desde, hasta, cursor, limit, formato, s
+    ))
+
+
+@router.post("/compat", response_model=TurnoOut, status_code=201)
+async def crear_turno_compat(
+    payload: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.crear_turno_compat(payload, s, user))
+
+
+@router.post("", response_model=TurnoOut, status_code=201)
+async def crear_turno_estricto(
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.crear_turno_compat(data, s, user))
+
+
+@router.post("/bulk", response_model=TurnosLoteOut, status_code=201)
+async def crear_turnos_bulk(
+    payload: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.crear_turnos_bulk(payload, s, user))
+
+
+@router.post("/recurrentes", response_model=TurnosLoteOut, status_code=201)
+async def crear_turnos_recurrentes(
+    payload: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.crear_turnos_recurrentes(payload, s, user))
+
+
+@router.patch("/{turno_id}", response_model=TurnoOut)
+async def actualizar_turno(
+    turno_id: int,
+    data: dict = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    return await db.run_sync(lambda s: turnos.actualizar_turno(turno_id, data, s, user))
+
+
+@router.delete("/{turno_id}", status_code=204)
+async def eliminar_turno(
+    turno_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: models.Usuario = Depends(get_current_user_async),
+):
+    await db.run_sync(lambda s: turnos.eliminar_turno(turno_id, s, user))
@@ -1,32 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.exc import IntegrityError
-from typing import Optional
 
-from app.database import get_db
+from app.database import get_db, guardar
 from app import models
+from app.utils.usuario import autenticar, buscar_para_login, normalizar_identificador
 
 # Import flexible: usa core.security si existe; sino app.security
 try:
-    from app.core.security import get_password_hash, verify_password, create_access_token
+    from app.core.security import get_password_hash_async, create_user_token
 except Exception:  # pragma: no cover
-    from app.security import get_password_hash, verify_password, create_access_token  # type: ignore
+    from app.security import get_password_hash_async, create_user_token  # type: ignore
 
 router = APIRouter(prefix="/usuarios", tags=["usuarios"])
 
-# --------- helpers ---------
-def _get_user_by_email_or_username(db: Session, email: Optional[str], username: Optional[str]) -> Optional[models.Usuario]:
-    q = db.query(models.Usuario)
-    if email:
-        u = q.filter(models.Usuario.email == email).first()
-        if u:
-            return u
-    if username:
-        u = db.query(models.Usuario).filter(models.Usuario.username == username).first()
-        if u:
-            return u
-    return None
+# login y registro son async: la BD va al threadpool (rápido) y bcrypt al pool
+# dedicado de app.utils.hash_pool, así una ráfaga de logins no ocupa los
+# workers que atienden reservas.
 
+# --------- helpers ---------
 def _user_to_dict(u: models.Usuario) -> dict:
     """No exponemos el hash. Hacemos salida que el front entiende."""
     d = {
@@ -38,8 +31,7 @@ def _user_to_dict(u: models.Usuario) -> dict:
     # Mantener compatibilidad con claves antiguas
     return d
 
-def _set_password(u: models.Usuario, raw_password: str):
-    h = get_password_hash(raw_password)
+def _set_password_hash(u: models.Usuario, h: str):
     # tolerante al nombre del campo
     if hasattr(u, "hashed_password"):
         setattr(u, "hashed_password", h)
@@ -49,16 +41,45 @@ def _set_password(u: models.Usuario, raw_password: str):
         # último recurso: campo 'password' en BD (no recomendado, pero común)
         setattr(u, "password", h)
 
-def _get_password_hash_value(u: models.Usuario) -> Optional[str]:
-    for attr in ("hashed_password", "password_hash", "password"):
-        if hasattr(u, attr):
-            return getattr(u, attr)
-    return None
+def _validar_registro(db: Session, username: str, email: str):
+    # misma normalización (e índices) que el login: "Ana" y "ana " son el mismo usuario
+    existente = buscar_para_login(db, email, username)
+    if existente:
+        u = existente[0]
+        if normalizar_identificador(u.email) == normalizar_identificador(email):
+            raise HTTPException(status_code=400, detail="El email ya existe")
+        raise HTTPException(status_code=400, detail="El usuario ya existe")
+    db.commit()  # sin transacción abierta (ni conexión retenida) mientras se calcula el hash
+
+def _crear_usuario(db: Session, username: str, email: str, password_hash: str) -> dict:
+    u_kwargs = {
+        "username": username,
+        "email": email,
+    }
+    # rol por defecto si existe campo
+    if hasattr(models.Usuario, "rol"):
+        u_kwargs["rol"] = "cliente"
+    if hasattr(models.Usuario, "role"):
+        u_kwargs["role"] = "cliente"
+
+    u = models.Usuario(**u_kwargs)
+    _set_password_hash(u, password_hash)
+
+    try:
+        guardar(db, u)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Usuario o email duplicado")
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="No se pudo registrar el usuario")
+
+    return {"user": _user_to_dict(u)}
 
 # --------- endpoints ---------
 
 @router.post("/login")
-def login(payload: dict, db: Session = Depends(get_db)):
+async def login(payload: dict, db: Session = Depends(get_db)):
     """
     Acepta:
       { "email": "...", "password": "..." }  ó  { "username": "...", "password": "..." }
@@ -72,22 +93,20 @@ def login(payload: dict, db: Session = Depends(get_db)):
     if not (email or username) or not password:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Email/usuario y contraseña son obligatorios")
 
-    u = _get_user_by_email_or_username(db, email, username)
-    if not u:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario no encontrado")
-
-    stored = _get_password_hash_value(u)
-    if not stored or not verify_password(password, stored):
+    # mismo error (y mismo tiempo) para usuario inexistente y contraseña incorrecta
+    fila = await autenticar(db, email, username, password)
+    if not fila:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Credenciales incorrectas")
+    u, emp_id = fila
 
-    token = create_access_token({"sub": str(getattr(u, "id", ""))})
+    token = create_user_token(u.id, rol=getattr(u, "rol", None), emprendedor_id=emp_id)
     user_out = _user_to_dict(u)
 
     return {"user": user_out, "user_schema": user_out, "token": token}
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def registrar(payload: dict, db: Session = Depends(get_db)):
+async def registrar(payload: dict, db: Session = Depends(get_db)):
     """
     Acepta:
       { "username": "...", "email": "...", "password": "..." }
@@ -95,47 +114,19 @@ def registrar(payload: dict, db: Session = Depends(get_db)):
       { "user": {...} }
     """
     username = (payload.get("username") or "").strip()
-    email = (payload.get("email") or "").strip()
+    email = normalizar_identificador(payload.get("email")) or ""
     password = payload.get("password") or ""
 
     if not username or not email or not password:
         raise HTTPException(status_code=400, detail="username, email y password son obligatorios")
 
-    # Verificar duplicados
-    if db.query(models.Usuario).filter(models.Usuario.username == username).first():
-        raise HTTPException(status_code=400, detail="El usuario ya existe")
-    if db.query(models.Usuario).filter(models.Usuario.email == email).first():
-        raise HTTPException(status_code=400, detail="El email ya existe")
-
-    # Crear usuario
-    u_kwargs = {
-        "username": username,
-        "email": email,
-    }
-    # rol por defecto si existe campo
-    if hasattr(models.Usuario, "rol"):
-        u_kwargs["rol"] = "cliente"
-    if hasattr(models.Usuario, "role"):
-        u_kwargs["role"] = "cliente"
-
-    u = models.Usuario(**u_kwargs)
-    _set_password(u, password)
-
-    try:
-        db.add(u)
-        db.commit()
-        db.refresh(u)
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Usuario o email duplicado")
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="No se pudo registrar el usuario")
-
-    return {"user": _user_to_dict(u)}
+    # Verificar duplicados antes de pagar el hash
+    await run_in_threadpool(_validar_registro, db, username, email)
+    password_hash = await get_password_hash_async(password)
+    return await run_in_threadpool(_crear_usuario, db, username, email, password_hash)
 
 
 # Alias por compatibilidad: /usuarios/registro
 @router.post("/registro", status_code=status.HTTP_201_CREATED)
-def registrar_alias(payload: dict, db: Session = Depends(get_db)):
-    return registrar(payload, db)
+async def registrar_alias(payload: dict, db: Session = Depends(get_db)):
+    return await registrar(payload, db)
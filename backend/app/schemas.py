@@ -2,7 +2,7 @@ from datetime import datetime, time
 from typing import Optional, List
 from pydantic import BaseModel, Field, constr, ConfigDict  # ⬅️ agregamos ConfigDict
 from datetime import datetime, date, time   # ← sumá "date"
-from pydantic import BaseModel, Field, constr, ConfigDict, model_validator  # ← sumá "model_validator"
+from pydantic import BaseModel, Field, constr, conint, ConfigDict, model_validator  # ← sumá "model_validator"
 
 # ---------- Auth ----------
 class TokenOut(BaseModel):
@@ -45,6 +45,7 @@ class EmprendedorUpdate(BaseModel):
     descripcion: Optional[str] = None
     codigo_cliente: Optional[str] = None
     activo: Optional[bool] = None
+    capacidad: Optional[conint(ge=1, le=100)] = None  # turnos simultáneos
 
 class EmprendedorOut(EmprendedorBase):
     id: int
@@ -159,3 +160,15 @@ class TurnoCreateFlexible(BaseModel):
         self.inicio = i
         self.fin = self.fin or self.hasta
         return self
+
+# ---------- Turnos en lote (/turnos/bulk, /turnos/recurrentes) ----------
+class ConflictoTurnoOut(BaseModel):
+    indice: int                 # posición en la lista pedida / en la expansión de la regla
+    inicio: Optional[datetime] = None
+    fin: Optional[datetime] = None
+    motivo: str                 # ocupado / cliente / invalido
+    detail: str
+
+class TurnosLoteOut(BaseModel):
+    creados: List[TurnoOut]
+    conflictos: List[ConflictoTurnoOut]
@@ -1,16 +1,17 @@
 # app/security.py
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Tuple
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 # Lee las constantes que expone app.config
-from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, settings
+from app.utils.hash_pool import pool_hash
 
 import logging
 logger = logging.getLogger("security")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,6 +29,61 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _rondas(hashed_password: str) -> Optional[int]:
+    # formato bcrypt: $2b$<rondas>$<salt+hash>
+    partes = hashed_password.split("$")
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True si el hash no usa el costo configurado (BCRYPT_ROUNDS) o un esquema vigente."""
+    if not hashed_password:
+        return False
+    try:
+        if pwd_context.needs_update(hashed_password):
+            return True
+    except Exception:
+        return False
+    rondas = _rondas(hashed_password)
+    return rondas is not None and rondas != settings.BCRYPT_ROUNDS
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica y, si la contraseña es correcta pero el hash quedó con otro costo,
+    devuelve también el hash nuevo para guardarlo: (ok, nuevo_hash | None).
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, get_password_hash(plain_password)
+    return True, None
+
+
+# Versiones para endpoints async: bcrypt corre en el pool dedicado
+# (app.utils.hash_pool), no en el event loop ni en el threadpool de requests.
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await pool_hash.ejecutar(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await pool_hash.ejecutar(verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await pool_hash.ejecutar(get_password_hash, password)
+
+
+async def dummy_verify_async() -> None:
+    """
+    Verificación contra un hash ficticio del mismo costo: un login con usuario
+    inexistente tarda lo mismo que uno con contraseña incorrecta.
+    """
+    await pool_hash.ejecutar(pwd_context.dummy_verify)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Crea un JWT firmado. Ejemplo de uso en tu login:
@@ -41,6 +97,21 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def create_user_token(user_id: int, rol: Optional[str] = None, emprendedor_id: Optional[int] = None) -> str:
+    """
+    Token de sesión. Con AUTH_STATELESS_CLAIMS además firma 'rol' y 'emp'
+    (emprendedor_id) para que los endpoints del panel no consulten la BD.
+    Ojo: esos claims valen hasta que vence el token.
+    """
+    data: Dict[str, Any] = {"sub": str(user_id)}
+    if settings.AUTH_STATELESS_CLAIMS:
+        if rol:
+            data["rol"] = rol
+        if emprendedor_id:
+            data["emp"] = int(emprendedor_id)
+    return create_access_token(data)
+
+
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     """Decodifica el JWT. Devuelve None si es inválido/expirado."""
     try:
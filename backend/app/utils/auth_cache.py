@@ -0,0 +1,49 @@
+# app/utils/auth_cache.py
+"""
+Cache en proceso del usuario autenticado (un CacheTTL de app.utils.ttl_cache).
+
+Evita el SELECT de Usuario en cada request autenticado. La clave es
+(user_id, exp del token), agrupada por user_id, y cada entrada vive
+AUTH_CACHE_TTL_S segundos (default 60). Lo que se guarda es una copia
+desacoplada de las columnas (plantilla()); en cada request se incorpora a la
+sesión con merge(load=False), sin ir a la BD, así que los cambios que haga el
+handler sobre el usuario se persisten normalmente.
+
+- Cualquier UPDATE/DELETE de Usuario hecho por el ORM (rol, suscripción, etc.)
+  invalida las entradas del usuario, al hacer el flush y de nuevo al commit.
+- Con varios workers cada proceso tiene su cache: un cambio hecho en otro
+  proceso se ve, como mucho, TTL segundos después.
+- Contadores de hits/misses/invalidaciones; se apaga con AUTH_CACHE=0.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app import models
+from app.utils.ttl_cache import CacheTTL, invalidar_en_sesion
+
+
+def plantilla(user: models.Usuario) -> models.Usuario:
+    """Copia desacoplada (detached, con identidad) de las columnas del usuario."""
+    mapper = inspect(user).mapper
+    copia = mapper.class_(**{a.key: getattr(user, a.key) for a in mapper.column_attrs})
+    make_transient_to_detached(copia)
+    return copia
+
+
+cache_usuarios = CacheTTL(
+    ttl_s=settings.AUTH_CACHE_TTL_S,
+    max_entradas=settings.AUTH_CACHE_MAX_ENTRADAS,
+    activo=settings.AUTH_CACHE,
+    grupo=lambda clave: clave[0],
+)
+
+
+# ---- invalidación por eventos del ORM ------------------------------------------
+def _marcar(mapper, conn, target):
+    # entre el flush y el commit otro request puede haber leído la fila vieja
+    invalidar_en_sesion(cache_usuarios, target.id, inspect(target).session)
+
+
+event.listen(models.Usuario, "after_update", _marcar)
+event.listen(models.Usuario, "after_delete", _marcar)
@@ -0,0 +1,134 @@
+# app/utils/codigos.py
+"""
+Códigos públicos de emprendedor (/reservar/:codigo) sin sortear y consultar.
+
+Cada código es el número siguiente de la secuencia "codigo_publico" pasado
+por una permutación con clave (Feistel de 4 rondas sobre 40 bits) y escrito
+con 8 símbolos de ALPHABET (32 símbolos, sin O/0/I/1: 5 bits por carácter).
+Al ser una biyección, números distintos dan códigos distintos: no hace falta
+un SELECT por intento y dos altas concurrentes nunca reciben el mismo código.
+La clave hace que los códigos no sean consecutivos ni adivinables.
+
+- Los números se reservan de a CODIGO_BLOQUE por proceso, en una transacción
+  propia y corta (nunca dentro de la escritura del alta).
+- Los códigos elegidos a mano (PUT /emprendedores/mi) o emitidos antes de
+  este esquema comparten espacio: guardar_con_codigo() reintenta con el
+  número siguiente si el alta choca con la constraint única.
+- CODIGO_CLAVE (o SECRET_KEY si está vacía) no debe cambiar una vez emitidos
+  códigos: con otra clave la permutación es otra y podría repetir alguno.
+"""
+import hashlib
+import threading
+from typing import Callable, Tuple, TypeVar
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app import models
+
+T = TypeVar("T")
+
+# Evitamos caracteres confusos como O/0/I/1
+ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+LARGO = 8
+_BITS = 5 * LARGO              # 40
+_MITAD = _BITS // 2
+_MASCARA = (1 << _MITAD) - 1
+_RONDAS = 4
+
+S = models.Secuencia.__table__
+SECUENCIA = "codigo_publico"
+INTENTOS = 5
+
+
+def _clave() -> bytes:
+    return hashlib.sha256((settings.CODIGO_CLAVE or settings.SECRET_KEY).encode()).digest()
+
+
+def _ronda(mitad: int, ronda: int, clave: bytes) -> int:
+    h = hashlib.blake2b(mitad.to_bytes(3, "big") + bytes([ronda]), key=clave, digest_size=4)
+    return int.from_bytes(h.digest(), "big") & _MASCARA
+
+
+def permutar(n: int, clave: bytes) -> int:
+    """Biyección de [0, 2^40) en sí mismo."""
+    izq, der = n >> _MITAD, n & _MASCARA
+    for r in range(_RONDAS):
+        izq, der = der, izq ^ _ronda(der, r, clave)
+    return (izq << _MITAD) | der
+
+
+def codificar(x: int) -> str:
+    chars = []
+    for _ in range(LARGO):
+        x, resto = divmod(x, 32)
+        chars.append(ALPHABET[resto])
+    return "".join(reversed(chars))
+
+
+def _reservar_bloque(engine, n: int) -> Tuple[int, int]:
+    """Reserva [inicio, fin) de la secuencia en una transacción propia."""
+    with engine.begin() as conn:
+        if conn.dialect.name in ("sqlite", "postgresql"):
+            if conn.dialect.name == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as upsert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as upsert
+            stmt = upsert(S).values(nombre=SECUENCIA, valor=n)
+            conn.execute(stmt.on_conflict_do_update(index_elements=[S.c.nombre], set_={"valor": S.c.valor + n}))
+        else:
+            res = conn.execute(update(S).where(S.c.nombre == SECUENCIA).values(valor=S.c.valor + n))
+            if not res.rowcount:
+                conn.execute(insert(S).values(nombre=SECUENCIA, valor=n))
+        fin = conn.execute(select(S.c.valor).where(S.c.nombre == SECUENCIA)).scalar_one()
+    return fin - n, fin
+
+
+class AsignadorCodigos:
+    def __init__(self, bloque: int):
+        self.bloque = max(1, bloque)
+        self._lock = threading.Lock()
+        self._siguiente = 0
+        self._fin = 0
+        self._clave = _clave()
+
+    def siguiente(self, db: Session) -> str:
+        with self._lock:
+            if self._siguiente >= self._fin:
+                self._siguiente, self._fin = _reservar_bloque(db.get_bind(), self.bloque)
+            n = self._siguiente
+            self._siguiente += 1
+        if n >> _BITS:
+            raise RuntimeError("Secuencia de códigos públicos agotada")
+        return codificar(permutar(n, self._clave))
+
+
+asignador_codigos = AsignadorCodigos(bloque=settings.CODIGO_BLOQUE)
+
+
+def _choque_de_alta(e: IntegrityError) -> bool:
+    # código ya tomado (a mano / esquema viejo) o alta concurrente del mismo usuario
+    msg = str(e.orig).lower()
+    return "codigo_cliente" in msg or "usuario_id" in msg
+
+
+def guardar_con_codigo(db: Session, aplicar: Callable[[str], T]) -> T:
+    """
+    aplicar(codigo) crea o actualiza el emprendedor con ese código (y lo que
+    haga falta) sin commitear; acá se commitea. Si el commit choca con la
+    constraint única (de código o de usuario) se hace rollback y aplicar()
+    se vuelve a llamar con el código siguiente, así que tiene que releer el
+    estado que necesite (p. ej. si el usuario ya quedó como emprendedor).
+    """
+    for intento in range(INTENTOS):
+        codigo = asignador_codigos.siguiente(db)
+        try:
+            resultado = aplicar(codigo)
+            db.commit()
+            return resultado
+        except IntegrityError as e:
+            db.rollback()
+            if not _choque_de_alta(e) or intento == INTENTOS - 1:
+                raise
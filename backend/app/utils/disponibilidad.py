@@ -0,0 +1,223 @@
+# app/utils/disponibilidad.py
+"""
+Motor de disponibilidad por aritmética de intervalos.
+
+Trabaja con intervalos semiabiertos [desde, hasta) expresados en minutos
+desde las 00:00 del día. Todas las operaciones asumen listas ordenadas y
+se resuelven con recorridos lineales (merge), sin consultas por slot.
+"""
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Intervalo = Tuple[int, int]
+
+MINUTOS_DIA = 24 * 60
+
+
+def dia_semana(d: date) -> int:
+    """0=Domingo ... 6=Sábado (misma convención que Horario y el front)."""
+    return (d.weekday() + 1) % 7
+
+
+def a_minutos(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def bloque_de_horario(desde: time, hasta: time) -> Intervalo | None:
+    """Convierte un bloque Horario a minutos. 'hasta' 00:00 significa fin del día."""
+    ini = a_minutos(desde)
+    fin = a_minutos(hasta) or MINUTOS_DIA
+    if fin <= ini:
+        return None
+    return ini, fin
+
+
+def unir(intervalos: Iterable[Intervalo]) -> List[Intervalo]:
+    """Fusiona intervalos solapados o contiguos. Espera la entrada ordenada por inicio."""
+    out: List[Intervalo] = []
+    for ini, fin in intervalos:
+        if out and ini <= out[-1][1]:
+            if fin > out[-1][1]:
+                out[-1] = (out[-1][0], fin)
+        else:
+            out.append((ini, fin))
+    return out
+
+
+def saturados(intervalos: Sequence[Intervalo], capacidad: int = 1) -> List[Intervalo]:
+    """
+    Tramos donde hay al menos 'capacidad' intervalos simultáneos (barrido de eventos).
+    Con capacidad 1 equivale a unir(). Espera la entrada ordenada por inicio.
+    """
+    if capacidad <= 1:
+        return unir(intervalos)
+    eventos: List[Tuple[int, int]] = []
+    for ini, fin in intervalos:
+        eventos.append((ini, 1))
+        eventos.append((fin, -1))
+    eventos.sort()  # a igual t, los -1 van antes: intervalos semiabiertos
+    out: List[Intervalo] = []
+    n = 0
+    abierto = None
+    for t, delta in eventos:
+        n += delta
+        if n >= capacidad and abierto is None:
+            abierto = t
+        elif n < capacidad and abierto is not None:
+            if t > abierto:
+                out.append((abierto, t))
+            abierto = None
+    return unir(out)
+
+
+def max_simultaneos(intervalos: Iterable[Tuple[Any, Any]]) -> int:
+    """Máximo de intervalos [ini, fin) superpuestos en un mismo instante (barrido de eventos)."""
+    eventos = []
+    for ini, fin in intervalos:
+        if fin > ini:
+            eventos.append((ini, 1))
+            eventos.append((fin, -1))
+    eventos.sort(key=lambda e: (e[0], e[1]))
+    n = maximo = 0
+    for _, delta in eventos:
+        n += delta
+        maximo = max(maximo, n)
+    return maximo
+
+
+def repartir_carriles(
+    intervalos: Iterable[Tuple[Any, Any, Any]], capacidad: Optional[int] = None
+) -> Optional[Dict[Any, int]]:
+    """
+    clave -> carril para (clave, ini, fin): por orden de inicio, cada intervalo va
+    al carril libre más bajo, así se usan tantos carriles como el pico de
+    simultaneidad. None si no alcanzan 'capacidad' carriles (sin capacidad: sin tope).
+    """
+    libre_desde: List[Any] = []  # fin del último intervalo de cada carril
+    out: Dict[Any, int] = {}
+    for clave, ini, fin in sorted(intervalos, key=lambda x: (x[1], x[2])):
+        carril = next((c for c, t in enumerate(libre_desde) if t <= ini), None)
+        if carril is None:
+            if capacidad is not None and len(libre_desde) >= capacidad:
+                return None
+            carril = len(libre_desde)
+            libre_desde.append(fin)
+        else:
+            libre_desde[carril] = fin
+        out[clave] = carril
+    return out
+
+
+def restar(base: Sequence[Intervalo], quitar: Sequence[Intervalo]) -> List[Intervalo]:
+    """
+    base - quitar, ambos ordenados y sin solapes internos.
+    O(len(base) + len(quitar)) con dos punteros.
+    """
+    out: List[Intervalo] = []
+    j = 0
+    n = len(quitar)
+    for ini, fin in base:
+        # descartamos ocupados que terminan antes del bloque
+        while j < n and quitar[j][1] <= ini:
+            j += 1
+        cur = ini
+        k = j
+        while k < n and quitar[k][0] < fin:
+            q_ini, q_fin = quitar[k]
+            if q_ini > cur:
+                out.append((cur, q_ini))
+            cur = max(cur, q_fin)
+            if cur >= fin:
+                break
+            k += 1
+        if cur < fin:
+            out.append((cur, fin))
+    return out
+
+
+def inicios_en_grilla(
+    bloque: Intervalo, libres: Sequence[Intervalo], duracion: int, paso: int
+) -> List[int]:
+    """
+    Inicios alineados a la grilla del bloque (bloque.desde + k*paso) cuyo
+    [inicio, inicio+duracion) cae completo dentro de algún intervalo libre.
+    """
+    b_ini = bloque[0]
+    out: List[int] = []
+    for l_ini, l_fin in libres:
+        desfase = max(0, l_ini - b_ini)
+        t = b_ini + -(-desfase // paso) * paso  # primer punto de grilla >= l_ini
+        while t + duracion <= l_fin:
+            out.append(t)
+            t += paso
+    return out
+
+
+def recortar(libres: Sequence[Intervalo], fines: Sequence[int], bloque: Intervalo) -> List[Intervalo]:
+    """Partes de 'libres' (ordenados, disjuntos) que caen dentro de 'bloque'."""
+    out: List[Intervalo] = []
+    i = bisect_right(fines, bloque[0])
+    while i < len(libres) and libres[i][0] < bloque[1]:
+        out.append((max(libres[i][0], bloque[0]), min(libres[i][1], bloque[1])))
+        i += 1
+    return out
+
+
+def ocupados_por_dia(
+    turnos: Iterable[Tuple[datetime, datetime]], primer_dia: date, ultimo_dia: date
+) -> Dict[date, List[Intervalo]]:
+    """
+    Reparte (inicio, fin) ordenados por inicio en intervalos por día (recortados a
+    cada día). Como la entrada viene ordenada, cada lista queda ordenada.
+    """
+    por_dia: Dict[date, List[Intervalo]] = {}
+    for ini, fin in turnos:
+        if fin <= ini:
+            continue
+        d = max(ini.date(), primer_dia)
+        while d <= ultimo_dia and d <= fin.date():
+            base = datetime.combine(d, time.min)
+            a = max(0, int((ini - base).total_seconds() // 60))
+            b = min(MINUTOS_DIA, -int(-(fin - base).total_seconds() // 60))
+            if b > a:
+                por_dia.setdefault(d, []).append((a, b))
+            d += timedelta(days=1)
+    return por_dia
+
+
+def libres_del_dia(
+    bloques: Sequence[Intervalo], ocupados: Sequence[Intervalo], capacidad: int = 1
+) -> List[Intervalo]:
+    """Bloques del día menos los tramos que ya alcanzan la capacidad (ambos ordenados por inicio)."""
+    return restar(unir(bloques), saturados(ocupados, capacidad))
+
+
+def inicios_del_dia(
+    bloques: Sequence[Intervalo],
+    libres: Sequence[Intervalo],
+    duracion: int,
+    paso: int,
+    minimo: int = 0,
+    maximo: int = MINUTOS_DIA,
+) -> List[int]:
+    """Inicios libres del día alineados a la grilla de cada bloque, dentro de [minimo, maximo)."""
+    fines = [f for _, f in libres]
+    inicios: set[int] = set()
+    for bloque in bloques:
+        for t in inicios_en_grilla(bloque, recortar(libres, fines, bloque), duracion, paso):
+            if minimo <= t < maximo:
+                inicios.add(t)
+    return sorted(inicios)
+
+
+def limites_del_dia(d: date, desde: datetime, hasta: datetime) -> Tuple[int, int]:
+    """Minutos [minimo, maximo) del día 'd' que caen dentro de [desde, hasta)."""
+    base = datetime.combine(d, time.min)
+    minimo = max(0, -int(-(desde - base).total_seconds() // 60))
+    maximo = int((hasta - base).total_seconds() // 60)
+    return minimo, maximo
+
+
+def hhmm(minutos: int) -> str:
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
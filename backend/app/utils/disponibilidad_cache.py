@@ -0,0 +1,217 @@
+# app/utils/disponibilidad_cache.py
+"""
+Cache en proceso de disponibilidad por emprendedor y por día.
+
+Cada día se guarda como un bitset de gránulos de 5 minutos (288 bits = 36 bytes),
+con 1 = libre. Los bloques de Horario del emprendedor se guardan aparte porque
+definen la grilla de inicios.
+
+- LRU acotado por memoria (DISPONIBILIDAD_CACHE_MAX_BYTES, default 8 MB): días y
+  bloques comparten el mismo presupuesto y la misma cola de eviction.
+- TTL (DISPONIBILIDAD_CACHE_TTL_S, default 30 s): con varios workers cada proceso
+  tiene su cache y solo invalida lo que escribió él; lo escrito en otro proceso se
+  ve, como mucho, TTL segundos después.
+- Contadores de hits/misses/evictions.
+- Se apaga con DISPONIBILIDAD_CACHE=0 para comparar latencias.
+
+Las escrituras de Turno/Horario invalidan solo lo que tocan (días del turno o
+el emprendedor completo). Cada emprendedor tiene una versión que se incrementa
+al invalidar: un request que leyó la BD antes de una escritura no puede guardar
+un bitmap viejo.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.utils.disponibilidad import MINUTOS_DIA, Intervalo
+
+GRANULO_MIN = 5
+GRANULOS_DIA = MINUTOS_DIA // GRANULO_MIN
+BYTES_DIA = GRANULOS_DIA // 8
+
+# Overhead aproximado de una entrada (clave, nodo del OrderedDict, índice por emprendedor)
+_OVERHEAD_ENTRADA = 160
+_BYTES_INTERVALO = sys.getsizeof((0, 0)) + 2 * sys.getsizeof(MINUTOS_DIA)
+
+Bloques = Dict[int, List[Intervalo]]
+# (emprendedor_id, día) para un bitmap; (emprendedor_id, None) para sus bloques
+Clave = Tuple[int, Optional[date]]
+
+
+def _tamanio(valor: Any) -> int:
+    if isinstance(valor, bytes):
+        return sys.getsizeof(valor) + _OVERHEAD_ENTRADA
+    return (
+        sys.getsizeof(valor) + _OVERHEAD_ENTRADA
+        + sum(sys.getsizeof(v) + len(v) * _BYTES_INTERVALO for v in valor.values())
+    )
+
+
+def a_bitmap(libres: Sequence[Intervalo]) -> bytes:
+    """
+    Intervalos libres (minutos) -> bitset de gránulos. Un gránulo queda libre solo
+    si está libre completo (los bordes no alineados se redondean hacia adentro).
+    """
+    bits = bytearray(BYTES_DIA)
+    for ini, fin in libres:
+        g_ini = -(-ini // GRANULO_MIN)
+        g_fin = fin // GRANULO_MIN
+        for g in range(g_ini, g_fin):
+            bits[g >> 3] |= 1 << (g & 7)
+    return bytes(bits)
+
+
+def de_bitmap(bits: bytes) -> List[Intervalo]:
+    """Bitset de gránulos -> intervalos libres (minutos), ordenados y disjuntos."""
+    out: List[Intervalo] = []
+    inicio = None
+    for i, byte in enumerate(bits):
+        if byte == 0xFF and inicio is not None:
+            continue
+        if byte == 0 and inicio is None:
+            continue
+        for b in range(8):
+            libre = (byte >> b) & 1
+            g = (i << 3) + b
+            if libre and inicio is None:
+                inicio = g
+            elif not libre and inicio is not None:
+                out.append((inicio * GRANULO_MIN, g * GRANULO_MIN))
+                inicio = None
+    if inicio is not None:
+        out.append((inicio * GRANULO_MIN, MINUTOS_DIA))
+    return out
+
+
+class CacheDisponibilidad:
+    def __init__(self, max_bytes: int, ttl_s: float, activo: bool = True):
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.activo = activo
+        self._lock = threading.Lock()
+        # clave -> (vence, valor, bytes)
+        self._entradas: "OrderedDict[Clave, Tuple[float, Any, int]]" = OrderedDict()
+        self._por_emp: Dict[int, set] = {}
+        self._version: Dict[int, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.vencidos = 0
+
+    # ---- lectura -------------------------------------------------------------
+    def version(self, emprendedor_id: int) -> int:
+        with self._lock:
+            return self._version.get(emprendedor_id, 0)
+
+    def bloques(self, emprendedor_id: int) -> Optional[Bloques]:
+        return self._obtener((emprendedor_id, None))
+
+    def dia(self, emprendedor_id: int, d: date) -> Optional[bytes]:
+        return self._obtener((emprendedor_id, d))
+
+    # ---- escritura -----------------------------------------------------------
+    def guardar_bloques(self, emprendedor_id: int, bloques: Bloques, version: int) -> None:
+        self._guardar((emprendedor_id, None), bloques, version)
+
+    def guardar_dia(self, emprendedor_id: int, d: date, bits: bytes, version: int) -> None:
+        self._guardar((emprendedor_id, d), bits, version)
+
+    # ---- invalidación --------------------------------------------------------
+    def invalidar_emprendedor(self, emprendedor_id: int) -> None:
+        with self._lock:
+            self._version[emprendedor_id] = self._version.get(emprendedor_id, 0) + 1
+            for d in list(self._por_emp.get(emprendedor_id, ())):
+                self._quitar((emprendedor_id, d))
+
+    def invalidar_turno(self, emprendedor_id: int, inicio: datetime, fin: datetime) -> None:
+        """Invalida solo los días que pisa el turno [inicio, fin) (los bloques siguen valiendo)."""
+        with self._lock:
+            self._version[emprendedor_id] = self._version.get(emprendedor_id, 0) + 1
+            d = inicio.date()
+            ultimo = max(d, fin.date())
+            while d <= ultimo:
+                self._quitar((emprendedor_id, d))
+                d += timedelta(days=1)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            for emp_id in self._por_emp:
+                self._version[emp_id] = self._version.get(emp_id, 0) + 1
+            self._entradas.clear()
+            self._por_emp.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            n_bloques = sum(1 for _, d in self._entradas if d is None)
+            return {
+                "activo": self.activo,
+                "dias": len(self._entradas) - n_bloques,
+                "emprendedores": n_bloques,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "vencidos": self.vencidos,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    # ---- internos (con el lock tomado, salvo _obtener/_guardar) --------------
+    def _obtener(self, clave: Clave) -> Any:
+        if not self.activo:
+            return None
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] < time.monotonic():
+                self._quitar(clave)
+                self.vencidos += 1
+                entrada = None
+            if entrada is None:
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return entrada[1]
+
+    def _guardar(self, clave: Clave, valor: Any, version: int) -> None:
+        if not self.activo:
+            return
+        emp_id = clave[0]
+        tamanio = _tamanio(valor)
+        with self._lock:
+            if self._version.get(emp_id, 0) != version:
+                return
+            self._quitar(clave)
+            self._entradas[clave] = (time.monotonic() + self.ttl_s, valor, tamanio)
+            self._por_emp.setdefault(emp_id, set()).add(clave[1])
+            self._bytes += tamanio
+            while self._bytes > self.max_bytes and self._entradas:
+                self._quitar(next(iter(self._entradas)))
+                self.evictions += 1
+
+    def _quitar(self, clave: Clave) -> None:
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return
+        self._bytes -= entrada[2]
+        emp_id, d = clave
+        claves = self._por_emp.get(emp_id)
+        if claves is not None:
+            claves.discard(d)
+            if not claves:
+                del self._por_emp[emp_id]
+
+
+cache_disponibilidad = CacheDisponibilidad(
+    max_bytes=settings.DISPONIBILIDAD_CACHE_MAX_BYTES,
+    ttl_s=settings.DISPONIBILIDAD_CACHE_TTL_S,
+    activo=settings.DISPONIBILIDAD_CACHE,
+)
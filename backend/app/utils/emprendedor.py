@@ -1,28 +1,44 @@
-import random
-import string
+from typing import Optional
+
+from sqlalchemy import event, func, inspect, select
 from sqlalchemy.orm import Session
+
+from app.config import settings
 from app import models
+from app.utils.codigos import asignador_codigos, guardar_con_codigo
+from app.utils.ttl_cache import FALTA, CacheTTL, invalidar_en_sesion
 
-# Evitamos caracteres confusos como O/0/I/1
-ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+def serializar_emprendedor(e) -> dict:
+    """Perfil del emprendedor como lo espera el front (None -> "")."""
+    def g(name, default=""):
+        val = getattr(e, name, None)
+        return default if val is None else val
+    return {
+        "id": g("id", None),
+        "usuario_id": g("usuario_id", None),
+        "codigo_cliente": g("codigo_cliente") or g("codigo") or g("code"),
+        "nombre": g("nombre"),
+        "nombre_negocio": g("nombre_negocio"),
+        "telefono_contacto": g("telefono_contacto"),
+        "direccion": g("direccion"),
+        "descripcion": g("descripcion"),
+        "whatsapp": g("whatsapp"),
+        "instagram": g("instagram"),
+        "facebook": g("facebook"),
+        "web": g("web"),
+        "logo_url": g("logo_url"),
+        "banner_url": g("banner_url"),
+        "capacidad": g("capacidad", 1),
+    }
 
-def generate_unique_cliente_code(db: Session, length: int = 8) -> str:
-    """Genera un código público único para Emprendedor."""
-    while True:
-        code = "".join(random.choices(ALPHABET, k=length))
-        exists = db.query(models.Emprendedor).filter(models.Emprendedor.codigo_cliente == code).first()
-        if not exists:
-            return code
+def generate_unique_cliente_code(db: Session) -> str:
+    """Código público nuevo (app.utils.codigos: sin reintentos ni SELECT por intento)."""
+    return asignador_codigos.siguiente(db)
 
 def ensure_emprendedor_for_user(db: Session, user: models.Usuario) -> models.Emprendedor:
     """Obtiene o crea (idempotente) el Emprendedor del usuario. Garantiza codigo_cliente."""
     emp = db.query(models.Emprendedor).filter(models.Emprendedor.usuario_id == user.id).first()
-    if emp:
-        if not getattr(emp, "codigo_cliente", None):
-            emp.codigo_cliente = generate_unique_cliente_code(db)
-            db.add(emp)
-            db.commit()
-            db.refresh(emp)
+    if emp and getattr(emp, "codigo_cliente", None):
         return emp
 
     default_name = (
@@ -31,32 +47,115 @@ def ensure_emprendedor_for_user(db: Session, user: models.Usuario) -> models.Emp
         or f"Mi Negocio {user.id}"
     )
 
-    # Armamos kwargs tolerantes a diferencias de modelo (negocio vs nombre, activo opcional)
-    kwargs = dict(
-        usuario_id=user.id,
-        descripcion="",
-        codigo_cliente=generate_unique_cliente_code(db),
-    )
-    if hasattr(models.Emprendedor, "negocio"):
-        kwargs["negocio"] = default_name
-    if hasattr(models.Emprendedor, "nombre"):
-        kwargs["nombre"] = default_name
-    if hasattr(models.Emprendedor, "activo"):
-        kwargs["activo"] = True
-
-    emp = models.Emprendedor(**kwargs)
-    db.add(emp)
-    db.commit()
-    db.refresh(emp)
-    return emp
+    def aplicar(codigo: str) -> models.Emprendedor:
+        # se relee en cada intento: si otro request lo creó en el medio, se usa ese
+        e = db.query(models.Emprendedor).filter(models.Emprendedor.usuario_id == user.id).first()
+        if e:
+            if not getattr(e, "codigo_cliente", None):
+                e.codigo_cliente = codigo
+            return e
+
+        # Armamos kwargs tolerantes a diferencias de modelo (negocio vs nombre, activo opcional)
+        kwargs = dict(
+            usuario_id=user.id,
+            descripcion="",
+            codigo_cliente=codigo,
+        )
+        if hasattr(models.Emprendedor, "negocio"):
+            kwargs["negocio"] = default_name
+        if hasattr(models.Emprendedor, "nombre"):
+            kwargs["nombre"] = default_name
+        if hasattr(models.Emprendedor, "activo"):
+            kwargs["activo"] = True
+
+        e = models.Emprendedor(**kwargs)
+        db.add(e)
+        return e
+
+    return guardar_con_codigo(db, aplicar)
 
 def regenerate_public_code(db: Session, emprendedor: models.Emprendedor) -> models.Emprendedor:
     """Asigna un nuevo codigo_cliente único."""
-    emprendedor.codigo_cliente = generate_unique_cliente_code(db)
-    db.add(emprendedor)
-    db.commit()
-    db.refresh(emprendedor)
-    return emprendedor
+    def aplicar(codigo: str) -> models.Emprendedor:
+        emprendedor.codigo_cliente = codigo
+        db.add(emprendedor)
+        return emprendedor
+
+    return guardar_con_codigo(db, aplicar)
+
+# ---- usuario_id -> emprendedor_id (cache de proceso) ----------------------------
+# Lo consultan casi todos los endpoints del panel. Cachea también "no es
+# emprendedor" (None). Cualquier alta/cambio/baja de Emprendedor hecha por el ORM
+# (activar, PUT /emprendedores/mi, ensure_emprendedor_for_user) invalida al usuario
+# (y su código público, ver más abajo).
+emprendedor_por_usuario = CacheTTL(
+    ttl_s=settings.EMPRENDEDOR_CACHE_TTL_S,
+    max_entradas=settings.EMPRENDEDOR_CACHE_MAX_ENTRADAS,
+    activo=settings.EMPRENDEDOR_CACHE,
+)
+
+
+def emprendedor_id_de_usuario(db: Session, usuario_id: int) -> Optional[int]:
+    emp_id = emprendedor_por_usuario.obtener(usuario_id)
+    if emp_id is not FALTA:
+        return emp_id
+    version = emprendedor_por_usuario.version(usuario_id)
+    emp_id = db.execute(
+        select(models.Emprendedor.id).where(models.Emprendedor.usuario_id == usuario_id).limit(1)
+    ).scalar()
+    emprendedor_por_usuario.guardar(usuario_id, emp_id, version)
+    return emp_id
+
+
+# ---- código público -> emprendedor_id (cache de proceso) -------------------------
+# Todas las rutas públicas /.../de/{codigo} resuelven por acá. Los códigos
+# inexistentes también se cachean (TTL corto) para absorber barridos.
+emprendedor_por_codigo = CacheTTL(
+    ttl_s=settings.CODIGO_CACHE_TTL_S,
+    max_entradas=settings.CODIGO_CACHE_MAX_ENTRADAS,
+    activo=settings.CODIGO_CACHE,
+    ttl_negativo_s=settings.CODIGO_CACHE_TTL_NEGATIVO_S,
+)
+_LARGO_CODIGO = models.Emprendedor.__table__.c.codigo_cliente.type.length
+
+
+def normalizar_codigo(codigo: Optional[str]) -> str:
+    return str(codigo or "").strip().upper()
+
+
+def resolver_codigo(db: Session, codigo: Optional[str]) -> Optional[int]:
+    """emprendedor_id del código público (sin distinguir mayúsculas/espacios) o None."""
+    code = normalizar_codigo(codigo)
+    if not code or len(code) > _LARGO_CODIGO:
+        return None
+    emp_id = emprendedor_por_codigo.obtener(code)
+    if emp_id is not FALTA:
+        return emp_id
+    version = emprendedor_por_codigo.version(code)
+    # misma expresión que ix_emprendedor_codigo_norm
+    emp_id = db.execute(
+        select(models.Emprendedor.id)
+        .where(func.upper(func.trim(models.Emprendedor.codigo_cliente)) == code)
+        .limit(1)
+    ).scalar()
+    emprendedor_por_codigo.guardar(code, emp_id, version)
+    return emp_id
+
+
+def _emprendedor_cambio(mapper, conn, target):
+    estado = inspect(target)
+    sesion = estado.session
+    for usuario_id in {target.usuario_id, *estado.attrs.usuario_id.history.deleted}:
+        if usuario_id is not None:
+            invalidar_en_sesion(emprendedor_por_usuario, usuario_id, sesion)
+    for codigo in {target.codigo_cliente, *estado.attrs.codigo_cliente.history.deleted}:
+        if codigo:
+            invalidar_en_sesion(emprendedor_por_codigo, normalizar_codigo(codigo), sesion)
+
+
+for _evento in ("after_insert", "after_update", "after_delete"):
+    event.listen(models.Emprendedor, _evento, _emprendedor_cambio)
+
 
 def is_user_emprendedor(db: Session, user: models.Usuario) -> bool:
-    return db.query(models.Emprendedor).filter(models.Emprendedor.usuario_id == user.id).first() is not None
+    return emprendedor_id_de_usuario(db, user.id) is not None
@@ -0,0 +1,134 @@
+# app/utils/hash_pool.py
+"""
+Pool dedicado para bcrypt (hash y verificación de contraseñas).
+
+bcrypt cuesta decenas/cientos de ms de CPU por llamada. Si corre dentro de un
+endpoint sync ocupa un worker del threadpool compartido de Starlette, y una
+ráfaga de logins deja sin workers a las reservas. Acá corre en su propio
+ThreadPoolExecutor (la extensión de bcrypt suelta el GIL mientras calcula):
+
+- PASSWORD_HASH_WORKERS hilos como máximo en paralelo.
+- PASSWORD_HASH_COLA_MAX pedidos esperando; por encima se contesta 503 con
+  Retry-After en vez de encolar sin límite.
+- Métricas de tiempo en cola y de cálculo (GET /admin-lite/hash-pool).
+- PASSWORD_HASH_POOL=0 vuelve al comportamiento anterior (threadpool compartido).
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+def _percentil(valores, p: float) -> float:
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    k = min(len(orden) - 1, max(0, int(round(p / 100 * len(orden))) - 1))
+    return orden[k]
+
+
+class PoolHash:
+    def __init__(self, workers: int, cola_max: int, activo: bool = True):
+        self.workers = max(1, workers)
+        self.cola_max = max(0, cola_max)
+        self.activo = activo
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pendientes = 0          # en cola + calculando
+        self._en_curso = 0
+        self._espera_ms: deque = deque(maxlen=2000)
+        self._calculo_ms: deque = deque(maxlen=2000)
+        self.completados = 0
+        self.rechazados = 0
+        self.max_pendientes = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            return self._executor
+
+    async def ejecutar(self, fn: Callable[..., T], *args) -> T:
+        if not self.activo:
+            return await run_in_threadpool(fn, *args)
+
+        with self._lock:
+            if self._pendientes >= self.workers + self.cola_max:
+                self.rechazados += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Demasiados inicios de sesión simultáneos, reintentá en unos segundos",
+                    headers={"Retry-After": "1"},
+                )
+            self._pendientes += 1
+            self.max_pendientes = max(self.max_pendientes, self._pendientes)
+        encolado = time.perf_counter()
+
+        def _tarea():
+            inicio = time.perf_counter()
+            with self._lock:
+                self._en_curso += 1
+                self._espera_ms.append((inicio - encolado) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                fin = time.perf_counter()
+                with self._lock:
+                    self._en_curso -= 1
+                    self._calculo_ms.append((fin - inicio) * 1000)
+                    self.completados += 1
+
+        def _liberar(_futuro) -> None:
+            with self._lock:
+                self._pendientes -= 1
+
+        # el lugar se libera cuando termina la tarea (o se cancela antes de
+        # arrancar), no cuando se cancela el request que la espera
+        try:
+            futuro = self._pool().submit(_tarea)
+        except BaseException:
+            _liberar(None)
+            raise
+        futuro.add_done_callback(_liberar)
+        return await asyncio.wrap_future(futuro)
+
+    def stats(self) -> dict:
+        with self._lock:
+            espera = list(self._espera_ms)
+            calculo = list(self._calculo_ms)
+            out = {
+                "activo": self.activo,
+                "workers": self.workers,
+                "cola_max": self.cola_max,
+                "pendientes": self._pendientes,
+                "en_curso": self._en_curso,
+                "max_pendientes": self.max_pendientes,
+                "completados": self.completados,
+                "rechazados": self.rechazados,
+            }
+        out["espera_ms"] = {
+            "p50": round(_percentil(espera, 50), 2),
+            "p95": round(_percentil(espera, 95), 2),
+            "max": round(max(espera), 2) if espera else 0.0,
+        }
+        out["calculo_ms"] = {
+            "p50": round(_percentil(calculo, 50), 2),
+            "p95": round(_percentil(calculo, 95), 2),
+        }
+        return out
+
+
+pool_hash = PoolHash(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    cola_max=settings.PASSWORD_HASH_COLA_MAX,
+    activo=settings.PASSWORD_HASH_POOL,
+)
@@ -0,0 +1,183 @@
+# app/utils/http_cache.py
+"""
+Cache HTTP de las lecturas públicas: validadores (ETag / Last-Modified),
+respuestas 304 y Cache-Control por ruta.
+
+Los ETag se arman con la versión de cambios del emprendedor
+(app.utils.versiones), no hasheando el cuerpo: responder 304 no requiere
+ejecutar el handler.
+
+- CacheHTTPMiddleware cubre GET /{horarios,servicios,turnos,disponibilidad}/de/{codigo}
+  con ETag débil (versión + query string + fecha del día, por las ventanas
+  por defecto que dependen de "hoy").
+- /agenda/de/{codigo} arma su propio ETag fuerte y usa las mismas métricas.
+- Cache-Control por ruta: HTTP_CACHE_CONTROL="servicios=public, max-age=60; turnos=no-cache; ..."
+- Métricas de 304 por ruta en GET /admin-lite/cache-http (reset: POST, solo admin).
+"""
+import hashlib
+import re
+import threading
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+from app.database import SessionLocal
+from app.utils.emprendedor import resolver_codigo
+from app.utils.versiones import version_de
+
+
+def http_fecha(dt: datetime) -> str:
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def _etags(valor: str) -> list:
+    return [t.strip().removeprefix("W/") for t in valor.split(",") if t.strip()]
+
+
+def no_modificado(request: Request, etag: str, ultima_mod: Optional[datetime]) -> bool:
+    """
+    If-None-Match (comparación débil) manda sobre If-Modified-Since, como
+    indica RFC 9110.
+    """
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = _etags(inm)
+        return "*" in tags or etag.removeprefix("W/") in tags
+    ims = request.headers.get("if-modified-since")
+    if ims and ultima_mod is not None:
+        try:
+            desde = parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        return ultima_mod.replace(microsecond=0) <= desde
+    return False
+
+
+def validadores(etag: str, ultima_mod: Optional[datetime], cache_control: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if ultima_mod is not None:
+        headers["Last-Modified"] = http_fecha(ultima_mod)
+    return headers
+
+
+def respuesta_304(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+# ---- políticas de Cache-Control -----------------------------------------------
+def _parsear_politicas(valor: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for parte in valor.split(";"):
+        ruta, _, politica = parte.partition("=")
+        if ruta.strip() and politica.strip():
+            out[ruta.strip()] = politica.strip()
+    return out
+
+
+POLITICAS = _parsear_politicas(settings.HTTP_CACHE_CONTROL)
+
+
+def politica(ruta: str) -> str:
+    return POLITICAS.get(ruta, "no-cache")
+
+
+# ---- métricas ----------------------------------------------------------------
+class MetricasHTTPCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_ruta: Dict[str, Dict[str, int]] = {}
+
+    def registrar(self, ruta: str, es_304: bool) -> None:
+        with self._lock:
+            m = self._por_ruta.setdefault(ruta, {"requests": 0, "no_modificados": 0})
+            m["requests"] += 1
+            if es_304:
+                m["no_modificados"] += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._por_ruta.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            rutas = {r: dict(m) for r, m in self._por_ruta.items()}
+        total = sum(m["requests"] for m in rutas.values())
+        n304 = sum(m["no_modificados"] for m in rutas.values())
+        for m in rutas.values():
+            m["ratio_304"] = round(m["no_modificados"] / m["requests"], 4) if m["requests"] else 0.0
+        return {
+            "activo": settings.HTTP_CACHE,
+            "politicas": POLITICAS,
+            "requests": total,
+            "no_modificados": n304,
+            "ratio_304": round(n304 / total, 4) if total else 0.0,
+            "rutas": rutas,
+        }
+
+
+metricas_http_cache = MetricasHTTPCache()
+
+
+# ---- middleware --------------------------------------------------------------
+_RUTA_PUBLICA = re.compile(r"^/(horarios|servicios|turnos|disponibilidad)/de/([^/]+)/?$")
+
+
+def _version_por_codigo(codigo: str) -> Tuple[Optional[int], int]:
+    db = SessionLocal()
+    try:
+        emp_id = resolver_codigo(db, codigo)
+        if not emp_id:
+            return None, 0
+        return emp_id, version_de(db, emp_id)[0]
+    finally:
+        db.close()
+
+
+class CacheHTTPMiddleware:
+    """ASGI puro: no envuelve el cuerpo, solo agrega headers o corta con 304."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        m = _RUTA_PUBLICA.match(scope["path"])
+        if not m:
+            await self.app(scope, receive, send)
+            return
+
+        ruta, codigo = m.groups()
+        emp_id, version = await run_in_threadpool(_version_por_codigo, codigo)
+        if emp_id is None:
+            await self.app(scope, receive, send)  # el handler contesta 404
+            return
+
+        variante = hashlib.blake2b(
+            scope.get("query_string", b"") + date.today().isoformat().encode(), digest_size=6
+        ).hexdigest()
+        etag = f'W/"{ruta}-{emp_id}-{version}-{variante}"'
+        headers = validadores(etag, None, politica(ruta))
+
+        if no_modificado(Request(scope), etag, None):
+            metricas_http_cache.registrar(ruta, True)
+            await respuesta_304(headers)(scope, receive, send)
+            return
+        metricas_http_cache.registrar(ruta, False)
+
+        async def _send(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                h = MutableHeaders(scope=message)
+                for k, v in headers.items():
+                    h[k] = v
+            await send(message)
+
+        await self.app(scope, receive, _send)
@@ -6,7 +6,12 @@ Auto-migraciones mínimas para SQLite en desarrollo.
 
 ⚠️ Solo para DEV. En producción usar Alembic.
 """
-from sqlalchemy import text
+from itertools import groupby
+
+from sqlalchemy import inspect, select, text, update
+
+from app import models
+from app.utils.disponibilidad import repartir_carriles
 
 
 def _column_exists(conn, table: str, column: str) -> bool:
@@ -103,3 +108,111 @@ def auto_migrate_sqlite(engine) -> None:
                     f"ALTER TABLE turnos ADD COLUMN {col_def}"
                 )
                 print(f"[MIGRATE] Added turnos.{col_name}")
+
+
+def ensure_schema(engine) -> None:
+    """
+    Columnas e índices agregados después del esquema inicial. create_all no
+    altera tablas existentes, así que esto los crea si faltan.
+    Idempotente y portable (SQLite / Postgres).
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        cols = {c["name"] for c in insp.get_columns("emprendedores")}
+        if "capacidad" not in cols:
+            conn.exec_driver_sql(
+                "ALTER TABLE emprendedores ADD COLUMN capacidad INTEGER NOT NULL DEFAULT 1"
+            )
+            print("[MIGRATE] Added emprendedores.capacidad")
+
+        cols = {c["name"] for c in insp.get_columns("turnos")}
+        if "carril" not in cols:
+            conn.exec_driver_sql(
+                "ALTER TABLE turnos ADD COLUMN carril INTEGER NOT NULL DEFAULT 0"
+            )
+            print("[MIGRATE] Added turnos.carril")
+
+        for ix in (
+            models.Turno.__table__.indexes
+            | models.Emprendedor.__table__.indexes
+            | models.Usuario.__table__.indexes
+        ):
+            _crear_indice(conn, ix)
+
+    if engine.dialect.name == "postgresql":
+        _ensure_exclusion_turnos(engine)
+
+
+def _indice_existe(conn, nombre: str) -> bool:
+    # por nombre: la reflexión de SQLite saltea los índices por expresión
+    # (lower(trim(...))), así que checkfirst=True no los ve y los recrearía
+    if conn.dialect.name == "sqlite":
+        sql, params = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (nombre,)
+    elif conn.dialect.name == "postgresql":
+        sql, params = "SELECT 1 FROM pg_indexes WHERE indexname = %s", (nombre,)
+    else:
+        insp = inspect(conn)
+        return any(ix["name"] == nombre for t in insp.get_table_names() for ix in insp.get_indexes(t))
+    return conn.exec_driver_sql(sql, params).first() is not None
+
+
+def _crear_indice(conn, ix) -> None:
+    if not _indice_existe(conn, ix.name):
+        ix.create(conn)
+
+
+def _renumerar_carriles(conn) -> int:
+    """
+    Reparte de nuevo los carriles de los turnos no cancelados de cada
+    emprendedor (mismo criterio que la reserva: app.utils.disponibilidad.repartir_carriles),
+    así los datos viejos solapados en el carril 0 no impiden la constraint.
+    Sin tope de capacidad: si ya había sobreventa, esas filas quedan en carriles
+    >= capacidad. Devuelve la cantidad de filas movidas.
+    """
+    T = models.Turno.__table__
+    filas = conn.execute(
+        select(T.c.id, T.c.emprendedor_id, T.c.inicio, T.c.fin, T.c.carril)
+        .where(T.c.estado != models.EstadoTurno.cancelado)
+        .order_by(T.c.emprendedor_id, T.c.inicio)
+    ).all()
+    movidos = 0
+    for _, grupo in groupby(filas, key=lambda f: f.emprendedor_id):
+        grupo = list(grupo)
+        nuevos = repartir_carriles((f.id, f.inicio, f.fin) for f in grupo)
+        for f in grupo:
+            if nuevos[f.id] != (f.carril or 0):
+                conn.execute(update(T).where(T.c.id == f.id).values(carril=nuevos[f.id]))
+                movidos += 1
+    return movidos
+
+
+def _ensure_exclusion_turnos(engine) -> None:
+    """
+    Postgres: dos turnos no cancelados del mismo emprendedor y carril no pueden
+    solaparse. Hace atómica la reserva sin lock global: sin la constraint la
+    reserva no tiene otra protección, así que si no se puede crear la app no arranca.
+    """
+    with engine.begin() as conn:
+        existe = conn.exec_driver_sql(
+            "SELECT 1 FROM pg_constraint WHERE conname = 'ex_turno_sin_solape'"
+        ).first()
+    if existe:
+        return
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS btree_gist")
+            movidos = _renumerar_carriles(conn)
+            if movidos:
+                print(f"[MIGRATE] Renumerados carriles de {movidos} turnos solapados")
+            conn.exec_driver_sql(
+                "ALTER TABLE turnos ADD CONSTRAINT ex_turno_sin_solape "
+                "EXCLUDE USING gist ("
+                "emprendedor_id WITH =, carril WITH =, tstzrange(inicio, fin) WITH &&"
+                ") WHERE (estado <> 'cancelado')"
+            )
+        print("[MIGRATE] Added turnos.ex_turno_sin_solape")
+    except Exception as e:
+        raise RuntimeError(
+            "No se pudo crear turnos.ex_turno_sin_solape (sin ella la reserva puede "
+            f"sobrevender con escrituras concurrentes): {e}"
+        ) from e
@@ -0,0 +1,122 @@
+# app/utils/recurrencia.py
+"""
+Expansión de reglas de recurrencia estilo RRULE (RFC 5545), subconjunto:
+
+    FREQ=DAILY|WEEKLY|MONTHLY   (obligatorio)
+    INTERVAL=n                  (default 1)
+    COUNT=n | UNTIL=AAAAMMDD[THHMMSS[Z]]   (al menos uno)
+    BYDAY=MO,TU,...             (DAILY / WEEKLY; semana de lunes a domingo)
+
+Ej.: "FREQ=WEEKLY;BYDAY=MO,TH;COUNT=12". Cada ocurrencia conserva la hora de
+'inicio'. MONTHLY repite el mismo día del mes y saltea los meses que no lo
+tienen (31, 30 de febrero, ...). UNTIL con solo fecha incluye todo ese día.
+"""
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Optional
+
+_DIAS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+def _parsear(regla: str) -> Dict[str, str]:
+    texto = regla.strip()
+    if texto.upper().startswith("RRULE:"):
+        texto = texto[6:]
+    partes: Dict[str, str] = {}
+    for parte in texto.split(";"):
+        if not parte.strip():
+            continue
+        clave, sep, valor = parte.partition("=")
+        if not sep or not valor.strip():
+            raise ValueError(f"Parte inválida en la regla: '{parte}'")
+        partes[clave.strip().upper()] = valor.strip().upper()
+    return partes
+
+
+def _until(valor: str) -> datetime:
+    v = valor.rstrip("Z")
+    try:
+        if "T" in v:
+            return datetime.strptime(v, "%Y%m%dT%H%M%S")
+        return datetime.combine(datetime.strptime(v, "%Y%m%d").date(), time.max)
+    except ValueError:
+        raise ValueError(f"UNTIL inválido: '{valor}'")
+
+
+def _entero(partes: Dict[str, str], clave: str) -> Optional[int]:
+    if clave not in partes:
+        return None
+    try:
+        n = int(partes[clave])
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise ValueError(f"{clave} debe ser un entero positivo")
+    return n
+
+
+def expandir(regla: str, inicio: datetime, maximo: int) -> List[datetime]:
+    """
+    Inicios de las ocurrencias (>= inicio, en orden). Levanta ValueError si la
+    regla no se entiende o genera más de 'maximo' ocurrencias.
+    """
+    partes = _parsear(regla)
+    freq = partes.get("FREQ")
+    if freq not in ("DAILY", "WEEKLY", "MONTHLY"):
+        raise ValueError("FREQ debe ser DAILY, WEEKLY o MONTHLY")
+    intervalo = _entero(partes, "INTERVAL") or 1
+    count = _entero(partes, "COUNT")
+    until = _until(partes["UNTIL"]) if "UNTIL" in partes else None
+    if count is None and until is None:
+        raise ValueError("La regla necesita COUNT o UNTIL")
+    if count is not None and count > maximo:
+        raise ValueError(f"Máximo {maximo} ocurrencias")
+
+    byday = None
+    if "BYDAY" in partes:
+        try:
+            byday = sorted({_DIAS[d.strip()] for d in partes["BYDAY"].split(",")})
+        except KeyError:
+            raise ValueError("BYDAY admite MO,TU,WE,TH,FR,SA,SU")
+        if freq == "MONTHLY":
+            raise ValueError("BYDAY no se admite con FREQ=MONTHLY")
+
+    out: List[datetime] = []
+
+    def agregar(d: datetime) -> bool:
+        """False cuando hay que cortar."""
+        if until is not None and d > until:
+            return False
+        if d >= inicio:
+            if len(out) >= maximo:
+                raise ValueError(f"Máximo {maximo} ocurrencias")
+            out.append(d)
+        return count is None or len(out) < count
+
+    # tope de vueltas por si la regla nunca produce ocurrencias
+    for k in range(maximo * 40 + 400):
+        if freq == "DAILY":
+            d = inicio + timedelta(days=k * intervalo)
+            if byday is not None and d.weekday() not in byday:
+                if until is not None and d > until:
+                    break
+                continue
+            if not agregar(d):
+                break
+        elif freq == "WEEKLY":
+            lunes = inicio - timedelta(days=inicio.weekday()) + timedelta(weeks=k * intervalo)
+            seguir = True
+            for wd in byday if byday is not None else [inicio.weekday()]:
+                if not agregar(lunes + timedelta(days=wd)):
+                    seguir = False
+                    break
+            if not seguir:
+                break
+        else:  # MONTHLY
+            meses = inicio.month - 1 + k * intervalo
+            try:
+                d = inicio.replace(year=inicio.year + meses // 12, month=meses % 12 + 1)
+            except ValueError:
+                continue  # el mes no tiene ese día
+            if not agregar(d):
+                break
+    return out
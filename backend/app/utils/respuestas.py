@@ -0,0 +1,50 @@
+# app/utils/respuestas.py
+"""
+Render y compresión de respuestas.
+
+- RespuestaJSON: clase de respuesta por defecto de la app. ORJSONResponse si
+  orjson está instalado (está en requirements); si no, JSONResponse.
+- agregar_compresion(app): compresión opt-in con umbral de tamaño.
+      HTTP_COMPRESION=gzip | br   (vacío = sin comprimir)
+      HTTP_COMPRESION_MIN_BYTES=1024
+  "br" usa brotli-asgi si está instalado (con gzip para clientes sin br);
+  si no, cae a gzip.
+"""
+from typing import Optional
+
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as RespuestaJSON
+except ImportError:  # pragma: no cover
+    RespuestaJSON = JSONResponse
+
+
+def agregar_compresion(app) -> Optional[str]:
+    """Registra el middleware de compresión configurado. Devuelve 'gzip', 'br' o None."""
+    modo = (settings.HTTP_COMPRESION or "").strip().lower()
+    if modo in ("", "0", "no", "off"):
+        return None
+    if modo == "br":
+        try:
+            from brotli_asgi import BrotliMiddleware
+        except ImportError:
+            print("[HTTP] HTTP_COMPRESION=br pero brotli-asgi no está instalado: se usa gzip")
+        else:
+            app.add_middleware(
+                BrotliMiddleware,
+                quality=settings.HTTP_COMPRESION_NIVEL_BR,
+                minimum_size=settings.HTTP_COMPRESION_MIN_BYTES,
+                gzip_fallback=True,
+            )
+            return "br"
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.HTTP_COMPRESION_MIN_BYTES,
+        compresslevel=settings.HTTP_COMPRESION_NIVEL_GZIP,
+    )
+    return "gzip"
@@ -0,0 +1,257 @@
+# app/utils/rollup.py
+"""
+Mantenimiento de turnos_daily_rollup.
+
+- Incremental: eventos after_insert/after_update/after_delete de Turno aplican
+  un delta (UPSERT) en la misma transacción que la escritura.
+- Backfill: reconstruir(engine) lo arma de cero desde el historial con un
+  INSERT ... SELECT agrupado. También por consola:
+
+      python -m app.utils.rollup
+
+Las escrituras masivas que no pasan por el ORM (UPDATE/DELETE directos) no
+disparan eventos: después de algo así, correr el backfill. Los INSERT por Core
+(p. ej. /turnos/bulk) llaman a aplicar_insertados() en su misma transacción.
+
+Ingresos: cada turno guarda en precio_aplicado el precio del servicio al
+reservarlo (o al cambiarle el servicio), y el rollup suma y resta exactamente
+ese valor; si después cambia Servicio.precio, el total no se corre. Al borrar
+un emprendedor (o su usuario) la base borra sus turnos en cascada sin eventos:
+sus filas del rollup se borran explícitamente.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, case, cast, delete, event, func, insert, inspect, literal, select, update
+
+from app import models
+
+R = models.TurnoDailyRollup.__table__
+T = models.Turno.__table__
+S = models.Servicio.__table__
+E = models.Emprendedor.__table__
+
+_COLUMNA_ESTADO = {
+    models.EstadoTurno.pendiente.value: "pendientes",
+    models.EstadoTurno.confirmado.value: "confirmados",
+    models.EstadoTurno.cancelado.value: "cancelados",
+}
+
+
+def _estado(v) -> str:
+    return str(getattr(v, "value", v) or "")
+
+
+def _dia(v) -> Optional[date]:
+    if isinstance(v, datetime):
+        return v.date()
+    return v
+
+
+def _aporte(emprendedor_id, servicio_id, inicio, estado, precio_aplicado) -> Optional[dict]:
+    """Fila del rollup que aporta un turno (sin signo)."""
+    dia = _dia(inicio)
+    col = _COLUMNA_ESTADO.get(_estado(estado))
+    if dia is None or emprendedor_id is None or col is None:
+        return None
+    # lo que el turno aportó al sumar es lo que resta al cancelarse / borrarse
+    ingreso = int(precio_aplicado or 0) if col == "confirmados" else 0
+    return {
+        "dia": dia,
+        "emprendedor_id": int(emprendedor_id),
+        "servicio_id": int(servicio_id or 0),
+        "col": col,
+        "ingresos": ingreso,
+    }
+
+
+def _aplicar(conn, aporte: Optional[dict], signo: int) -> None:
+    if not aporte:
+        return
+    col = aporte["col"]
+    n = signo * aporte.get("cantidad", 1)
+    delta = {"pendientes": 0, "confirmados": 0, "cancelados": 0}
+    delta[col] = n
+    ingresos = signo * aporte["ingresos"]
+    clave = {k: aporte[k] for k in ("dia", "emprendedor_id", "servicio_id")}
+
+    if conn.dialect.name in ("sqlite", "postgresql"):
+        if conn.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        stmt = upsert(R).values(**clave, **delta, ingresos=ingresos)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[R.c.dia, R.c.emprendedor_id, R.c.servicio_id],
+            set_={
+                col: R.c[col] + n,
+                "ingresos": R.c.ingresos + ingresos,
+            },
+        )
+        conn.execute(stmt)
+        return
+
+    # otros dialectos: UPDATE y, si no existía la fila, INSERT
+    res = conn.execute(
+        update(R)
+        .where(R.c.dia == clave["dia"], R.c.emprendedor_id == clave["emprendedor_id"], R.c.servicio_id == clave["servicio_id"])
+        .values({col: R.c[col] + n, "ingresos": R.c.ingresos + ingresos})
+    )
+    if not res.rowcount:
+        conn.execute(insert(R).values(**clave, **delta, ingresos=ingresos))
+
+
+def aplicar_insertados(conn, filas) -> None:
+    """
+    Delta de un INSERT por Core (sin eventos ORM): agrupa las filas por
+    (día, emprendedor, servicio, estado) y aplica un UPSERT por grupo. Las
+    filas tienen que traer precio_aplicado (el que se insertó).
+    """
+    grupos: dict = {}
+    for f in filas:
+        aporte = _aporte(f["emprendedor_id"], f.get("servicio_id"), f["inicio"], f.get("estado"),
+                         f.get("precio_aplicado"))
+        if not aporte:
+            continue
+        clave = (aporte["dia"], aporte["emprendedor_id"], aporte["servicio_id"], aporte["col"])
+        g = grupos.setdefault(clave, dict(aporte, cantidad=0, ingresos=0))
+        g["cantidad"] += 1
+        g["ingresos"] += aporte["ingresos"]
+    for clave in sorted(grupos):
+        _aplicar(conn, grupos[clave], +1)
+
+
+def _valores(target, viejos: bool = False):
+    """(emprendedor_id, servicio_id, inicio, estado, precio_aplicado) actuales o previos al flush."""
+    st = inspect(target)
+    out = []
+    for attr in ("emprendedor_id", "servicio_id", "inicio", "estado", "precio_aplicado"):
+        v = getattr(target, attr)
+        if viejos:
+            hist = st.attrs[attr].history
+            if hist.deleted:
+                v = hist.deleted[0]
+        out.append(v)
+    return out
+
+
+def _precio_servicio(conn, servicio_id) -> Optional[int]:
+    if not servicio_id:
+        return None
+    return conn.execute(select(S.c.precio).where(S.c.id == servicio_id)).scalar()
+
+
+@event.listens_for(models.Turno, "before_insert")
+def _turno_congelar_precio(mapper, conn, target):
+    if target.precio_aplicado is None:
+        target.precio_aplicado = _precio_servicio(conn, target.servicio_id)
+
+
+@event.listens_for(models.Turno, "before_update")
+def _turno_cambio_servicio(mapper, conn, target):
+    # otro servicio, otro precio (salvo que el cambio lo fije a mano). Si el
+    # servicio se borra (servicio_id -> NULL) el turno conserva lo que cobró.
+    st = inspect(target)
+    if (
+        target.servicio_id is not None
+        and st.attrs.servicio_id.history.has_changes()
+        and not st.attrs.precio_aplicado.history.has_changes()
+    ):
+        target.precio_aplicado = _precio_servicio(conn, target.servicio_id)
+
+
+@event.listens_for(models.Turno, "after_insert")
+def _turno_insert(mapper, conn, target):
+    _aplicar(conn, _aporte(*_valores(target)), +1)
+
+
+@event.listens_for(models.Turno, "after_update")
+def _turno_update(mapper, conn, target):
+    nuevos = _valores(target)
+    viejos = _valores(target, viejos=True)
+    if nuevos == viejos:
+        return
+    _aplicar(conn, _aporte(*viejos), -1)
+    _aplicar(conn, _aporte(*nuevos), +1)
+
+
+@event.listens_for(models.Turno, "after_delete")
+def _turno_delete(mapper, conn, target):
+    _aplicar(conn, _aporte(*_valores(target, viejos=True)), -1)
+
+
+@event.listens_for(models.Emprendedor, "after_delete")
+def _emprendedor_delete(mapper, conn, target):
+    # sus turnos se van por ON DELETE CASCADE (passive_deletes): sin eventos de Turno
+    conn.execute(delete(R).where(R.c.emprendedor_id == target.id))
+
+
+@event.listens_for(models.Usuario, "after_delete")
+def _usuario_delete(mapper, conn, target):
+    # el emprendedor del usuario también puede irse por cascada de la base
+    conn.execute(delete(R).where(R.c.emprendedor_id.not_in(select(E.c.id))))
+
+
+def congelar_precios(conn) -> None:
+    """Turnos viejos sin precio_aplicado: se fija el precio actual del servicio (una vez)."""
+    conn.execute(
+        update(T)
+        .where(T.c.precio_aplicado.is_(None), T.c.servicio_id.is_not(None))
+        .values(precio_aplicado=select(S.c.precio).where(S.c.id == T.c.servicio_id).scalar_subquery())
+    )
+
+
+def reconstruir(engine) -> int:
+    """Backfill: vacía el rollup y lo arma desde el historial. Devuelve filas generadas."""
+    if engine.dialect.name == "sqlite":
+        dia = func.date(T.c.inicio)
+    else:
+        dia = cast(T.c.inicio, Date)
+    precio = func.coalesce(T.c.precio_aplicado, 0)
+    estado = T.c.estado
+    sel = (
+        select(
+            dia.label("dia"),
+            T.c.emprendedor_id,
+            func.coalesce(T.c.servicio_id, literal(0)).label("servicio_id"),
+            func.sum(case((estado == models.EstadoTurno.pendiente, 1), else_=0)),
+            func.sum(case((estado == models.EstadoTurno.confirmado, 1), else_=0)),
+            func.sum(case((estado == models.EstadoTurno.cancelado, 1), else_=0)),
+            func.sum(case((estado == models.EstadoTurno.confirmado, precio), else_=0)),
+        )
+        # solo emprendedores existentes (sin FK reforzada quedan turnos huérfanos)
+        .select_from(T.join(E, E.c.id == T.c.emprendedor_id))
+        .group_by(dia, T.c.emprendedor_id, func.coalesce(T.c.servicio_id, literal(0)))
+    )
+    with engine.begin() as conn:
+        congelar_precios(conn)
+        conn.execute(delete(R))
+        conn.execute(
+            insert(R).from_select(
+                ["dia", "emprendedor_id", "servicio_id", "pendientes", "confirmados", "cancelados", "ingresos"],
+                sel,
+            )
+        )
+        return conn.execute(select(func.count()).select_from(R)).scalar() or 0
+
+
+def backfill_si_vacio(engine) -> None:
+    """
+    Al arrancar: fija precio_aplicado de los turnos anteriores al snapshot y,
+    si hay turnos pero el rollup está vacío (base vieja), lo construye.
+    """
+    with engine.begin() as conn:
+        congelar_precios(conn)
+    with engine.connect() as conn:
+        hay_rollup = conn.execute(select(R.c.dia).limit(1)).first()
+        hay_turnos = conn.execute(select(T.c.id).limit(1)).first()
+    if hay_turnos and not hay_rollup:
+        filas = reconstruir(engine)
+        print(f"[ROLLUP] Backfill turnos_daily_rollup: {filas} filas")
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    models.Base.metadata.create_all(bind=engine)
+    print(f"[ROLLUP] turnos_daily_rollup reconstruido: {reconstruir(engine)} filas")
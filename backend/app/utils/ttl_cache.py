@@ -0,0 +1,146 @@
+# app/utils/ttl_cache.py
+"""
+Cache en proceso clave -> valor, acotado (LRU) y con TTL.
+
+Pensado para resoluciones chicas y muy repetidas (usuario -> emprendedor,
+código público -> emprendedor, usuario autenticado). Guarda también resultados
+negativos (None), así que las escrituras que los cambian tienen que invalidar
+la clave.
+
+- grupo(clave): lo que se invalida junto (default: la clave misma). El cache de
+  auth guarda una entrada por (user_id, exp) e invalida por user_id.
+- Versión por grupo: un request que leyó la BD antes de una invalidación no
+  puede guardar el valor viejo.
+- invalidar_en_sesion(): invalida ya (flush) y de nuevo al commit de la sesión,
+  porque entre ambos otro request puede leer la fila vieja.
+- Con varios workers cada proceso tiene su cache: lo escrito en otro proceso se
+  ve, como mucho, TTL segundos después.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+FALTA = object()  # distinto de None (None es un valor cacheable: "no existe")
+
+
+class CacheTTL:
+    def __init__(self, ttl_s: float, max_entradas: int, activo: bool = True, ttl_negativo_s: Optional[float] = None,
+                 grupo: Optional[Callable[[Hashable], Hashable]] = None):
+        self.ttl_s = ttl_s
+        self.ttl_negativo_s = ttl_s if ttl_negativo_s is None else ttl_negativo_s
+        self.max_entradas = max_entradas
+        self.activo = activo
+        self._grupo = grupo
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._por_grupo: Dict[Hashable, set] = {}
+        self._version: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.hits_negativos = 0
+        self.misses = 0
+        self.invalidaciones = 0
+        self.evictions = 0
+
+    def version(self, grupo: Hashable) -> int:
+        with self._lock:
+            return self._version.get(grupo, 0)
+
+    def obtener(self, clave: Hashable) -> Any:
+        """Valor cacheado (puede ser None) o FALTA."""
+        if not self.activo:
+            return FALTA
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    self._quitar(clave)
+                self.misses += 1
+                return FALTA
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            if entrada[1] is None:
+                self.hits_negativos += 1
+            return entrada[1]
+
+    def guardar(self, clave: Hashable, valor: Any, version: int) -> None:
+        if not self.activo:
+            return
+        ttl = self.ttl_negativo_s if valor is None else self.ttl_s
+        grupo = self._de(clave)
+        with self._lock:
+            if self._version.get(grupo, 0) != version:
+                return
+            self._entradas[clave] = (time.monotonic() + ttl, valor)
+            self._entradas.move_to_end(clave)
+            if self._grupo is not None:
+                self._por_grupo.setdefault(grupo, set()).add(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._quitar(next(iter(self._entradas)))
+                self.evictions += 1
+
+    def invalidar(self, grupo: Hashable) -> None:
+        with self._lock:
+            self._version[grupo] = self._version.get(grupo, 0) + 1
+            self.invalidaciones += 1
+            claves = self._por_grupo.get(grupo, ()) if self._grupo is not None else (grupo,)
+            for clave in list(claves):
+                self._quitar(clave)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            for grupo in {self._de(clave) for clave in self._entradas}:
+                self._version[grupo] = self._version.get(grupo, 0) + 1
+            self._entradas.clear()
+            self._por_grupo.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "activo": self.activo,
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "ttl_s": self.ttl_s,
+                "ttl_negativo_s": self.ttl_negativo_s,
+                "hits": self.hits,
+                "hits_negativos": self.hits_negativos,
+                "misses": self.misses,
+                "invalidaciones": self.invalidaciones,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def _de(self, clave: Hashable) -> Hashable:
+        return clave if self._grupo is None else self._grupo(clave)
+
+    def _quitar(self, clave: Hashable) -> None:
+        self._entradas.pop(clave, None)
+        if self._grupo is None:
+            return
+        grupo = self._grupo(clave)
+        claves = self._por_grupo.get(grupo)
+        if claves is not None:
+            claves.discard(clave)
+            if not claves:
+                del self._por_grupo[grupo]
+
+
+def invalidar_en_sesion(cache: CacheTTL, grupo: Hashable, sesion: Optional[Session]) -> None:
+    cache.invalidar(grupo)
+    if sesion is not None:
+        sesion.info.setdefault("ttl_cache_pendientes", set()).add((cache, grupo))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_al_commit(sesion):
+    for cache, grupo in sesion.info.pop("ttl_cache_pendientes", ()):
+        cache.invalidar(grupo)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar(sesion):
+    sesion.info.pop("ttl_cache_pendientes", None)
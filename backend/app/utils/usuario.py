@@ -0,0 +1,96 @@
+# app/utils/usuario.py
+"""
+Camino único de login (/usuarios/login y /auth/login).
+
+- El usuario se resuelve con una sola consulta: OR sobre email y username
+  normalizados (LOWER(TRIM(...)), con índice: ix_usuario_email_norm /
+  ix_usuario_username_norm), con el emprendedor_id en el mismo SELECT para
+  los claims de AUTH_STATELESS_CLAIMS.
+- Si el usuario no existe se hace igual una verificación bcrypt ficticia, así
+  el tiempo de respuesta no revela qué emails/usuarios están registrados.
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.security import dummy_verify_async, verify_and_update_async
+
+U = models.Usuario
+E = models.Emprendedor
+
+_EMAIL_NORM = func.lower(func.trim(U.email))
+_USERNAME_NORM = func.lower(func.trim(U.username))
+
+
+def normalizar_identificador(valor: Optional[str]) -> Optional[str]:
+    v = str(valor or "").strip().lower()
+    return v or None
+
+
+def buscar_para_login(
+    db: Session, email: Optional[str], username: Optional[str]
+) -> Optional[Tuple[models.Usuario, Optional[int]]]:
+    """(usuario, emprendedor_id | None). Si email y username apuntan a usuarios distintos gana el email."""
+    e = normalizar_identificador(email)
+    u = normalizar_identificador(username)
+    condiciones = []
+    if e:
+        condiciones.append(_EMAIL_NORM == e)
+    if u:
+        condiciones.append(_USERNAME_NORM == u)
+    if not condiciones:
+        return None
+
+    stmt = (
+        select(U, E.id)
+        .outerjoin(E, E.usuario_id == U.id)
+        .where(or_(*condiciones))
+        .order_by(case((_EMAIL_NORM == e, 0), else_=1) if e else U.id, U.id)
+        .limit(1)
+    )
+    fila = db.execute(stmt).first()
+    return (fila[0], fila[1]) if fila else None
+
+
+def _buscar_y_soltar(
+    db: Session, email: Optional[str], username: Optional[str]
+) -> Optional[Tuple[models.Usuario, Optional[int]]]:
+    fila = buscar_para_login(db, email, username)
+    # solo lectura: se cierra la transacción para no retener la conexión del pool
+    # mientras se espera a bcrypt (la fila se conserva: expire_on_commit=False)
+    db.commit()
+    return fila
+
+
+def _guardar_hash(db: Session, user: models.Usuario, nuevo_hash: str) -> None:
+    # BCRYPT_ROUNDS cambió: se guarda el hash con el costo nuevo (si falla, el login sigue)
+    try:
+        user.password_hash = nuevo_hash
+        db.commit()
+    except Exception:
+        db.rollback()
+
+
+async def autenticar(
+    db: Session, email: Optional[str], username: Optional[str], password: str
+) -> Optional[Tuple[models.Usuario, Optional[int]]]:
+    """
+    (usuario, emprendedor_id) si las credenciales son válidas; None si no
+    (usuario inexistente o contraseña incorrecta, sin distinguir).
+    La BD va al threadpool y bcrypt al pool dedicado (app.utils.hash_pool).
+    """
+    fila = await run_in_threadpool(_buscar_y_soltar, db, email, username)
+    stored = fila[0].password_hash if fila else None
+    if not stored:
+        await dummy_verify_async()
+        return None
+
+    ok, nuevo_hash = await verify_and_update_async(password, stored)
+    if not ok:
+        return None
+    if nuevo_hash:
+        await run_in_threadpool(_guardar_hash, db, fila[0], nuevo_hash)
+    return fila
@@ -0,0 +1,97 @@
+# app/utils/versiones.py
+"""
+Versión de cambios por emprendedor (tabla emprendedor_versiones).
+
+Cada flush que escribe Emprendedor, Servicio, Horario o Turno por el ORM
+incrementa, en la misma transacción, la versión de los emprendedores
+afectados (una vez por emprendedor y flush). Es la base de los ETag /
+Last-Modified de las rutas públicas: validar una visita repetida cuesta una
+lectura por PK, sin tocar Turno.
+
+Las escrituras que no pasan por el ORM (INSERT/UPDATE por Core) tienen que
+llamar a tocar(conn, emprendedor_id) ellas mismas.
+"""
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+
+V = models.EmprendedorVersion.__table__
+
+_PENDIENTES = "versiones_pendientes"
+
+
+def tocar(conn, emprendedor_id: int) -> None:
+    """version += 1 y actualizado_en = ahora (crea la fila si no existe)."""
+    ahora = datetime.now(timezone.utc)
+    if conn.dialect.name in ("sqlite", "postgresql"):
+        if conn.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        stmt = upsert(V).values(emprendedor_id=emprendedor_id, version=1, actualizado_en=ahora)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[V.c.emprendedor_id],
+            set_={"version": V.c.version + 1, "actualizado_en": ahora},
+        )
+        conn.execute(stmt)
+        return
+
+    res = conn.execute(
+        update(V)
+        .where(V.c.emprendedor_id == emprendedor_id)
+        .values(version=V.c.version + 1, actualizado_en=ahora)
+    )
+    if not res.rowcount:
+        conn.execute(insert(V).values(emprendedor_id=emprendedor_id, version=1, actualizado_en=ahora))
+
+
+def version_de(db: Session, emprendedor_id: int) -> Tuple[int, Optional[datetime]]:
+    """(version, actualizado_en en UTC). (0, None) si nunca se escribió nada."""
+    fila = db.execute(
+        select(V.c.version, V.c.actualizado_en).where(V.c.emprendedor_id == emprendedor_id)
+    ).first()
+    if not fila:
+        return 0, None
+    cuando = fila.actualizado_en
+    if cuando is not None and cuando.tzinfo is None:
+        cuando = cuando.replace(tzinfo=timezone.utc)  # SQLite devuelve naive
+    return int(fila.version), cuando
+
+
+# ---- eventos -------------------------------------------------------------------
+def _marcar(target, *emprendedor_ids) -> None:
+    sesion = inspect(target).session
+    if sesion is None:
+        return
+    pendientes = sesion.info.setdefault(_PENDIENTES, set())
+    pendientes.update(e for e in emprendedor_ids if e)
+
+
+def _hijo_cambio(mapper, conn, target):
+    # Servicio / Horario / Turno: emprendedor actual y, si se movió, el anterior
+    _marcar(target, target.emprendedor_id, *inspect(target).attrs.emprendedor_id.history.deleted)
+
+
+def _emprendedor_cambio(mapper, conn, target):
+    _marcar(target, target.id)
+
+
+for _modelo in (models.Servicio, models.Horario, models.Turno):
+    for _evento in ("after_insert", "after_update", "after_delete"):
+        event.listen(_modelo, _evento, _hijo_cambio)
+for _evento in ("after_insert", "after_update"):
+    event.listen(models.Emprendedor, _evento, _emprendedor_cambio)
+
+
+@event.listens_for(Session, "after_flush")
+def _aplicar(sesion, contexto):
+    pendientes = sesion.info.pop(_PENDIENTES, None)
+    if not pendientes:
+        return
+    conn = sesion.connection()
+    for emprendedor_id in sorted(pendientes):
+        tocar(conn, emprendedor_id)
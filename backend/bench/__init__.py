@@ -0,0 +1,9 @@
+# backend/bench/__init__.py
+"""
+Benchmarks y pruebas de carga (no son tests: no los corre pytest).
+
+Cada script arma su propia base SQLite temporal salvo que venga DATABASE_URL.
+Correr desde backend/ como módulo, por ejemplo:
+
+    python -m bench.bench_bulk --turnos 500
+"""
@@ -0,0 +1,146 @@
+# backend/bench/bench_admin_lite.py
+"""
+Benchmark de /admin-lite: implementación vieja (sqlite3.connect por request,
+6 COUNT secuenciales) vs la actual (engine compartido, una consulta sobre
+turnos_daily_rollup).
+
+Uso:
+    python -m bench.bench_admin_lite [--turnos 1000000] [--repeticiones 20]
+
+Por defecto siembra una base SQLite temporal. Con DATABASE_URL apuntando a
+Postgres mide solo la versión actual (la vieja era SQLite-only).
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app import models  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+from app.routers import admin_lite  # noqa: E402
+from app.utils import rollup  # noqa: E402
+
+LOTE = 20000
+
+
+def _seed(n_turnos: int, n_emprs: int = 200, servs_por_emp: int = 5):
+    print(f"Sembrando {n_turnos:,} turnos...")
+    rnd = random.Random(42)
+    with engine.begin() as cn:
+        cn.execute(insert(models.Usuario.__table__), [
+            {"id": i, "username": f"bench_{i}", "password_hash": "", "rol": "emprendedor", "suscripcion_activa": False}
+            for i in range(1, n_emprs + 1)
+        ])
+        cn.execute(insert(models.Emprendedor.__table__), [
+            {"id": i, "usuario_id": i, "nombre": f"Emp {i}", "codigo_cliente": f"B{i:07d}", "activo": True, "capacidad": 1}
+            for i in range(1, n_emprs + 1)
+        ])
+        cn.execute(insert(models.Servicio.__table__), [
+            {"id": (e - 1) * servs_por_emp + k + 1, "emprendedor_id": e, "nombre": f"Serv {k}",
+             "duracion_min": 30, "precio": rnd.randint(1000, 20000) * 100, "activo": True}
+            for e in range(1, n_emprs + 1) for k in range(servs_por_emp)
+        ])
+
+    base = datetime.now() - timedelta(days=730)
+    estados = [models.EstadoTurno.confirmado] * 7 + [models.EstadoTurno.pendiente, models.EstadoTurno.cancelado]
+    hechos = 0
+    while hechos < n_turnos:
+        filas = []
+        for _ in range(min(LOTE, n_turnos - hechos)):
+            e = rnd.randint(1, n_emprs)
+            ini = base + timedelta(minutes=30 * rnd.randint(0, 730 * 48))
+            filas.append({
+                "emprendedor_id": e,
+                "servicio_id": (e - 1) * servs_por_emp + rnd.randint(1, servs_por_emp),
+                "inicio": ini,
+                "fin": ini + timedelta(minutes=30),
+                "estado": rnd.choice(estados),
+                "precio_aplicado": None if rnd.random() < 0.5 else rnd.randint(1000, 20000) * 100,
+                "carril": 0,
+            })
+        with engine.begin() as cn:
+            cn.execute(insert(models.Turno.__table__), filas)
+        hechos += len(filas)
+
+
+def _kpis_viejo(db_path: str, d: str, h: str) -> dict:
+    """Copia de la implementación anterior (sqlite3 crudo, una conexión por request)."""
+    with sqlite3.connect(db_path, check_same_thread=False) as cn:
+        c = cn.cursor()
+        out = {
+            "usuarios_total": c.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0],
+            "emprendedores_total": c.execute("SELECT COUNT(*) FROM emprendedores").fetchone()[0],
+            "servicios_total": c.execute("SELECT COUNT(*) FROM servicios").fetchone()[0],
+            "turnos_total": c.execute("SELECT COUNT(*) FROM turnos").fetchone()[0],
+            "turnos": c.execute("SELECT COUNT(*) FROM turnos WHERE inicio BETWEEN ? AND ?", (d, h)).fetchone()[0],
+            "cancelados": c.execute(
+                "SELECT COUNT(*) FROM turnos WHERE estado='cancelado' AND inicio BETWEEN ? AND ?", (d, h)
+            ).fetchone()[0],
+            "ingresos": c.execute("""
+                SELECT COALESCE(SUM(COALESCE(t.precio_aplicado, s.precio)), 0)
+                FROM turnos t LEFT JOIN servicios s ON s.id = t.servicio_id
+                WHERE t.estado='confirmado' AND t.inicio BETWEEN ? AND ?
+            """, (d, h)).fetchone()[0],
+        }
+    return out
+
+
+def _medir(nombre: str, fn, repeticiones: int):
+    fn()  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    tiempos.sort()
+    p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+    print(f"  {nombre:<32} mediana={statistics.median(tiempos):8.1f}ms  p95={p95:8.1f}ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turnos", type=int, default=1_000_000)
+    ap.add_argument("--repeticiones", type=int, default=20)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    with engine.connect() as cn:
+        existentes = cn.execute(models.Turno.__table__.select().limit(1)).first()
+    if not existentes:
+        _seed(args.turnos)
+        # la siembra va por Core (sin eventos ORM): armamos el rollup con el backfill
+        t0 = time.perf_counter()
+        filas = rollup.reconstruir(engine)
+        print(f"Backfill turnos_daily_rollup: {filas:,} filas en {time.perf_counter() - t0:.1f}s")
+
+    ahora = datetime.now()
+    d = (ahora - timedelta(days=30)).replace(microsecond=0)
+    h = ahora.replace(microsecond=0)
+    d_iso, h_iso = d.isoformat(), h.isoformat()
+
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}  rango: {d_iso} .. {h_iso}")
+    if engine.dialect.name == "sqlite":
+        db_path = engine.url.database
+        # el formato de bind del código viejo (ISO con 'T') no coincide con el guardado
+        # por SQLAlchemy (espacio); para comparar el mismo trabajo usamos el formato guardado
+        d_old, h_old = str(d), str(h)
+        _medir("kpis (antes: sqlite3 x7)", lambda: _kpis_viejo(db_path, d_old, h_old), args.repeticiones)
+    _medir("kpis (ahora: rollup)", lambda: admin_lite.kpis(d_iso, h_iso), args.repeticiones)
+    _medir("servicios-agg", lambda: admin_lite.servicios_agg(d_iso, h_iso), args.repeticiones)
+    _medir("turnos (limit 50)", lambda: admin_lite.turnos_list(d_iso, h_iso, 50), args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# backend/bench/bench_auth.py
+"""
+Costo por request del pipeline de autenticación (app.deps), por etapa:
+
+  1. extracción del token (header / cookie / header 'token')
+  2. verificación de firma (una vez por request)
+  3. carga del usuario: db.get vs cache en proceso (merge sin SELECT)
+  4. emprendedor_id: consulta vs claim firmado (AUTH_STATELESS_CLAIMS)
+  5. pipeline completo (get_current_user), sin cache y con cache
+
+Uso:
+    python -m bench.bench_auth [--iteraciones 5000]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from starlette.requests import Request  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app import deps, models  # noqa: E402
+from app.security import create_access_token, decode_access_token  # noqa: E402
+from app.utils.auth_cache import cache_usuarios  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+
+
+def _seed() -> tuple[int, int]:
+    db = SessionLocal()
+    try:
+        u = models.Usuario(username="bench_auth", rol="emprendedor")
+        db.add(u)
+        db.flush()
+        e = models.Emprendedor(usuario_id=u.id, nombre="Bench", codigo_cliente="BAUTH001")
+        db.add(e)
+        db.commit()
+        return u.id, e.id
+    finally:
+        db.close()
+
+
+def _request(token: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+
+def _medir(nombre: str, fn, iteraciones: int):
+    for _ in range(min(100, iteraciones)):  # calentamiento
+        fn()
+    tiempos = []
+    for _ in range(iteraciones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1_000_000)
+    tiempos.sort()
+    p99 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.99))]
+    print(f"  {nombre:<36} mediana={statistics.median(tiempos):8.1f}µs  p99={p99:8.1f}µs")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iteraciones", type=int, default=5000)
+    args = ap.parse_args()
+    n = args.iteraciones
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    user_id, emp_id = _seed()
+    token = create_access_token({"sub": str(user_id)})
+    token_claims = create_access_token({"sub": str(user_id), "rol": "emprendedor", "emp": emp_id})
+    req = _request(token)
+    ctx = deps.contexto_auth(_request(token), None)
+    ctx_claims = deps.contexto_auth(_request(token_claims), None)
+
+    def con_sesion(fn):
+        def _run():
+            db = SessionLocal()
+            try:
+                return fn(db)
+            finally:
+                db.close()
+        return _run
+
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    _medir("1. extracción del token", lambda: deps._extract_token_from_request(req), n)
+    _medir("2. verificación de firma", lambda: decode_access_token(token), n)
+
+    cache_usuarios.activo = False
+    _medir("3a. usuario: db.get", con_sesion(lambda db: deps.usuario_de_contexto(db, ctx)), n)
+    cache_usuarios.activo = True
+    cache_usuarios.limpiar()
+    _medir("3b. usuario: cache", con_sesion(lambda db: deps.usuario_de_contexto(db, ctx)), n)
+
+    settings.AUTH_STATELESS_CLAIMS = False
+    _medir("4a. emprendedor_id: consulta", con_sesion(lambda db: deps.get_emprendedor_id(ctx, db)), n)
+    settings.AUTH_STATELESS_CLAIMS = True
+    _medir("4b. emprendedor_id: claim", con_sesion(lambda db: deps.get_emprendedor_id(ctx_claims, db)), n)
+    settings.AUTH_STATELESS_CLAIMS = False
+
+    def completo(db):
+        return deps.get_current_user(deps.contexto_auth(_request(token), None), db)
+
+    cache_usuarios.activo = False
+    _medir("5a. completo sin cache", con_sesion(completo), n)
+    cache_usuarios.activo = True
+    _medir("5b. completo con cache", con_sesion(completo), n)
+    print(f"cache: {cache_usuarios.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# backend/bench/bench_bulk.py
+"""
+Alta de N turnos de una agenda (default: 1 por hora hábil durante ~2 meses)
+con 1/4 de los horarios ya ocupados.
+
+  - antes: N llamadas a crear_turno_compat (consulta de solape + INSERT +
+    commit por turno; los ocupados terminan en 409);
+  - ahora: una llamada a crear_turnos_bulk (una consulta de rango, barrido en
+    memoria, INSERT multi-fila y un solo commit; los ocupados vuelven como
+    conflictos).
+
+Uso:
+    python -m bench.bench_bulk [--turnos 500]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.routers import turnos  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+
+
+def _seed(ocupados) -> models.Usuario:
+    db = SessionLocal()
+    try:
+        u = models.Usuario(username="bench", email="bench@example.com", password_hash="x", rol="emprendedor")
+        db.add(u)
+        db.flush()
+        e = models.Emprendedor(usuario_id=u.id, nombre="Bench", codigo_cliente="BENCH001", capacidad=1)
+        db.add(e)
+        db.flush()
+        for ini in ocupados:
+            db.add(models.Turno(emprendedor_id=e.id, inicio=ini, fin=ini + timedelta(minutes=30)))
+        db.commit()
+        db.refresh(u)
+        db.expunge(u)
+        return u
+    finally:
+        db.close()
+
+
+def _horarios(n: int, desde: datetime):
+    out, d = [], desde
+    while len(out) < n:
+        if d.weekday() < 5:
+            out.extend(d.replace(hour=h) for h in range(9, 19))
+        d += timedelta(days=1)
+    return out[:n]
+
+
+def _limpiar(emp_id: int, desde: datetime, cliente_id: int):
+    # compat reserva a nombre del usuario (cliente_id); los ocupados del seed no tienen cliente
+    with engine.begin() as cn:
+        cn.execute(models.Turno.__table__.delete().where(
+            models.Turno.__table__.c.emprendedor_id == emp_id,
+            models.Turno.__table__.c.inicio >= desde,
+            models.Turno.__table__.c.cliente_id == cliente_id,
+        ))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turnos", type=int, default=500)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    desde = datetime(2030, 1, 7, 0, 0)
+    horarios = _horarios(args.turnos, desde)
+    user = _seed(horarios[::4])
+    db = SessionLocal()
+    emp_id = db.query(models.Emprendedor.id).filter(models.Emprendedor.usuario_id == user.id).scalar()
+    db.close()
+    print(f"turnos pedidos: {len(horarios)}  ya ocupados: {len(horarios[::4])}")
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        creados = 0
+        for ini in horarios:
+            try:
+                turnos.crear_turno_compat(
+                    {"emprendedor_id": emp_id, "inicio": ini.isoformat(), "cliente_nombre": "bench"}, db, user,
+                )
+                creados += 1
+            except HTTPException:
+                db.rollback()
+        dt = time.perf_counter() - t0
+        print(f"  antes  {dt * 1000:10,.1f} ms  creados={creados}")
+    finally:
+        db.close()
+
+    _limpiar(emp_id, desde, user.id)
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        res = turnos.crear_turnos_bulk(
+            {"turnos": [{"inicio": ini.isoformat()} for ini in horarios], "cliente_nombre": "bench"}, db, user,
+        )
+        dt = time.perf_counter() - t0
+        print(f"  ahora  {dt * 1000:10,.1f} ms  creados={len(res.creados)} conflictos={len(res.conflictos)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
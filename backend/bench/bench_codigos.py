@@ -0,0 +1,98 @@
+# backend/bench/bench_codigos.py
+"""
+Throughput de altas de emprendedor (código público incluido) con la tabla
+ya poblada (default: 1M emprendedores).
+
+  - antes: random.choices + un SELECT por intento hasta encontrar un código
+    libre, después INSERT + commit (como el viejo generate_unique_cliente_code);
+  - ahora: app.utils.codigos (secuencia reservada en bloques + permutación
+    con clave), INSERT + commit vía guardar_con_codigo, sin SELECT previo.
+
+Uso:
+    python -m bench.bench_codigos [--emprendedores 1000000] [--altas 2000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.utils import codigos  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+
+LOTE = 50000
+
+
+def _seed(n: int):
+    clave = codigos.asignador_codigos._clave
+    with engine.begin() as cn:
+        for inicio in range(0, n, LOTE):
+            cn.execute(insert(models.Emprendedor.__table__), [
+                {"usuario_id": i + 1, "nombre": f"Emp {i}", "activo": True, "capacidad": 1,
+                 "codigo_cliente": codigos.codificar(codigos.permutar(i, clave))}
+                for i in range(inicio, min(n, inicio + LOTE))
+            ])
+        cn.execute(insert(models.Secuencia.__table__).values(nombre=codigos.SECUENCIA, valor=n))
+
+
+def _antes(db, usuario_id: int) -> int:
+    sondeos = 0
+    while True:
+        code = "".join(random.choices(codigos.ALPHABET, k=codigos.LARGO))
+        sondeos += 1
+        if not db.query(models.Emprendedor.id).filter(models.Emprendedor.codigo_cliente == code).first():
+            break
+    db.add(models.Emprendedor(usuario_id=usuario_id, nombre="Alta", codigo_cliente=code))
+    db.commit()
+    return sondeos
+
+
+def _ahora(db, usuario_id: int) -> int:
+    def aplicar(code: str):
+        db.add(models.Emprendedor(usuario_id=usuario_id, nombre="Alta", codigo_cliente=code))
+    codigos.guardar_con_codigo(db, aplicar)
+    return 0
+
+
+def _medir(nombre: str, fn, primer_usuario: int, altas: int):
+    db = SessionLocal()
+    try:
+        sondeos = 0
+        t0 = time.perf_counter()
+        for i in range(altas):
+            sondeos += fn(db, primer_usuario + i)
+        dt = time.perf_counter() - t0
+    finally:
+        db.close()
+    extra = f"  SELECTs/alta={sondeos / altas:.3f}" if sondeos else ""
+    print(f"  {nombre:<10} {altas / dt:10,.0f} altas/s{extra}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--emprendedores", type=int, default=1_000_000)
+    ap.add_argument("--altas", type=int, default=2000)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    t0 = time.perf_counter()
+    _seed(args.emprendedores)
+    print(f"emprendedores: {args.emprendedores:,} (seed {time.perf_counter() - t0:.1f}s)  "
+          f"bloque: {codigos.asignador_codigos.bloque}")
+
+    base = args.emprendedores + 1
+    _medir("antes", _antes, base, args.altas)
+    _medir("ahora", _ahora, base + args.altas, args.altas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backend/bench/bench_escrituras.py
+"""
+Escrituras por segundo (y sentencias SQL por escritura) del camino típico
+"crear + responder": alta de Servicio y de Horario, serializadas con su
+schema de salida como lo haría el endpoint.
+
+  - antes: sesión con expire_on_commit=True, add + commit + db.refresh();
+  - ahora: SessionLocal (expire_on_commit=False) + app.database.guardar():
+    el INSERT ... RETURNING trae id y created_at, sin SELECT posterior.
+
+Uso:
+    python -m bench.bench_escrituras [--escrituras 3000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import time as hora
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import SessionLocal, engine, guardar  # noqa: E402
+from app import models  # noqa: E402
+from app.schemas import HorarioOut, ServicioOut  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+
+SesionAntes = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=True, bind=engine)
+
+_sentencias = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _contar(conn, cursor, statement, parameters, context, executemany):
+    global _sentencias
+    _sentencias += 1
+
+
+def _seed() -> int:
+    with engine.begin() as cn:
+        uid = cn.execute(insert(models.Usuario.__table__).values(
+            username="bench", email="bench@example.com", password_hash="x", rol="emprendedor",
+            suscripcion_activa=False)).inserted_primary_key[0]
+        return cn.execute(insert(models.Emprendedor.__table__).values(
+            usuario_id=uid, nombre="Bench", codigo_cliente="BENCH001", activo=True, capacidad=1,
+        )).inserted_primary_key[0]
+
+
+def _servicio(emp_id: int, i: int, sufijo: str):
+    return models.Servicio(emprendedor_id=emp_id, nombre=f"Servicio {sufijo}{i}", duracion_min=30, precio=1000)
+
+
+def _horario(emp_id: int, i: int, sufijo: str):
+    # 'hasta' distinto por corrida: no choca con uq_horario_bloque
+    return models.Horario(emprendedor_id=emp_id, dia_semana=i % 7, desde=hora(i // 7 % 24, i // 168 % 60),
+                          hasta=hora(23, 59 if sufijo == "a" else 58))
+
+
+def _antes(fabrica, schema):
+    def fn(db, emp_id, i):
+        obj = fabrica(emp_id, i, "a")
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+        return schema.model_validate(obj)
+    return fn
+
+
+def _ahora(fabrica, schema):
+    def fn(db, emp_id, i):
+        return schema.model_validate(guardar(db, fabrica(emp_id, i, "b")))
+    return fn
+
+
+def _medir(nombre: str, fabrica_sesion, fn, emp_id: int, n: int):
+    global _sentencias
+    db = fabrica_sesion()
+    try:
+        _sentencias = 0
+        t0 = time.perf_counter()
+        for i in range(n):
+            fn(db, emp_id, i)
+        dt = time.perf_counter() - t0
+    finally:
+        db.close()
+    print(f"  {nombre:<16} {n / dt:10,.0f} escrituras/s  sentencias/escritura={_sentencias / n:.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--escrituras", type=int, default=3000)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    emp_id = _seed()
+    print(f"escrituras: {args.escrituras:,}  RETURNING: {engine.dialect.insert_returning}")
+
+    for nombre, fabrica, schema in (("servicio", _servicio, ServicioOut), ("horario", _horario, HorarioOut)):
+        _medir(f"{nombre} antes", SesionAntes, _antes(fabrica, schema), emp_id, args.escrituras)
+        _medir(f"{nombre} ahora", SessionLocal, _ahora(fabrica, schema), emp_id, args.escrituras)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# backend/bench/bench_horarios.py
+"""
+Escrituras de horarios por segundo (PUT y DELETE de /horarios/{id}).
+
+  - antes: SELECT por id, setattr / delete, commit (+ versión por evento ORM)
+    y refresh (otro SELECT) para la respuesta;
+  - ahora: app.crud.horarios: un UPDATE / DELETE acotado al dueño con
+    RETURNING, versión y commit.
+
+Uso:
+    python -m bench.bench_horarios [--horarios 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import time as hora
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.crud import horarios as crud  # noqa: E402
+from app.schemas import HorarioUpdate  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+
+
+def _seed(n: int) -> tuple:
+    with engine.begin() as cn:
+        uid = cn.execute(insert(models.Usuario.__table__).values(
+            username="bench", email="bench@example.com", password_hash="x", rol="emprendedor",
+            suscripcion_activa=False)).inserted_primary_key[0]
+        emp_id = cn.execute(insert(models.Emprendedor.__table__).values(
+            usuario_id=uid, nombre="Bench", codigo_cliente="BENCH001", activo=True, capacidad=1,
+        )).inserted_primary_key[0]
+        cn.execute(insert(models.Horario.__table__), [
+            {"emprendedor_id": emp_id, "dia_semana": i % 7, "desde": hora(i // 7 % 24, i // 168 % 60),
+             "hasta": hora(i // 7 % 24, 59), "activo": True}
+            for i in range(n)
+        ])
+        ids = [r[0] for r in cn.execute(models.Horario.__table__.select().with_only_columns(models.Horario.__table__.c.id))]
+    return emp_id, ids
+
+
+def _update_antes(db, emp_id, hid, payload):
+    h = db.query(models.Horario).filter(models.Horario.id == hid).first()
+    for k, v in payload.model_dump(exclude_unset=True).items():
+        setattr(h, k, v)
+    db.commit()
+    db.refresh(h)
+    return h
+
+
+def _delete_antes(db, emp_id, hid):
+    h = db.query(models.Horario).filter(models.Horario.id == hid).first()
+    db.delete(h)
+    db.commit()
+
+
+def _medir(nombre: str, fn, ids):
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        for hid in ids:
+            fn(db, hid)
+        dt = time.perf_counter() - t0
+    finally:
+        db.close()
+    print(f"  {nombre:<18} {len(ids) / dt:10,.0f} escrituras/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--horarios", type=int, default=2000)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    emp_id, ids = _seed(args.horarios)
+    mitad = len(ids) // 2
+    a, b = ids[:mitad], ids[mitad:]
+    print(f"horarios: {len(ids):,}")
+
+    _medir("PUT antes", lambda db, h: _update_antes(db, emp_id, h, HorarioUpdate(activo=False)), a)
+    _medir("PUT ahora", lambda db, h: crud.update_horario(db, emp_id, h, HorarioUpdate(activo=False)), b)
+    _medir("DELETE antes", lambda db, h: _delete_antes(db, emp_id, h), a)
+    _medir("DELETE ahora", lambda db, h: crud.delete_horario(db, emp_id, h), b)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# backend/bench/bench_listados.py
+"""
+Micro-benchmark de serialización de listados de turnos (filas/seg).
+
+Compara, para una página de N turnos:
+  - antes: instancias ORM de Turno validadas contra TurnoOut (from_attributes)
+    y serializadas como lo hace FastAPI con response_model;
+  - ahora: consulta proyectada a las columnas de TurnoOut + TypeAdapter en bloque
+    (app.routers.turnos._turnos_json).
+
+Verifica que ambas salidas sean iguales.
+
+Uso:
+    python -m bench.bench_listados [--filas 10000] [--repeticiones 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.schemas import TurnoOut  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+from app.routers import turnos  # noqa: E402
+
+EMP_ID = 1
+
+
+def _seed(n: int):
+    with engine.begin() as cn:
+        cn.execute(insert(models.Usuario.__table__), [
+            {"id": 1, "username": "bench_emp", "password_hash": "", "rol": "emprendedor", "suscripcion_activa": False},
+        ])
+        cn.execute(insert(models.Emprendedor.__table__), [
+            {"id": EMP_ID, "usuario_id": 1, "nombre": "Bench", "codigo_cliente": "BENCH001", "activo": True, "capacidad": 1},
+        ])
+        base = datetime(2026, 1, 1, 8, 0)
+        estados = [models.EstadoTurno.confirmado, models.EstadoTurno.pendiente, models.EstadoTurno.cancelado]
+        cn.execute(insert(models.Turno.__table__), [
+            {
+                "emprendedor_id": EMP_ID,
+                "inicio": base + timedelta(minutes=30 * i),
+                "fin": base + timedelta(minutes=30 * i + 30),
+                "estado": estados[i % 3],
+                "cliente_nombre": f"Cliente {i}",
+                "cliente_contacto": f"+54 9 11 {i:08d}",
+                "precio_aplicado": 150000 if i % 2 else None,
+                "carril": 0,
+            }
+            for i in range(n)
+        ])
+
+
+def _antes(limit: int) -> bytes:
+    db = SessionLocal()
+    try:
+        filas = (
+            db.query(models.Turno)
+            .filter(models.Turno.emprendedor_id == EMP_ID)
+            .order_by(models.Turno.inicio.asc(), models.Turno.id.asc())
+            .limit(limit)
+            .all()
+        )
+        # response_model: validar cada instancia y pasar a tipos JSON
+        datos = [TurnoOut.model_validate(t).model_dump(mode="json") for t in filas]
+        return json.dumps(datos, separators=(",", ":")).encode()
+    finally:
+        db.close()
+
+
+def _ahora(limit: int) -> bytes:
+    db = SessionLocal()
+    try:
+        cuerpo, _ = turnos._turnos_json(
+            db, limit=limit, desde=None, hasta=None, cursor=None, emprendedor_id=EMP_ID
+        )
+        return cuerpo
+    finally:
+        db.close()
+
+
+def _medir(nombre: str, fn, filas: int, repeticiones: int):
+    fn()  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - t0)
+    med = statistics.median(tiempos)
+    print(f"  {nombre:<28} mediana={med * 1000:8.1f}ms  {filas / med:12,.0f} filas/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--filas", type=int, default=10_000)
+    ap.add_argument("--repeticiones", type=int, default=20)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    with engine.connect() as cn:
+        existentes = cn.execute(models.Turno.__table__.select().limit(1)).first()
+    if not existentes:
+        _seed(args.filas)
+
+    assert json.loads(_antes(args.filas)) == json.loads(_ahora(args.filas)), "las salidas difieren"
+
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}  filas por respuesta: {args.filas:,}")
+    _medir("antes (ORM + from_attributes)", lambda: _antes(args.filas), args.filas, args.repeticiones)
+    _medir("ahora (proyección + adapter)", lambda: _ahora(args.filas), args.filas, args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# backend/bench/bench_login.py
+"""
+Throughput de login.
+
+  1. búsqueda del usuario (consultas/seg):
+     - antes: email y después username, una consulta cada una, más la de
+       Emprendedor.id para los claims;
+     - ahora: app.utils.usuario.buscar_para_login (un solo SELECT con OR
+       sobre las columnas normalizadas e indexadas + join al emprendedor).
+  2. login completo (logins/seg) con N logins concurrentes sobre el endpoint
+     async, incluido bcrypt en el pool dedicado, para usuarios existentes y
+     para usuarios inexistentes (verificación ficticia: tiempos parecidos).
+
+Uso:
+    BCRYPT_ROUNDS=10 python -m bench.bench_login [--usuarios 20000] [--busquedas 5000] [--logins 60]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.routers import usuarios  # noqa: E402
+from app.security import get_password_hash  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+from app.utils.usuario import buscar_para_login  # noqa: E402
+
+PASSWORD = "bench-login-123"
+
+
+def _seed(n: int):
+    h = get_password_hash(PASSWORD)
+    with engine.begin() as cn:
+        cn.execute(insert(models.Usuario.__table__), [
+            {"username": f"Usuario{i}", "email": f"Usuario{i}@Example.com", "password_hash": h,
+             "rol": "cliente", "suscripcion_activa": False}
+            for i in range(n)
+        ])
+
+
+def _buscar_antes(db, email, username):
+    U = models.Usuario
+    u = db.query(U).filter(U.email == email).first() if email else None
+    if not u and username:
+        u = db.query(U).filter(U.username == username).first()
+    if u:
+        db.query(models.Emprendedor.id).filter(models.Emprendedor.usuario_id == u.id).scalar()
+    return u
+
+
+def _por_seg(nombre: str, fn, iteraciones: int):
+    t0 = time.perf_counter()
+    for _ in range(iteraciones):
+        fn()
+    dt = time.perf_counter() - t0
+    print(f"  {nombre:<44} {iteraciones / dt:10,.0f}/s")
+
+
+async def _logins(n: int, ids, existentes: bool) -> list:
+    async def uno(i: int):
+        db = SessionLocal()
+        t0 = time.perf_counter()
+        try:
+            email = f"usuario{i}@example.com" if existentes else f"nadie{i}@example.com"
+            await usuarios.login({"email": email, "password": PASSWORD}, db)
+        except HTTPException:
+            pass
+        finally:
+            db.close()
+        return time.perf_counter() - t0
+
+    return await asyncio.gather(*(uno(i) for i in ids[:n]))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--usuarios", type=int, default=20000)
+    ap.add_argument("--busquedas", type=int, default=5000)
+    ap.add_argument("--logins", type=int, default=60)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    _seed(args.usuarios)
+    rnd = random.Random(1)
+    ids = [rnd.randrange(args.usuarios) for _ in range(max(args.busquedas, args.logins))]
+    it = iter(ids * 2)
+
+    print(f"usuarios: {args.usuarios:,}  rondas bcrypt: {settings.BCRYPT_ROUNDS}")
+    print("búsqueda del usuario")
+    db = SessionLocal()
+    try:
+        # por username (el email no existe con ese formato): peor caso del camino viejo
+        _por_seg("antes (email, username, emprendedor)",
+                 lambda: _buscar_antes(db, None, f"Usuario{next(it)}") and db.expunge_all(), args.busquedas)
+        _por_seg("ahora (un SELECT normalizado)",
+                 lambda: buscar_para_login(db, None, f" usuario{next(it)} ") and db.expunge_all(), args.busquedas)
+    finally:
+        db.close()
+
+    print(f"login completo ({args.logins} concurrentes)")
+    for nombre, existentes in (("usuarios existentes", True), ("usuarios inexistentes", False)):
+        t0 = time.perf_counter()
+        lat = asyncio.run(_logins(args.logins, ids, existentes))
+        dt = time.perf_counter() - t0
+        ms = [x * 1000 for x in lat]
+        print(f"  {nombre:<24} {args.logins / dt:8,.1f} logins/s  mediana={statistics.median(ms):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# backend/bench/bench_login_storm.py
+"""
+Ráfaga de logins vs latencia de reservas concurrentes.
+
+Corre sobre un event loop igual que la app: las reservas van por el
+threadpool compartido (como cualquier endpoint sync) y los logins llaman al
+endpoint async de /usuarios/login. Compara:
+
+  - sin ráfaga (línea base de la reserva)
+  - ráfaga con bcrypt en el threadpool compartido (PASSWORD_HASH_POOL=0,
+    equivalente al login sync anterior)
+  - ráfaga con bcrypt en el pool dedicado (app.utils.hash_pool)
+
+Uso:
+    BCRYPT_ROUNDS=12 python -m bench.bench_login_storm [--logins 60] [--reservas 100]
+
+Con más logins que PASSWORD_HASH_WORKERS + PASSWORD_HASH_COLA_MAX el pool
+dedicado rechaza el excedente con 503 (se ve en "rechazados").
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_storm_"), "storm.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from fastapi import HTTPException  # noqa: E402
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.routers import usuarios  # noqa: E402
+from app.routers.turnos import crear_turno_compat  # noqa: E402
+from app.security import get_password_hash  # noqa: E402
+from app.utils.hash_pool import pool_hash  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+
+PASSWORD = "bench-storm-123"
+
+
+def _seed(n_clientes: int):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        duenio = models.Usuario(username=f"st_duenio_{tag}", rol="emprendedor")
+        db.add(duenio)
+        db.flush()
+        emp = models.Emprendedor(
+            usuario_id=duenio.id, nombre=f"Storm {tag}", codigo_cliente=f"ST{tag.upper()}", capacidad=1000
+        )
+        db.add(emp)
+        login = models.Usuario(
+            username=f"st_login_{tag}", email=f"st_{tag}@example.com", rol="cliente",
+            password_hash=get_password_hash(PASSWORD),
+        )
+        db.add(login)
+        clientes = [models.Usuario(username=f"st_cli_{tag}_{i}", rol="cliente") for i in range(n_clientes)]
+        db.add_all(clientes)
+        db.commit()
+        return emp.id, login.email, [c.id for c in clientes]
+    finally:
+        db.close()
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    k = min(len(orden) - 1, max(0, int(round(p / 100 * len(orden))) - 1))
+    return orden[k]
+
+
+def _reservar(emp_id: int, cliente_id: int, inicio: datetime) -> float:
+    db = SessionLocal()
+    try:
+        user = db.get(models.Usuario, cliente_id)
+        payload = {"emprendedor_id": emp_id, "inicio": inicio.isoformat(),
+                   "fin": (inicio + timedelta(minutes=30)).isoformat()}
+        t0 = time.perf_counter()
+        try:
+            crear_turno_compat(payload, db, user)
+        except HTTPException:
+            pass
+        return time.perf_counter() - t0
+    finally:
+        db.close()
+
+
+async def _login(email: str):
+    db = SessionLocal()
+    try:
+        await usuarios.login({"email": email, "password": PASSWORD}, db)
+    except HTTPException:
+        pass
+    finally:
+        db.close()
+
+
+async def _escenario(nombre: str, emp_id: int, email: str, clientes, base: datetime, n_logins: int):
+    async def reserva(i: int, cliente_id: int):
+        t0 = time.perf_counter()
+        await run_in_threadpool(_reservar, emp_id, cliente_id, base + timedelta(minutes=30 * i))
+        return time.perf_counter() - t0  # incluye la espera por un worker del threadpool
+
+    t0 = time.perf_counter()
+    logins = [asyncio.create_task(_login(email)) for _ in range(n_logins)]
+    await asyncio.sleep(0.05)  # que la ráfaga ya esté ocupando recursos
+    lat = await asyncio.gather(*(reserva(i, c) for i, c in enumerate(clientes)))
+    await asyncio.gather(*logins)
+    total = time.perf_counter() - t0
+
+    ms = [x * 1000 for x in lat]
+    print(f"  {nombre:<34} reserva p50={_percentil(ms, 50):8.1f}ms  p95={_percentil(ms, 95):8.1f}ms  "
+          f"max={max(ms):8.1f}ms  total={total:6.2f}s")
+
+
+async def _main(args):
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    emp_id, email, clientes = _seed(args.reservas * 3)
+    grupos = [clientes[i::3] for i in range(3)]
+    base = (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    print(f"logins: {args.logins}  reservas: {args.reservas}  rondas bcrypt: {settings.BCRYPT_ROUNDS}  "
+          f"workers hash: {pool_hash.workers}")
+    await _escenario("sin ráfaga", emp_id, email, grupos[0], base, 0)
+    pool_hash.activo = False
+    await _escenario("ráfaga, bcrypt en threadpool", emp_id, email, grupos[1], base + timedelta(days=30), args.logins)
+    pool_hash.activo = True
+    await _escenario("ráfaga, bcrypt en pool dedicado", emp_id, email, grupos[2], base + timedelta(days=60), args.logins)
+    print(f"  pool: {pool_hash.stats()}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--logins", type=int, default=60)
+    ap.add_argument("--reservas", type=int, default=100)
+    args = ap.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# backend/bench/bench_respuestas.py
+"""
+Benchmark de render y compresión de respuestas grandes.
+
+Para payloads representativos (listados de turnos de una semana / un mes /
+10k filas, y /admin-lite/turnos con su límite máximo) reporta:
+  - tiempo de serialización: JSONResponse vs ORJSONResponse (con el
+    jsonable_encoder que FastAPI aplica antes), y el TypeAdapter que usan
+    los listados de /turnos;
+  - bytes en el cable: sin comprimir, gzip (nivel de HTTP_COMPRESION_NIVEL_GZIP)
+    y brotli (HTTP_COMPRESION_NIVEL_BR, si el paquete brotli está instalado),
+    con el tiempo de compresión.
+
+No usa la base: arma filas sintéticas con la forma real de cada endpoint.
+
+Uso:
+    python -m bench.bench_respuestas [--repeticiones 20]
+"""
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.schemas import TurnoOut
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional
+    brotli = None
+
+_LISTA_TURNO_OUT = TypeAdapter(List[TurnoOut])
+_ESTADOS = ["confirmado", "pendiente", "cancelado"]
+
+
+def _turnos(n: int) -> List[dict]:
+    rnd = random.Random(n)
+    base = datetime(2026, 3, 2, 8, 0)
+    out = []
+    for i in range(n):
+        ini = base + timedelta(minutes=30 * i)
+        out.append({
+            "id": 100000 + i,
+            "emprendedor_id": 7,
+            "servicio_id": rnd.randint(1, 6),
+            "cliente_id": rnd.choice([None, rnd.randint(1, 5000)]),
+            "cliente_nombre": f"Cliente {rnd.randint(1, 5000)}",
+            "cliente_contacto": f"+54 9 11 {rnd.randint(10000000, 99999999)}",
+            "inicio": ini,
+            "fin": ini + timedelta(minutes=30),
+            "estado": rnd.choice(_ESTADOS),
+            "precio_aplicado": rnd.choice([None, rnd.randint(1000, 20000) * 100]),
+            "motivo_cancelacion": None,
+        })
+    return out
+
+
+def _admin_turnos(n: int) -> List[dict]:
+    filas = []
+    for t in _turnos(n):
+        filas.append({
+            "id": t["id"],
+            "inicio": t["inicio"],
+            "fin": t["fin"],
+            "estado": t["estado"],
+            "cliente_nombre": t["cliente_nombre"],
+            "cliente_contacto": t["cliente_contacto"],
+            "precio": t["precio_aplicado"],
+            "servicio_nombre": f"Servicio {t['servicio_id']}",
+            "emprendedor_id": t["emprendedor_id"],
+            "emprendedor_nombre": "Peluquería Centro",
+        })
+    return filas
+
+
+def _mediana_ms(fn, repeticiones: int) -> float:
+    fn()
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tiempos)
+
+
+def _comprimir(nombre: str, cuerpo: bytes, repeticiones: int):
+    nivel_gz = settings.HTTP_COMPRESION_NIVEL_GZIP
+    gz = gzip.compress(cuerpo, compresslevel=nivel_gz)
+    t_gz = _mediana_ms(lambda: gzip.compress(cuerpo, compresslevel=nivel_gz), repeticiones)
+    linea = f"    {'cable':<26} crudo={len(cuerpo):>10,}B  gzip={len(gz):>9,}B ({t_gz:6.1f}ms)"
+    if brotli is not None:
+        nivel_br = settings.HTTP_COMPRESION_NIVEL_BR
+        br = brotli.compress(cuerpo, quality=nivel_br)
+        t_br = _mediana_ms(lambda: brotli.compress(cuerpo, quality=nivel_br), repeticiones)
+        linea += f"  br={len(br):>9,}B ({t_br:6.1f}ms)"
+    print(linea)
+
+
+def _caso_listado(nombre: str, n: int, repeticiones: int):
+    filas = _turnos(n)
+    print(f"  {nombre} ({n:,} turnos)")
+    modelos = _LISTA_TURNO_OUT.validate_python(filas)
+    enc = lambda: jsonable_encoder(modelos)  # noqa: E731
+    t_json = _mediana_ms(lambda: JSONResponse(enc()), repeticiones)
+    t_orjson = _mediana_ms(lambda: ORJSONResponse(enc()), repeticiones)
+    t_adapter = _mediana_ms(lambda: _LISTA_TURNO_OUT.dump_json(_LISTA_TURNO_OUT.validate_python(filas)), repeticiones)
+    print(f"    {'serialización':<26} JSONResponse={t_json:7.1f}ms  ORJSONResponse={t_orjson:7.1f}ms  "
+          f"TypeAdapter (/turnos)={t_adapter:7.1f}ms")
+    _comprimir(nombre, _LISTA_TURNO_OUT.dump_json(modelos), repeticiones)
+
+
+def _caso_admin(n: int, repeticiones: int):
+    filas = _admin_turnos(n)
+    print(f"  /admin-lite/turnos ({n:,} filas)")
+    t_json = _mediana_ms(lambda: JSONResponse(jsonable_encoder(filas)), repeticiones)
+    t_orjson = _mediana_ms(lambda: ORJSONResponse(jsonable_encoder(filas)), repeticiones)
+    print(f"    {'serialización':<26} JSONResponse={t_json:7.1f}ms  ORJSONResponse={t_orjson:7.1f}ms")
+    _comprimir("admin", ORJSONResponse(jsonable_encoder(filas)).body, repeticiones)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeticiones", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"brotli: {'sí' if brotli is not None else 'no instalado'}")
+    _caso_listado("/turnos/owner semana", 200, args.repeticiones)
+    _caso_listado("/turnos/owner mes", 1000, args.repeticiones)
+    _caso_listado("/turnos/owner 10k", 10000, args.repeticiones)
+    _caso_admin(500, args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
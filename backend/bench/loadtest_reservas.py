@@ -0,0 +1,132 @@
+# backend/bench/loadtest_reservas.py
+"""
+Prueba de carga del camino de reserva: N reservas concurrentes al mismo slot.
+Verifica que se admitan exactamente 'capacidad' turnos y reporta latencias.
+
+Uso:
+    python -m bench.loadtest_reservas [--reservas 300] [--hilos 64] [--capacidad 1]
+
+Por defecto usa una base SQLite temporal. Para Postgres, setear DATABASE_URL
+(¡se crean usuarios/turnos de prueba en esa base!).
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    _tmp = os.path.join(tempfile.mkdtemp(prefix="turnate_lt_"), "loadtest.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}"
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402
+from app.utils.migrate import ensure_schema  # noqa: E402
+from app.routers.turnos import crear_turno_compat  # noqa: E402
+
+
+def _seed(n_clientes: int, capacidad: int):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        duenio = models.Usuario(username=f"lt_duenio_{tag}", email=None, rol="emprendedor")
+        db.add(duenio)
+        db.flush()
+        emp = models.Emprendedor(
+            usuario_id=duenio.id,
+            nombre=f"Load test {tag}",
+            codigo_cliente=f"LT{tag.upper()}",
+            capacidad=capacidad,
+        )
+        db.add(emp)
+        clientes = [models.Usuario(username=f"lt_cli_{tag}_{i}", rol="cliente") for i in range(n_clientes)]
+        db.add_all(clientes)
+        db.commit()
+        return emp.id, [c.id for c in clientes]
+    finally:
+        db.close()
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    k = min(len(orden) - 1, max(0, int(round(p / 100 * len(orden))) - 1))
+    return orden[k]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reservas", type=int, default=300)
+    ap.add_argument("--hilos", type=int, default=64)
+    ap.add_argument("--capacidad", type=int, default=1)
+    args = ap.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+    emp_id, clientes = _seed(args.reservas, args.capacidad)
+
+    inicio = (datetime.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    payload = {"emprendedor_id": emp_id, "inicio": inicio.isoformat(), "fin": (inicio + timedelta(minutes=30)).isoformat()}
+
+    resultados = {"ok": 0, "conflicto": 0, "error": 0}
+    latencias = []
+    lock = threading.Lock()
+    largada = threading.Barrier(min(args.hilos, args.reservas))
+
+    def reservar(cliente_id: int):
+        db = SessionLocal()
+        try:
+            user = db.get(models.Usuario, cliente_id)
+            try:
+                largada.wait(timeout=5)
+            except threading.BrokenBarrierError:
+                pass
+            t0 = time.perf_counter()
+            try:
+                crear_turno_compat(dict(payload), db, user)
+                r = "ok"
+            except HTTPException as e:
+                r = "conflicto" if e.status_code == 409 else "error"
+            except Exception:
+                r = "error"
+            dt = time.perf_counter() - t0
+            with lock:
+                resultados[r] += 1
+                latencias.append(dt)
+        finally:
+            db.close()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as ex:
+        list(ex.map(reservar, clientes))
+    total = time.perf_counter() - t0
+
+    db = SessionLocal()
+    try:
+        admitidos = (
+            db.query(models.Turno)
+            .filter(models.Turno.emprendedor_id == emp_id, models.Turno.inicio == inicio)
+            .count()
+        )
+    finally:
+        db.close()
+
+    ms = [x * 1000 for x in latencias]
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    print(f"Reservas: {args.reservas}  hilos: {args.hilos}  capacidad: {args.capacidad}  total: {total:.2f}s")
+    print(f"Resultados: {resultados}  admitidos en BD: {admitidos}")
+    print(f"Latencia escritura: p50={_percentil(ms, 50):.1f}ms  p99={_percentil(ms, 99):.1f}ms  max={max(ms):.1f}ms")
+
+    assert admitidos == args.capacidad, f"se admitieron {admitidos} turnos, capacidad {args.capacidad}"
+    assert resultados["ok"] == args.capacidad, resultados
+    print("✓ OK: se admitió exactamente la capacidad")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# backend/tests/conftest.py
+"""
+Base SQLite temporal por corrida (antes de importar la app) y helpers para
+crear usuarios / emprendedores por la API. Correr desde backend/:
+
+    python -m pytest -q
+"""
+import itertools
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="turnate_test_"), "test.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import update  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.auth_cache import cache_usuarios  # noqa: E402
+
+_nombres = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def nuevo_usuario(client):
+    """() -> (headers, usuario) de un usuario nuevo ya logueado."""
+    def crear():
+        n = f"usuario{next(_nombres)}"
+        r = client.post("/usuarios/", json={"username": n, "email": f"{n}@example.com", "password": "secreto"})
+        assert r.status_code == 201, r.text
+        r = client.post("/usuarios/login", json={"email": f"{n}@example.com", "password": "secreto"})
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['token']}"}, r.json()["user"]
+    return crear
+
+
+@pytest.fixture
+def nuevo_emprendedor(client, nuevo_usuario):
+    """() -> (headers, emprendedor) de un emprendedor recién activado."""
+    def crear():
+        headers, _ = nuevo_usuario()
+        r = client.post("/emprendedores/activar", headers=headers)
+        assert r.status_code == 200, r.text
+        token = r.json().get("token")
+        if token:
+            headers = {"Authorization": f"Bearer {token}"}
+        return headers, r.json()["emprendedor"]
+    return crear
+
+
+@pytest.fixture
+def admin(nuevo_usuario):
+    """headers de un usuario nuevo con rol admin."""
+    headers, user = nuevo_usuario()
+    with engine.begin() as cn:
+        cn.execute(update(models.Usuario.__table__).where(models.Usuario.__table__.c.id == user["id"]).values(rol="admin"))
+    cache_usuarios.invalidar(user["id"])
+    return headers
@@ -0,0 +1,28 @@
+# backend/tests/test_admin_lite.py
+"""Los endpoints de admin-lite que cambian estado (caches, métricas) requieren rol admin."""
+import pytest
+
+from app.utils.http_cache import metricas_http_cache
+
+
+@pytest.mark.parametrize("ruta", ["/admin-lite/cache-disponibilidad", "/admin-lite/cache-auth", "/admin-lite/cache-http"])
+def test_configurar_cache_requiere_admin(client, nuevo_usuario, admin, ruta):
+    assert client.post(f"{ruta}?activo=false").status_code == 401
+    cliente, _ = nuevo_usuario()
+    assert client.post(f"{ruta}?activo=false", headers=cliente).status_code == 403
+
+    r = client.post(f"{ruta}?limpiar=true", headers=admin)
+    assert r.status_code == 200, r.text
+    assert r.json()["activo"] is True
+
+
+def test_get_cache_http_no_limpia(client, nuevo_emprendedor, admin):
+    _, emp = nuevo_emprendedor()
+    client.get(f"/servicios/de/{emp['codigo_cliente']}")
+    antes = metricas_http_cache.stats()["requests"]
+    assert antes > 0
+    assert client.get("/admin-lite/cache-http?limpiar=true").status_code == 200
+    assert metricas_http_cache.stats()["requests"] == antes
+
+    assert client.post("/admin-lite/cache-http?limpiar=true", headers=admin).status_code == 200
+    assert metricas_http_cache.stats()["requests"] == 0
@@ -0,0 +1,84 @@
+# backend/tests/test_codigos.py
+"""Emisión de códigos públicos (app.utils.codigos)."""
+import threading
+
+from app import models
+from app.database import SessionLocal
+from app.utils.codigos import ALPHABET, LARGO, AsignadorCodigos, _BITS, _clave, codificar, guardar_con_codigo, permutar
+
+
+def test_permutacion_es_biyectiva_en_una_muestra():
+    clave = _clave()
+    muestra = list(range(5000)) + [(1 << _BITS) - 1 - i for i in range(1000)] + [i * 7919 * 104729 for i in range(1, 1000)]
+    imagen = [permutar(n, clave) for n in muestra]
+    assert len(set(muestra)) == len(muestra) == len(set(imagen))
+    assert all(0 <= x < (1 << _BITS) for x in imagen)
+    # no consecutivos: la clave desordena la secuencia
+    assert sum(b - a == 1 for a, b in zip(imagen, imagen[1:5000])) < 10
+    # otra clave, otra permutación
+    assert [permutar(n, b"otra") for n in range(100)] != imagen[:100]
+
+    codigos = {codificar(x) for x in imagen}
+    assert len(codigos) == len(imagen)
+    assert all(len(c) == LARGO and set(c) <= set(ALPHABET) for c in codigos)
+
+
+def test_dos_asignadores_no_repiten():
+    # como dos procesos: cada uno reserva su bloque de la misma secuencia en la BD
+    a, b = AsignadorCodigos(bloque=3), AsignadorCodigos(bloque=5)
+    db = SessionLocal()
+    try:
+        codigos = [asig.siguiente(db) for _ in range(20) for asig in (a, b)]
+    finally:
+        db.close()
+    assert len(set(codigos)) == len(codigos)
+
+
+def test_un_asignador_entre_hilos_no_repite():
+    asig = AsignadorCodigos(bloque=4)
+    codigos, lock = [], threading.Lock()
+
+    def tomar():
+        db = SessionLocal()
+        try:
+            propios = [asig.siguiente(db) for _ in range(25)]
+        finally:
+            db.close()
+        with lock:
+            codigos.extend(propios)
+
+    hilos = [threading.Thread(target=tomar) for _ in range(8)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert len(codigos) == 200 and len(set(codigos)) == 200
+
+
+def test_choque_de_codigo_reintenta_con_uno_nuevo(nuevo_usuario, nuevo_emprendedor):
+    _, ocupado = nuevo_emprendedor()
+    _, user = nuevo_usuario()
+    recibidos = []
+
+    def aplicar(codigo):
+        recibidos.append(codigo)
+        # primer intento: el código de otro emprendedor (como uno elegido a mano)
+        e = models.Emprendedor(usuario_id=user["id"], nombre="Choque",
+                               codigo_cliente=ocupado["codigo_cliente"] if len(recibidos) == 1 else codigo)
+        db.add(e)
+        return e
+
+    db = SessionLocal()
+    try:
+        e = guardar_con_codigo(db, aplicar)
+    finally:
+        db.close()
+    assert len(recibidos) == 2 and recibidos[0] != recibidos[1]
+    assert e.codigo_cliente == recibidos[1] != ocupado["codigo_cliente"]
+
+    db = SessionLocal()
+    try:
+        guardado = db.query(models.Emprendedor).filter_by(usuario_id=user["id"]).one()
+    finally:
+        db.close()
+    assert guardado.codigo_cliente == recibidos[1]
@@ -0,0 +1,105 @@
+# backend/tests/test_disponibilidad.py
+"""Motor de intervalos (app.utils.disponibilidad) y GET /disponibilidad/de/{codigo}."""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.routers.public_disponibilidad import MAX_DIAS
+from app.utils.disponibilidad import MINUTOS_DIA, bloque_de_horario, dia_semana, restar, saturados, unir
+
+DIA = date(2031, 7, 8)
+
+
+# ---- motor -------------------------------------------------------------------
+def test_unir_fusiona_solapados_y_contiguos():
+    assert unir([(0, 10), (5, 20), (20, 30), (40, 50)]) == [(0, 30), (40, 50)]
+    assert unir([(0, 30), (10, 20)]) == [(0, 30)]
+    assert unir([]) == []
+
+
+def test_restar():
+    base = [(0, 100), (200, 300)]
+    assert restar(base, []) == base
+    assert restar(base, [(10, 20), (90, 210), (250, 260)]) == [(0, 10), (20, 90), (210, 250), (260, 300)]
+    assert restar(base, [(0, 300)]) == []
+    assert restar([(0, 60)], [(60, 90)]) == [(0, 60)]  # semiabiertos: el borde no resta
+
+
+def test_saturados():
+    ocupados = [(0, 60), (30, 90), (60, 120)]
+    assert saturados(ocupados, 1) == unir(ocupados) == [(0, 120)]
+    assert saturados(ocupados, 2) == [(30, 90)]
+    assert saturados(ocupados, 3) == []
+    assert saturados([(0, 30), (30, 60)], 2) == []  # uno termina cuando empieza el otro
+
+
+def test_bloque_que_termina_a_medianoche():
+    assert bloque_de_horario(time(20, 0), time(0, 0)) == (20 * 60, MINUTOS_DIA)
+    assert bloque_de_horario(time(0, 0), time(0, 0)) == (0, MINUTOS_DIA)
+    assert bloque_de_horario(time(10, 0), time(9, 0)) is None
+
+
+# ---- endpoint ----------------------------------------------------------------
+@pytest.fixture
+def emprendedor(client, nuevo_emprendedor):
+    """(headers, código) con los bloques pedidos el día DIA."""
+    def crear(*bloques):
+        headers, emp = nuevo_emprendedor()
+        for desde, hasta in bloques:
+            r = client.post("/horarios", headers=headers,
+                            json={"dia_semana": dia_semana(DIA), "desde": desde, "hasta": hasta})
+            assert r.status_code == 201, r.text
+        return headers, emp
+    return crear
+
+
+def _inicios(client, codigo, **params):
+    params.setdefault("desde", datetime.combine(DIA, time.min).isoformat())
+    params.setdefault("hasta", datetime.combine(DIA + timedelta(days=1), time.min).isoformat())
+    r = client.get(f"/disponibilidad/de/{codigo}", params=params)
+    assert r.status_code == 200, r.text
+    return {d["fecha"]: d["inicios"] for d in r.json()["dias"]}[DIA.isoformat()]
+
+
+def test_grilla_alineada_al_bloque(client, emprendedor):
+    _, emp = emprendedor(("09:10", "11:00"))
+    # duración 30 (sin servicio), paso 20 desde el inicio del bloque, no desde la hora en punto
+    assert _inicios(client, emp["codigo_cliente"], intervalo_min=20) == ["09:10", "09:30", "09:50", "10:10", "10:30"]
+
+
+def test_bloque_hasta_medianoche(client, emprendedor):
+    _, emp = emprendedor(("22:00", "00:00"))
+    assert _inicios(client, emp["codigo_cliente"]) == ["22:00", "22:30", "23:00", "23:30"]
+
+
+def test_turno_que_empieza_el_dia_anterior(client, nuevo_usuario, emprendedor):
+    _, emp = emprendedor(("00:00", "03:00"))
+    cliente, _ = nuevo_usuario()
+    inicio = datetime.combine(DIA, time.min) - timedelta(hours=1)
+    r = client.post("/turnos/compat", headers=cliente, json={
+        "emprendedor_id": emp["id"], "inicio": inicio.isoformat(), "fin": (inicio + timedelta(hours=2)).isoformat()})
+    assert r.status_code == 201, r.text
+    # [23:00 del día anterior, 01:00) pisa el comienzo del día consultado
+    assert _inicios(client, emp["codigo_cliente"]) == ["01:00", "01:30", "02:00", "02:30"]
+
+
+@pytest.mark.parametrize("params", [
+    {"hasta": datetime.combine(DIA + timedelta(days=MAX_DIAS + 1), time.min).isoformat()},
+    {"hasta": datetime.combine(DIA, time.min).isoformat()},
+    {"intervalo_min": 4},
+    {"intervalo_min": 24 * 60 + 1},
+])
+def test_limites_422(client, emprendedor, params):
+    _, emp = emprendedor(("09:00", "10:00"))
+    params = {"desde": datetime.combine(DIA, time.min).isoformat(), **params}
+    r = client.get(f"/disponibilidad/de/{emp['codigo_cliente']}", params=params)
+    assert r.status_code == 422, r.text
+
+
+def test_rango_de_max_dias_se_acepta(client, emprendedor):
+    _, emp = emprendedor(("09:00", "10:00"))
+    desde = datetime.combine(DIA, time.min)
+    r = client.get(f"/disponibilidad/de/{emp['codigo_cliente']}", params={
+        "desde": desde.isoformat(), "hasta": (desde + timedelta(days=MAX_DIAS)).isoformat()})
+    assert r.status_code == 200, r.text
+    assert len(r.json()["dias"]) == MAX_DIAS
@@ -0,0 +1,45 @@
+# backend/tests/test_disponibilidad_cache.py
+"""Cache de disponibilidad: TTL, presupuesto de bytes (días + bloques) y versión."""
+from datetime import date, timedelta
+
+from app.utils.disponibilidad_cache import BYTES_DIA, CacheDisponibilidad, _tamanio
+
+BLOQUES = {1: [(540, 780), (840, 1080)], 2: [(540, 1080)]}
+DIA = date(2031, 3, 3)
+BITS = bytes(BYTES_DIA)
+
+
+def test_entradas_vencen_por_ttl():
+    c = CacheDisponibilidad(max_bytes=1 << 20, ttl_s=0)
+    c.guardar_bloques(1, BLOQUES, c.version(1))
+    c.guardar_dia(1, DIA, BITS, c.version(1))
+    assert c.bloques(1) is None and c.dia(1, DIA) is None
+    assert c.stats()["vencidos"] == 2 and c.stats()["bytes"] == 0
+
+    c = CacheDisponibilidad(max_bytes=1 << 20, ttl_s=60)
+    c.guardar_bloques(1, BLOQUES, c.version(1))
+    assert c.bloques(1) == BLOQUES
+
+
+def test_bloques_cuentan_en_el_presupuesto_y_se_desalojan():
+    tam_bloques, tam_dia = _tamanio(BLOQUES), _tamanio(BITS)
+    c = CacheDisponibilidad(max_bytes=tam_bloques + 3 * tam_dia, ttl_s=60)
+    c.guardar_bloques(1, BLOQUES, c.version(1))
+    assert c.stats()["bytes"] == tam_bloques
+
+    for i in range(4):  # el cuarto día no entra: sale lo menos usado (los bloques)
+        c.guardar_dia(2, DIA + timedelta(days=i), BITS, c.version(2))
+    assert c.bloques(1) is None
+    assert c.stats()["evictions"] == 1
+    assert c.stats()["bytes"] == 4 * tam_dia <= c.max_bytes
+
+
+def test_invalidar_emprendedor_libera_bytes_y_descarta_lecturas_viejas():
+    c = CacheDisponibilidad(max_bytes=1 << 20, ttl_s=60)
+    version = c.version(1)
+    c.guardar_bloques(1, BLOQUES, version)
+    c.guardar_dia(1, DIA, BITS, version)
+    c.invalidar_emprendedor(1)
+    assert c.stats()["bytes"] == 0 and c.bloques(1) is None
+    c.guardar_dia(1, DIA, BITS, version)  # leído antes de la escritura: no se guarda
+    assert c.dia(1, DIA) is None
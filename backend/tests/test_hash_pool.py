@@ -0,0 +1,39 @@
+# backend/tests/test_hash_pool.py
+"""El lugar en el pool de bcrypt se libera cuando termina la tarea, no cuando se cancela el request."""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.hash_pool import PoolHash
+
+
+def test_cancelar_no_libera_el_lugar_de_una_tarea_en_curso():
+    async def escenario():
+        pool = PoolHash(workers=1, cola_max=0)
+        soltar = threading.Event()
+        arranco = threading.Event()
+
+        def lenta():
+            arranco.set()
+            soltar.wait(5)
+
+        pedido = asyncio.create_task(pool.ejecutar(lenta))
+        while not arranco.is_set():
+            await asyncio.sleep(0.01)
+        pedido.cancel()
+        await asyncio.sleep(0.01)
+
+        # el hilo sigue calculando: el pool sigue lleno
+        assert pool.stats()["pendientes"] == 1
+        with pytest.raises(HTTPException) as exc:
+            await pool.ejecutar(lambda: None)
+        assert exc.value.status_code == 503
+
+        soltar.set()
+        while pool.stats()["pendientes"]:
+            await asyncio.sleep(0.01)
+        assert await pool.ejecutar(lambda: 42) == 42
+
+    asyncio.run(escenario())
@@ -0,0 +1,96 @@
+# backend/tests/test_horarios.py
+"""Horarios: reemplazo de la semana (PUT /horarios/mis/semana) y PUT/DELETE por id."""
+
+
+def _bloque(dia, desde, hasta, activo=True):
+    return {"dia_semana": dia, "desde": desde, "hasta": hasta, "activo": activo}
+
+
+def _ids(semana):
+    return {(h["dia_semana"], h["desde"][:5], h["hasta"][:5]): h["id"] for h in semana}
+
+
+def test_semana_acepta_bloque_hasta_medianoche(client, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    r = client.put("/horarios/mis/semana", headers=headers, json=[_bloque(5, "20:00", "00:00")])
+    assert r.status_code == 200, r.text
+    assert r.json()[0]["hasta"].startswith("00:00")
+
+
+def test_semana_detecta_solape_con_bloque_hasta_medianoche(client, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    r = client.put("/horarios/mis/semana", headers=headers,
+                   json=[_bloque(5, "20:00", "00:00"), _bloque(5, "22:00", "23:00")])
+    assert r.status_code == 422, r.text
+    r = client.put("/horarios/mis/semana", headers=headers, json=[_bloque(5, "10:00", "09:00")])
+    assert r.status_code == 422, r.text
+
+
+def test_semana_conserva_filas_sin_cambios(client, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    r = client.put("/horarios/mis/semana", headers=headers, json=[
+        _bloque(1, "09:00", "13:00"), _bloque(1, "14:00", "18:00"), _bloque(2, "09:00", "13:00"),
+    ])
+    assert r.status_code == 200, r.text
+    antes = _ids(r.json())
+
+    # se queda igual (1, 09-13); cambia de horario (1, 14-18 -> 15-19); desaparece (2); aparece (3)
+    r = client.put("/horarios/mis/semana", headers=headers, json=[
+        _bloque(1, "09:00", "13:00"), _bloque(1, "15:00", "19:00"),
+        _bloque(3, "10:00", "12:00"), _bloque(4, "10:00", "12:00"),
+    ])
+    assert r.status_code == 200, r.text
+    despues = _ids(r.json())
+
+    assert despues[(1, "09:00", "13:00")] == antes[(1, "09:00", "13:00")]
+    # los sobrantes se reusan con UPDATE; solo lo que no alcanza se inserta
+    reusados = {despues[(1, "15:00", "19:00")], despues[(3, "10:00", "12:00")]}
+    assert reusados == {antes[(1, "14:00", "18:00")], antes[(2, "09:00", "13:00")]}
+    assert despues[(4, "10:00", "12:00")] not in antes.values()
+
+    r = client.get("/horarios/mis", headers=headers)
+    assert _ids(r.json()) == despues
+
+    # misma semana otra vez: nada cambia
+    r = client.put("/horarios/mis/semana", headers=headers, json=[
+        _bloque(1, "09:00", "13:00"), _bloque(1, "15:00", "19:00"),
+        _bloque(3, "10:00", "12:00"),
+    ])
+    assert r.status_code == 200, r.text
+    quedan = _ids(r.json())
+    assert quedan == {k: v for k, v in despues.items() if k[0] != 4}
+    assert len(client.get("/horarios/mis", headers=headers).json()) == 3
+
+
+# ---- PUT / DELETE /horarios/{id} ---------------------------------------------
+def _horario(client, headers, desde="09:00", hasta="13:00"):
+    r = client.post("/horarios", headers=headers, json=_bloque(1, desde, hasta))
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_actualizar_valida_el_bloque_resultante(client, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    h = _horario(client, headers)
+    for cambios in ({"hasta": "08:00"}, {"desde": "13:00"}, {"desde": "12:00", "hasta": "11:00"}):
+        r = client.put(f"/horarios/{h['id']}", headers=headers, json=cambios)
+        assert r.status_code == 422, (cambios, r.text)
+    r = client.put(f"/horarios/{h['id']}", headers=headers, json={"hasta": "00:00"})
+    assert r.status_code == 200, r.text
+    assert r.json()["hasta"].startswith("00:00")
+    assert client.get("/horarios/mis", headers=headers).json() == [r.json()]
+
+
+def test_horario_ajeno_404_y_sin_cambios(client, nuevo_emprendedor):
+    dueno, _ = nuevo_emprendedor()
+    otro, _ = nuevo_emprendedor()
+    h = _horario(client, dueno)
+
+    r = client.put(f"/horarios/{h['id']}", headers=otro, json={"desde": "10:00", "activo": False})
+    assert r.status_code == 404, r.text
+    r = client.put(f"/horarios/{h['id']}", headers=otro, json={"hasta": "12:00"})
+    assert r.status_code == 404, r.text
+    r = client.delete(f"/horarios/{h['id']}", headers=otro)
+    assert r.status_code == 404, r.text
+
+    assert client.get("/horarios/mis", headers=dueno).json() == [h]
@@ -0,0 +1,52 @@
+# backend/tests/test_http_cache.py
+"""ETag / 304 y Cache-Control de las lecturas públicas (app.utils.http_cache)."""
+import pytest
+
+from app.config import settings
+from app.utils.http_cache import POLITICAS
+
+
+@pytest.fixture
+def emp_con_servicio(client, nuevo_emprendedor):
+    headers, emp = nuevo_emprendedor()
+    r = client.post("/servicios", headers=headers, json={"nombre": "Corte", "duracion_min": 30, "precio": 1000})
+    assert r.status_code == 201, r.text
+    return headers, emp, r.json()
+
+
+def test_repetir_con_if_none_match_da_304(client, emp_con_servicio):
+    _, emp, _ = emp_con_servicio
+    url = f"/servicios/de/{emp['codigo_cliente']}"
+    r = client.get(url)
+    assert r.status_code == 200 and r.json()
+    etag = r.headers["etag"]
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+
+
+def test_escritura_invalida_el_etag(client, emp_con_servicio):
+    headers, emp, servicio = emp_con_servicio
+    url = f"/servicios/de/{emp['codigo_cliente']}"
+    etag = client.get(url).headers["etag"]
+
+    r = client.put(f"/servicios/{servicio['id']}", headers=headers, json={"precio": 2500})
+    assert r.status_code == 200, r.text
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert [s["precio"] for s in r.json()] == [2500]
+
+
+@pytest.mark.parametrize("ruta", ["servicios", "horarios", "turnos", "disponibilidad", "agenda"])
+def test_cache_control_por_ruta(client, emp_con_servicio, ruta):
+    if ruta == "agenda" and settings.DB_ASYNC:
+        pytest.skip("/agenda/de/{codigo} solo se monta en modo sync")
+    _, emp, _ = emp_con_servicio
+    r = client.get(f"/{ruta}/de/{emp['codigo_cliente']}")
+    assert r.status_code == 200, r.text
+    assert r.headers["cache-control"] == POLITICAS.get(ruta, "no-cache")
+    assert r.headers["etag"]
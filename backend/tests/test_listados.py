@@ -0,0 +1,48 @@
+# backend/tests/test_listados.py
+"""Listados de turnos: rango completo sin ?limit/?cursor, paginación keyset y NDJSON."""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def agenda(client, nuevo_emprendedor):
+    headers, emp = nuevo_emprendedor()
+    r = client.put("/emprendedores/mi", json={"capacidad": 1}, headers=headers)
+    assert r.status_code == 200, r.text
+    base = datetime(2031, 3, 3, 9, 0)
+    inicios = [(base + timedelta(hours=i)).isoformat() for i in range(7)]
+    r = client.post("/turnos/bulk", json={"turnos": [{"inicio": i} for i in inicios]}, headers=headers)
+    assert r.status_code == 201, r.text
+    return headers, inicios
+
+
+def test_sin_limit_devuelve_el_rango_completo(client, agenda):
+    headers, inicios = agenda
+    r = client.get("/turnos/owner", headers=headers)
+    assert r.status_code == 200, r.text
+    assert [t["inicio"] for t in r.json()] == inicios
+    assert "x-next-cursor" not in r.headers
+
+
+def test_paginacion_con_cursor(client, agenda):
+    headers, inicios = agenda
+    vistos, params = [], {"limit": 3}
+    while True:
+        r = client.get("/turnos/owner", params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        assert len(r.json()) <= 3
+        vistos += [t["inicio"] for t in r.json()]
+        if "x-next-cursor" not in r.headers:
+            break
+        params = {"limit": 3, "cursor": r.headers["x-next-cursor"]}
+    assert vistos == inicios
+
+
+def test_ndjson_igual_al_json(client, agenda):
+    headers, _ = agenda
+    completo = client.get("/turnos/owner", headers=headers).json()
+    r = client.get("/turnos/owner", params={"formato": "ndjson"}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert [json.loads(linea) for linea in r.text.splitlines()] == completo
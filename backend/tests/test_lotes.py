@@ -0,0 +1,30 @@
+# backend/tests/test_lotes.py
+"""Altas en lote (bulk / recurrentes) desde el panel del emprendedor."""
+from datetime import datetime, timedelta
+
+
+def test_lote_rechaza_clientes_ajenos(client, nuevo_usuario, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    otro_emp, _ = nuevo_emprendedor()
+    _, ajeno = nuevo_usuario()
+    cliente_h, cliente = nuevo_usuario()
+    inicio = datetime(2031, 4, 7, 10, 0)
+
+    # usuario sin turnos con el emprendedor, o inexistente: 422 y no se crea nada
+    for cliente_id in (ajeno["id"], 10 ** 9):
+        r = client.post("/turnos/bulk", json={"turnos": [{"inicio": inicio.isoformat()}], "cliente_id": cliente_id},
+                        headers=headers)
+        assert r.status_code == 422, r.text
+    r = client.post("/turnos/recurrentes", headers=otro_emp, json={
+        "inicio": inicio.isoformat(), "rrule": "FREQ=WEEKLY;COUNT=2", "cliente_id": ajeno["id"]})
+    assert r.status_code == 422, r.text
+
+    # el que ya reservó con el emprendedor sí se puede agendar desde el panel
+    emp_id = client.get("/emprendedores/mi", headers=headers).json()["id"]
+    r = client.post("/turnos/compat", json={"emprendedor_id": emp_id, "inicio": inicio.isoformat()}, headers=cliente_h)
+    assert r.status_code == 201, r.text
+    r = client.post("/turnos/recurrentes", headers=headers, json={
+        "inicio": (inicio + timedelta(hours=2)).isoformat(), "rrule": "FREQ=WEEKLY;COUNT=2",
+        "cliente_id": cliente["id"]})
+    assert r.status_code == 201, r.text
+    assert [t["cliente_id"] for t in r.json()["creados"]] == [cliente["id"]] * 2
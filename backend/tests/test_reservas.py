@@ -0,0 +1,90 @@
+# backend/tests/test_reservas.py
+"""Solapamiento, capacidad y carriles de las reservas (_verificar_disponible / _elegir_carril)."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.database import engine
+
+DIA = datetime(2031, 7, 7)
+
+
+def _h(hora: float) -> str:
+    return (DIA + timedelta(hours=hora)).isoformat()
+
+
+@pytest.fixture
+def agenda(client, nuevo_usuario, nuevo_emprendedor):
+    """(headers del dueño, reservar(desde, hasta) -> response con un cliente nuevo) según capacidad."""
+    def crear(capacidad: int):
+        dueno, emp = nuevo_emprendedor()
+        assert client.put("/emprendedores/mi", json={"capacidad": capacidad}, headers=dueno).status_code == 200
+
+        def reservar(desde: float, hasta: float):
+            cliente, _ = nuevo_usuario()
+            return client.post("/turnos/compat", headers=cliente,
+                               json={"emprendedor_id": emp["id"], "inicio": _h(desde), "fin": _h(hasta)})
+        return dueno, emp["id"], reservar
+    return crear
+
+
+def _sin_choques_de_carril(emp_id: int) -> list:
+    T = models.Turno.__table__.c
+    with engine.connect() as cn:
+        filas = cn.execute(
+            select(T.inicio, T.fin, T.carril)
+            .where(T.emprendedor_id == emp_id, T.estado != models.EstadoTurno.cancelado.value)
+        ).all()
+    for i, a in enumerate(filas):
+        for b in filas[i + 1:]:
+            assert not (a.carril == b.carril and a.inicio < b.fin and b.inicio < a.fin), (a, b)
+    return filas
+
+
+def test_capacidad_1_rechaza_solapados(agenda):
+    _, emp_id, reservar = agenda(1)
+    assert reservar(10, 11).status_code == 201
+    r = reservar(10.5, 11.5)
+    assert r.status_code == 409, r.text
+    assert reservar(11, 12).status_code == 201  # contiguo: [10, 11) y [11, 12) no se pisan
+    assert len(_sin_choques_de_carril(emp_id)) == 2
+
+
+def test_mismo_horario_hasta_la_capacidad(agenda):
+    _, emp_id, reservar = agenda(3)
+    assert [reservar(10, 11).status_code for _ in range(4)] == [201, 201, 201, 409]
+    assert sorted(f.carril for f in _sin_choques_de_carril(emp_id)) == [0, 1, 2]
+
+
+def test_cancelar_libera_el_lugar(client, agenda):
+    dueno, _, reservar = agenda(1)
+    turno = reservar(10, 11).json()
+    assert reservar(10, 11).status_code == 409
+
+    r = client.patch(f"/turnos/{turno['id']}", headers=dueno, json={"estado": "cancelado"})
+    assert r.status_code == 200, r.text
+    assert reservar(10, 11).status_code == 201
+
+    # reactivar el cancelado vuelve a ocupar lugar: ya no entra
+    r = client.patch(f"/turnos/{turno['id']}", headers=dueno, json={"estado": "confirmado"})
+    assert r.status_code == 409, r.text
+
+
+def test_patch_reacomoda_carriles(client, agenda):
+    dueno, emp_id, reservar = agenda(2)
+    assert reservar(10, 11).status_code == 201           # A: carril 0
+    d = reservar(11, 12).json()                          # D: carril 0
+    assert reservar(11, 12).status_code == 201           # E: carril 1
+    assert client.patch(f"/turnos/{d['id']}", headers=dueno, json={"estado": "cancelado"}).status_code == 200
+    # quedan A 10-11 en el carril 0 y E 11-12 en el 1: ningún carril está libre de 10 a 12
+    f = reservar(15, 16).json()
+
+    r = client.patch(f"/turnos/{f['id']}", headers=dueno, json={"inicio": _h(10), "fin": _h(12)})
+    assert r.status_code == 200, r.text
+    filas = _sin_choques_de_carril(emp_id)
+    assert len(filas) == 3 and {f.carril for f in filas} == {0, 1}
+
+    # con los dos carriles tomados de 10 a 12, otro turno en ese rango ya no entra
+    assert reservar(10.5, 11).status_code == 409
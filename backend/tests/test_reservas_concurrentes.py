@@ -0,0 +1,60 @@
+# backend/tests/test_reservas_concurrentes.py
+"""
+Reservas simultáneas del mismo horario (versión pytest de bench/loadtest_reservas):
+entran exactamente 'capacidad' y el resto recibe 409.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app import models
+from app.database import engine
+from app.utils.migrate import _renumerar_carriles
+
+HILOS = 12
+
+
+@pytest.mark.parametrize("capacidad", [1, 3])
+def test_entra_exactamente_la_capacidad(client, nuevo_usuario, nuevo_emprendedor, capacidad):
+    headers, emp = nuevo_emprendedor()
+    assert client.put("/emprendedores/mi", json={"capacidad": capacidad}, headers=headers).status_code == 200
+    clientes = [nuevo_usuario()[0] for _ in range(HILOS)]
+    inicio = datetime(2031, 5, 5, 10, 0)
+    payload = {"emprendedor_id": emp["id"], "inicio": inicio.isoformat(),
+               "fin": (inicio + timedelta(minutes=30)).isoformat()}
+    largada = threading.Barrier(HILOS)
+
+    def reservar(h):
+        largada.wait(timeout=10)
+        return client.post("/turnos/compat", json=payload, headers=h).status_code
+
+    with ThreadPoolExecutor(max_workers=HILOS) as ex:
+        codigos = list(ex.map(reservar, clientes))
+
+    assert codigos.count(201) == capacidad, codigos
+    assert codigos.count(409) == HILOS - capacidad, codigos
+    T = models.Turno.__table__.c
+    with engine.connect() as cn:
+        carriles = cn.execute(select(T.carril).where(T.emprendedor_id == emp["id"])).scalars().all()
+    assert sorted(carriles) == list(range(capacidad))
+
+
+def test_migracion_renumera_carriles_solapados(nuevo_emprendedor):
+    _, emp = nuevo_emprendedor()
+    base = datetime(2031, 6, 2, 9, 0)
+    filas = [  # datos viejos: todo en el carril 0
+        (base, base + timedelta(hours=2), "confirmado"),
+        (base + timedelta(hours=1), base + timedelta(hours=3), "pendiente"),
+        (base + timedelta(hours=1), base + timedelta(hours=2), "cancelado"),
+        (base + timedelta(hours=2), base + timedelta(hours=4), "confirmado"),
+    ]
+    T = models.Turno.__table__
+    with engine.begin() as cn:
+        ids = [cn.execute(insert(T).values(emprendedor_id=emp["id"], inicio=i, fin=f, estado=e, carril=0))
+               .inserted_primary_key[0] for i, f, e in filas]
+        assert _renumerar_carriles(cn) >= 1
+        carriles = dict(cn.execute(select(T.c.id, T.c.carril).where(T.c.id.in_(ids))).all())
+    assert [carriles[i] for i in ids] == [0, 1, 0, 0]
@@ -0,0 +1,139 @@
+# backend/tests/test_respuestas_escritura.py
+"""
+Las escrituras ya no hacen db.refresh() después del commit (expire_on_commit=False
++ RETURNING). La respuesta tiene que ser la misma que daría releer la fila:
+cada test compara lo que devolvió el endpoint con la fila leída de nuevo en
+una sesión aparte, serializada igual que el endpoint.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app import models
+from app.database import SessionLocal, engine, guardar
+from app.routers.usuarios import _user_to_dict
+from app.schemas import HorarioOut, ServicioOut, TurnoOut
+from app.utils.emprendedor import serializar_emprendedor
+
+
+def _releer(modelo, pk):
+    db = SessionLocal()
+    try:
+        return db.get(modelo, pk)
+    finally:
+        db.close()
+
+
+def _json(schema, obj) -> dict:
+    return schema.model_validate(obj).model_dump(mode="json")
+
+
+@contextmanager
+def _sentencias():
+    hechas = []
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        hechas.append(statement)
+
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        yield hechas
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+
+
+def test_registro(client):
+    r = client.post("/usuarios/", json={"username": "Registro", "email": " Registro@Example.com ", "password": "secreto"})
+    assert r.status_code == 201, r.text
+    u = r.json()["user"]
+    assert u == _user_to_dict(_releer(models.Usuario, u["id"]))
+
+
+def test_activar_emprendedor(nuevo_emprendedor):
+    _, emp = nuevo_emprendedor()
+    assert emp == serializar_emprendedor(_releer(models.Emprendedor, emp["id"]))
+
+
+def test_actualizar_emprendimiento(client, nuevo_emprendedor):
+    headers, emp = nuevo_emprendedor()
+    with _sentencias() as hechas:
+        r = client.put("/emprendedores/mi", headers=headers, json={"nombre": "Nuevo nombre", "capacidad": 2})
+    assert r.status_code == 200, r.text
+    assert r.json() == serializar_emprendedor(_releer(models.Emprendedor, emp["id"]))
+    assert r.json()["nombre"] == "Nuevo nombre" and r.json()["capacidad"] == 2
+    # sin el SELECT del refresh después del commit
+    leidas = [s for s in hechas if s.lstrip().upper().startswith("SELECT") and "emprendedores" in s]
+    assert len(leidas) == 1, leidas
+
+
+def test_crear_y_actualizar_servicio(client, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    r = client.post("/servicios", headers=headers, json={"nombre": "Corte", "duracion_min": 45, "precio": 1500})
+    assert r.status_code == 201, r.text
+    assert r.json() == _json(ServicioOut, _releer(models.Servicio, r.json()["id"]))
+
+    r = client.put(f"/servicios/{r.json()['id']}", headers=headers, json={"precio": 1800, "activo": False})
+    assert r.status_code == 200, r.text
+    assert r.json() == _json(ServicioOut, _releer(models.Servicio, r.json()["id"]))
+
+
+def test_crear_horario(client, nuevo_emprendedor):
+    headers, _ = nuevo_emprendedor()
+    r = client.post("/horarios", headers=headers, json={"dia_semana": 2, "desde": "09:00", "hasta": "13:30"})
+    assert r.status_code == 201, r.text
+    assert r.json() == _json(HorarioOut, _releer(models.Horario, r.json()["id"]))
+
+
+def test_crear_y_actualizar_turno(client, nuevo_emprendedor, nuevo_usuario):
+    headers, emp = nuevo_emprendedor()
+    s1 = client.post("/servicios", headers=headers, json={"nombre": "A", "duracion_min": 30, "precio": 1000}).json()
+    s2 = client.post("/servicios", headers=headers, json={"nombre": "B", "duracion_min": 60, "precio": 2500}).json()
+    cliente, _ = nuevo_usuario()
+
+    r = client.post("/turnos/compat", headers=cliente, json={
+        "emprendedor_id": emp["id"], "servicio_id": s1["id"], "inicio": "2031-03-03T10:00:00Z",
+    })
+    assert r.status_code == 201, r.text
+    creado = r.json()
+    assert creado == _json(TurnoOut, _releer(models.Turno, creado["id"]))
+
+    # estado llega como string y se cambia el servicio (re-snapshot de precio, fin recalculado)
+    r = client.patch(f"/turnos/{creado['id']}", headers=headers, json={
+        "servicio_id": s2["id"], "inicio": "2031-03-03T11:00:00", "estado": "pendiente",
+    })
+    assert r.status_code == 200, r.text
+    assert r.json() == _json(TurnoOut, _releer(models.Turno, creado["id"]))
+    assert r.json()["estado"] == "pendiente"
+    assert r.json()["precio_aplicado"] == 2500
+
+
+def test_guardar_trae_defaults_del_servidor_sin_select(nuevo_emprendedor):
+    _, emp = nuevo_emprendedor()
+    db = SessionLocal()
+    try:
+        with _sentencias() as hechas:
+            srv = guardar(db, models.Servicio(emprendedor_id=emp["id"], nombre="Server default", precio=10))
+            creado_en = srv.created_at
+        assert creado_en is not None
+        assert not [s for s in hechas if s.lstrip().upper().startswith("SELECT")], hechas
+        assert creado_en == _releer(models.Servicio, srv.id).created_at
+    finally:
+        db.close()
+
+
+def test_onupdate_vuelve_en_el_update(nuevo_emprendedor):
+    _, emp = nuevo_emprendedor()
+    db = SessionLocal()
+    try:
+        t = guardar(db, models.Turno(emprendedor_id=emp["id"], inicio=datetime(2031, 4, 1, 9), fin=datetime(2031, 4, 1, 10)))
+        assert t.updated_at is None
+        t.estado = models.EstadoTurno.cancelado
+        db.commit()
+        with _sentencias() as hechas:
+            actualizado_en = t.updated_at
+        assert hechas == []
+        assert actualizado_en is not None
+        assert actualizado_en == _releer(models.Turno, t.id).updated_at
+    finally:
+        db.close()